@@ -0,0 +1,84 @@
+"""Compare 100 sequential API calls with and without pooled session.
+
+It runs local HTTP server instead of Slack, so it only shows the cost of
+TCP connection. Real Slack calls also pay TLS handshake for every new
+connection.
+
+Pooled calls use ``Bot._call`` to skip rate limit queue of ``Bot.call``,
+which would throttle 100 ``chat.postMessage`` calls to one channel.
+
+Run with ``python -m benchmarks.api_session``.
+
+"""
+
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+
+import ujson
+
+from yui.types.slack.response import APIResponse
+
+from .utils import make_bot
+
+NUMBER = 100
+
+
+async def legacy_call(bot, method, data=None):
+    """Bot.call before pooled session."""
+
+    async with aiohttp.ClientSession() as session:
+        form = aiohttp.FormData(data or {})
+        form.add_field('token', bot.config.TOKEN)
+        async with session.post(bot.api_url.format(method), data=form) as res:
+            return APIResponse(
+                body=await res.json(loads=ujson.loads),
+                status=res.status,
+                headers=res.headers,
+            )
+
+
+async def handle(request):
+    await request.post()
+    return web.json_response({'ok': True})
+
+
+async def run():
+    app = web.Application()
+    app.router.add_post('/api/{method}', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    bot = make_bot()
+    bot.api_url = f'http://127.0.0.1:{port}/api/{{}}'
+    data = {'channel': 'C1', 'text': 'hello'}
+
+    try:
+        start = time.perf_counter()
+        for _ in range(NUMBER):
+            await legacy_call(bot, 'chat.postMessage', data)
+        before = time.perf_counter() - start
+        print(f'new session per call: {before * 1e3:.1f}ms')
+
+        start = time.perf_counter()
+        for _ in range(NUMBER):
+            await bot._call('chat.postMessage', data)
+        after = time.perf_counter() - start
+        print(f'pooled session: {after * 1e3:.1f}ms')
+        print(f'speedup: {before / after:.1f}x')
+    finally:
+        await bot.close_session()
+        await runner.cleanup()
+
+
+def main():
+    asyncio.get_event_loop().run_until_complete(run())
+
+
+if __name__ == '__main__':
+    main()
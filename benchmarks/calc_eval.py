@@ -0,0 +1,42 @@
+"""Compare visiting AST nodes with running compiled closures in calc.
+
+Run with ``python -m benchmarks.calc_eval``.
+
+"""
+
+from yui.apps.compute.calc import Evaluator
+
+from .utils import bench
+
+RUNS = 20
+
+EXPRS = [
+    'total = 0\nfor i in range(2000):\n    total += i * i % 7\ntotal',
+    'i = 0\nn = 0\nwhile i < 2000:\n    i += 1\n    if i % 3 == 0:\n'
+    '        continue\n    n += i\nn',
+    '[x * y for x in range(50) for y in range(50) if (x + y) % 3 == 0]',
+    '{k: str(k) for k in range(1000)}',
+    'a = [0] * 100\nfor i in range(1000):\n    a[i % 100] += i\nsum(a)',
+]
+
+
+def main():
+    for expr in EXPRS:
+        visitor = Evaluator(compiled=False).run(expr)
+        compiled = Evaluator(compiled=True).run(expr)
+        assert visitor == compiled, expr
+
+    def run(compiled):
+        def func():
+            for expr in EXPRS:
+                Evaluator(compiled=compiled).run(expr)
+        return func
+
+    print(f'{RUNS} runs of {len(EXPRS)} loop-heavy expressions')
+    before = bench('visitor', run(False), RUNS)
+    after = bench('compiled closures', run(True), RUNS)
+    print(f'speedup: {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Compare rebuilding symbol tables per Evaluator with shared tables.
+
+Run with ``python -m benchmarks.calc_setup``.
+
+"""
+
+from yui.apps.compute.calc import (
+    ALLOWED_CLASS_PROPERTIES,
+    ALLOWED_INSTANCE_PROPERTIES,
+    ALLOWED_MODULES,
+    Evaluator,
+    GLOBAL_SYMBOL_TABLE,
+)
+
+from .utils import bench
+
+RUNS = 20_000
+
+EXPRS = ['1+1', 'pi * 2', 'max(1, 2)', 'sqrt(2)']
+
+
+class RebuildEvaluator(Evaluator):
+    """Evaluator which builds its own tables on each construction."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.allowed_modules = {
+            key: set(names) for key, names in ALLOWED_MODULES.items()
+        }
+        self.allowed_class_properties = {
+            key: set(names) for key, names in ALLOWED_CLASS_PROPERTIES.items()
+        }
+        self.allowed_instance_properties = {
+            key: set(names)
+            for key, names in ALLOWED_INSTANCE_PROPERTIES.items()
+        }
+        self.global_symbol_table = dict(GLOBAL_SYMBOL_TABLE)
+
+
+def main():
+    def run(cls, expr):
+        def func():
+            return cls(decimal_mode=True).run(expr)
+        return func
+
+    print(f'{RUNS} runs of each one-liner')
+    for expr in EXPRS:
+        assert run(RebuildEvaluator, expr)() == run(Evaluator, expr)()
+        before = bench(
+            f'rebuild tables: {expr}',
+            run(RebuildEvaluator, expr),
+            RUNS,
+        )
+        after = bench(f'shared tables: {expr}', run(Evaluator, expr), RUNS)
+        print(f'speedup: {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
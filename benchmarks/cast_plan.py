@@ -0,0 +1,67 @@
+"""Compare scanning casters on every cast with compiled cast plans.
+
+Run with ``python -m benchmarks.cast_plan``.
+
+"""
+
+from typing import Dict, List, NewType, Optional, Tuple, Union
+
+from yui.utils.cast import CastError, CasterBox, cast
+
+from .utils import bench
+
+CASTS = 1_000_000
+
+ID = NewType('ID', str)
+
+CASES = [
+    (int, '42'),
+    (str, 'kirito'),
+    (float, '3.14'),
+    (bool, 'yes'),
+    (Optional[int], None),
+    (Union[int, float], '3.2'),
+    (List[int], ['1', '2', '3', '4']),
+    (Tuple[int, float, str], ['1', '2', '3']),
+    (Dict[str, ID], {1: 1, 2: 2}),
+    (List[Optional[int]], ['1', None, '3']),
+]
+
+
+class ScanCasterBox(CasterBox):
+    """Caster box which walks every caster on each cast like before."""
+
+    def __call__(self, t, value):
+        try:
+            return self.cast(t, value)
+        except CastError:
+            return t(value)
+
+    def cast(self, t, value):
+        for caster in self.caster_box:
+            if caster.check(t, value):
+                return caster.cast(self, t, value)
+        raise CastError
+
+
+def main():
+    scan = ScanCasterBox(cast.caster_box)
+    for t, value in CASES:
+        assert scan(t, value) == cast(t, value), t
+
+    number = CASTS // len(CASES)
+
+    def run(caster_box):
+        def func():
+            for t, value in CASES:
+                caster_box(t, value)
+        return func
+
+    print(f'{number * len(CASES)} casts of {len(CASES)} types')
+    before = bench('scan casters', run(scan), number)
+    after = bench('cast plan', run(cast), number)
+    print(f'speedup: {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Compare dispatching a message to every app with using command index.
+
+Run with ``python -m benchmarks.command_dispatch``.
+
+"""
+
+from yui.box import Box
+from yui.event import Message
+
+from .utils import abench, make_bot
+
+COMMANDS = 150
+NUMBER = 2000
+
+
+def make_box() -> Box:
+    box = Box()
+
+    for i in range(COMMANDS):
+        @box.command(f'command{i}', [f'c{i}'])
+        async def command(raw: str):
+            return True
+
+    @box.on(Message)
+    async def on_message():
+        return True
+
+    return box
+
+
+def main():
+    box = make_box()
+    bot = make_bot(box, PREFIX='=')
+    text = f'=command{COMMANDS - 1} foo bar "baz qux"'
+
+    async def every_app():
+        event = Message(channel='C1', user='U1', text=text)
+        for app in box.apps:
+            if not await app.run(bot, event):
+                break
+
+    async def indexed():
+        event = Message(channel='C1', user='U1', text=text)
+        for app in box.get_apps(event, bot.config.PREFIX):
+            if not await app.run(bot, event):
+                break
+
+    print(f'{len(box.apps)} apps registered')
+    before = abench('every app', every_app, NUMBER)
+    after = abench('command index', indexed, NUMBER)
+    print(f'speedup: {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
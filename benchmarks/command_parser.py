@@ -0,0 +1,286 @@
+"""Compare parsing options and arguments before and after parser plan.
+
+Run with ``python -m benchmarks.command_parser``.
+
+"""
+
+import inspect
+from typing import Any, Dict, List, Tuple
+
+from yui.box import Box
+from yui.box.parsers import parse_option_and_arguments
+from yui.box.utils import is_container
+from yui.command.decorators import argument, option
+from yui.types.handler import Handler
+from yui.utils.cast import cast
+
+from .utils import bench
+
+OPTIONS = 12
+ARGUMENTS = 500
+NUMBER = 2000
+
+KWARGS_DICT = Dict[str, Any]
+
+
+def legacy_parse(
+    handler: Handler,
+    chunks: List[str],
+) -> Tuple[KWARGS_DICT, List[str]]:
+    end = False
+
+    result: KWARGS_DICT = {}
+    options = handler.options
+    arguments = handler.arguments
+
+    for o in options:
+        if o.type_ is None:
+            type_ = handler.params[o.dest].annotation
+
+            if type_ == inspect._empty:  # type: ignore
+                type_ = str
+            else:
+                if o.transform_func:
+                    type_ = str
+
+            o.type_ = type_
+
+    for a in arguments:
+        if a.type_ is None:
+            type_ = handler.params[a.dest].annotation
+
+            if type_ == inspect._empty:  # type: ignore
+                type_ = str
+            else:
+                if a.transform_func:
+                    type_ = str
+
+            a.type_ = type_
+            if is_container(a.type_):
+                a.container_cls = None
+                a.typing_has_container = True
+
+    required = {o.dest for o in options if o.required}
+
+    for opt in options:
+        if opt.multiple:
+            result[opt.dest] = []
+        else:
+            if callable(opt.default):
+                result[opt.dest] = opt.default()
+            else:
+                result[opt.dest] = opt.default
+
+    while not end and chunks:
+        for opt in options:
+            name = chunks.pop(0)
+            if name.startswith(opt.name + '='):
+                name, new_chunk = name.split('=', 1)
+                chunks.insert(0, new_chunk)
+
+            if name == opt.name:
+                if opt.dest in required:
+                    required.remove(opt.dest)
+
+                if opt.nargs == 0:
+                    result[opt.dest] = opt.value
+                    break
+
+                length = len(chunks)
+                try:
+                    args = [chunks.pop(0) for _ in range(opt.nargs)]
+                except IndexError:
+                    raise SyntaxError(
+                        opt.count_error.format(
+                            name=opt.name,
+                            expected=opt.nargs,
+                            given=length,
+                        )
+                    )
+                try:
+                    if opt.container_cls:
+                        if opt.multiple:
+                            r = cast(opt.type_, args)
+                        else:
+                            r = opt.container_cls(
+                                cast(opt.type_, x) for x in args
+                            )
+                    else:
+                        r = cast(opt.type_, args[0])
+                except ValueError as e:
+                    raise SyntaxError(
+                        opt.type_error.format(name=opt.name, e=e)
+                    )
+
+                if opt.transform_func:
+                    if opt.container_cls:
+                        try:
+                            r = opt.container_cls(
+                                opt.transform_func(x)
+                                for x in r
+                            )
+                        except ValueError as e:
+                            raise SyntaxError(
+                                opt.transform_error.format(
+                                    name=opt.name,
+                                    e=e,
+                                )
+                            )
+                    else:
+                        try:
+                            r = opt.transform_func(r)
+                        except ValueError as e:
+                            raise SyntaxError(
+                                opt.transform_error.format(
+                                    name=opt.name,
+                                    e=e,
+                                )
+                            )
+
+                if opt.multiple:
+                    result[opt.dest].append(r[0])
+                else:
+                    result[opt.dest] = r
+
+                break
+            chunks.insert(0, name)
+        else:
+            end = True
+
+    if required:
+        raise SyntaxError(
+            '\n'.join(o.count_error.format(
+                name=o.name,
+                expected=o.nargs,
+                given=0,
+            ) for o in (
+                list(filter(lambda x: x.dest == o, options))[0]
+                for o in required
+            ))
+        )
+
+    for i, arg in enumerate(arguments):
+        length = arg.nargs
+        if arg.nargs < 0:
+            length = len(chunks) - sum(a.nargs for a in arguments[i:]) - 1
+
+        if length < 1:
+            raise SyntaxError(arg.count_error.format(
+                name=arg.name,
+                expected='>0',
+                given=0,
+            ))
+        if length <= len(chunks):
+            args = [chunks.pop(0) for _ in range(length)]
+        else:
+            raise SyntaxError(arg.count_error.format(
+                name=arg.name,
+                expected=arg.nargs,
+                given=len(chunks),
+            ))
+        try:
+            if arg.concat:
+                r = ' '.join(args)
+            elif arg.container_cls:
+                r = arg.container_cls(
+                    cast(arg.type_, x) for x in args
+                )
+            elif arg.typing_has_container:
+                r = cast(arg.type_, args)
+            else:
+                r = cast(arg.type_, args[0])
+        except ValueError as e:
+            raise SyntaxError(
+                arg.type_error.format(
+                    name=arg.name,
+                    e=e,
+                )
+            )
+
+        if arg.transform_func:
+            if arg.container_cls and r:
+                try:
+                    r = arg.container_cls(
+                        arg.transform_func(x)
+                        for x in r
+                    )
+                except ValueError as e:
+                    raise SyntaxError(arg.transform_error.format(
+                        name=arg.name,
+                        e=e,
+                    ))
+            else:
+                try:
+                    r = arg.transform_func(r)
+                except ValueError as e:
+                    raise SyntaxError(arg.transform_error.format(
+                        name=arg.name,
+                        e=e,
+                    ))
+
+        if r is not None:
+            result[arg.dest] = r
+
+    return result, chunks
+
+
+def make_handler() -> Handler:
+    box = Box()
+
+    @box.command('big')
+    @option('--opt0', type_=int, required=True)
+    @option('--opt1', type_=int, default=1)
+    @option('--opt2', type_=int, default=2)
+    @option('--opt3', type_=int, default=3)
+    @option('--opt4', type_=int, default=4)
+    @option('--opt5', type_=int, default=5)
+    @option('--opt6', type_=float, default=6.0)
+    @option('--opt7', type_=float, default=7.0)
+    @option('--opt8', default='eight')
+    @option('--opt9', default='nine')
+    @option('--opt10', default=list)
+    @option('--opt11', default=dict)
+    @option('--verbose', is_flag=True)
+    @option('--tag', dest='tags', multiple=True)
+    @argument('head')
+    @argument('values', nargs=-1)
+    async def big(
+        opt0, opt1, opt2, opt3, opt4, opt5, opt6, opt7, opt8, opt9,
+        opt10, opt11, verbose, tags: List[str], head, values,
+    ):
+        pass
+
+    return box.apps.pop().handler
+
+
+def main():
+    handler = make_handler()
+    chunks = [f'--opt{i}={i * 10}' for i in reversed(range(OPTIONS - 2))]
+    chunks += ['--verbose', '--tag', 'a', '--tag=b', 'head']
+    chunks += [str(i) for i in range(ARGUMENTS)]
+
+    expected, rest = legacy_parse(handler, list(chunks))
+    assert parse_option_and_arguments(handler, list(chunks)) == (
+        expected,
+        rest,
+    )
+
+    print(
+        f'{len(handler.options)} options, '
+        f'{len(chunks)} chunks per command'
+    )
+    before = bench(
+        'parse every call',
+        lambda: legacy_parse(handler, list(chunks)),
+        NUMBER,
+    )
+    after = bench(
+        'parser plan',
+        lambda: parse_option_and_arguments(handler, list(chunks)),
+        NUMBER,
+    )
+    print(f'speedup: {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
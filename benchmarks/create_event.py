@@ -0,0 +1,89 @@
+"""Compare linear scan with indexed lookup when converting event fields.
+
+Run with ``python -m benchmarks.create_event``.
+
+"""
+
+import attr
+
+from yui.event import create_event
+from yui.types.channel import PublicChannel
+from yui.types.directory import Directory
+from yui.types.user import User
+
+from .utils import bench, make_bot
+
+USERS = 5000
+CHANNELS = 500
+MEMBERS = 200
+NUMBER = 200
+
+
+class LinearDirectory(Directory):
+    """Directory which looks objects up by linear scan like plain list."""
+
+    def get(self, id):
+        for obj in self:
+            if obj.id == id:
+                return obj
+        return None
+
+    def get_by_key(self, key):
+        for obj in self:
+            if self.key(obj) == key:
+                return obj
+        return None
+
+
+def fill(bot, cls):
+    bot.users = cls(
+        User(id=f'U{i:05}', team_id='T1', name=f'user{i}')
+        for i in range(USERS)
+    )
+    bot.channels = cls(
+        PublicChannel(
+            id=f'C{i:05}',
+            name=f'channel{i}',
+            creator='U00000',
+            last_read=0,
+        )
+        for i in range(CHANNELS)
+    )
+
+
+def main():
+    bot = make_bot()
+    events = [
+        {
+            'type': 'message',
+            'channel': f'C{CHANNELS - 1:05}',
+            'user': f'U{USERS - 1:05}',
+            'text': 'hello',
+            'ts': '1234567890.123456',
+        },
+        {
+            'type': 'subteam_members_changed',
+            'subteam_id': 'S1',
+            'team_id': 'T1',
+            'added_users': [
+                f'U{USERS - i - 1:05}' for i in range(MEMBERS)
+            ],
+            'removed_users': [],
+        },
+    ]
+
+    def run():
+        for event in events:
+            e = create_event(dict(event))
+            for a in attr.fields(type(e)):
+                getattr(e, a.name)
+
+    fill(bot, LinearDirectory)
+    before = bench('linear scan', run, NUMBER)
+    fill(bot, Directory)
+    after = bench('indexed', run, NUMBER)
+    print(f'speedup: {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Compare reading only text of event with converting every field.
+
+Converting every field costs same as old eager construction did.
+
+Run with ``python -m benchmarks.lazy_event``.
+
+"""
+
+import attr
+
+from yui.event import create_event
+from yui.types.channel import PublicChannel
+from yui.types.directory import Directory
+from yui.types.user import User
+
+from .utils import bench, make_bot
+
+USERS = 1000
+NUMBER = 20000
+
+
+def main():
+    bot = make_bot()
+    bot.users = Directory(
+        User(id=f'U{i:05}', team_id='T1', name=f'user{i}')
+        for i in range(USERS)
+    )
+    bot.channels = Directory([
+        PublicChannel(id='C1', name='general', creator='U00000', last_read=0),
+    ])
+    data = {
+        'type': 'message',
+        'channel': 'C1',
+        'user': 'U00001',
+        'text': 'hello',
+        'ts': '1234567890.123456',
+        'event_ts': '1234567890.123456',
+        'edited': {'user': 'U00001', 'ts': '1234567890.123456'},
+        'message': None,
+        'previous_message': None,
+    }
+
+    def every_field():
+        e = create_event(dict(data))
+        for a in attr.fields(type(e)):
+            getattr(e, a.name)
+
+    def text_only():
+        create_event(dict(data)).text
+
+    before = bench('every field', every_field, NUMBER)
+    after = bench('text only', text_only, NUMBER)
+    print(f'speedup: {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
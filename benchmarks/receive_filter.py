@@ -0,0 +1,63 @@
+"""Compare decoding every frame with dropping unsubscribed types early.
+
+Run with ``python -m benchmarks.receive_filter``.
+
+"""
+
+import ujson
+
+from yui.box import Box
+from yui.event import Message, create_event
+
+from .utils import bench, make_bot
+
+NUMBER = 20000
+
+NOISE = [
+    '{"type":"user_typing","channel":"C1","user":"U1"}',
+    '{"type":"presence_change","user":"U1","presence":"away"}',
+    '{"type":"user_typing","channel":"C2","user":"U2"}',
+    '{"type":"presence_change","user":"U2","users":["U1","U2"],'
+    '"presence":"active"}',
+]
+
+FRAMES = NOISE + [
+    '{"type":"message","channel":"C1","user":"U1","text":"hello",'
+    '"ts":"1234567890.123456"}',
+]
+
+
+def main():
+    box = Box()
+
+    @box.on(Message)
+    async def on_message():
+        return True
+
+    bot = make_bot(box)
+
+    def every_frame(frames):
+        for frame in frames:
+            event = create_event(ujson.loads(frame))
+            box.get_apps(event, '=')
+
+    def filtered(frames):
+        for frame in frames:
+            event = bot.decode_frame(frame)
+            if event is not None:
+                box.get_apps(event, '=')
+
+    for name, frames in [('noise only', NOISE), ('mixed', FRAMES)]:
+        print(f'{name} ({len(frames)} frames per call)')
+        before = bench(
+            'decode every frame', lambda: every_frame(frames), NUMBER,
+        )
+        after = bench(
+            'drop by peeked type', lambda: filtered(frames), NUMBER,
+        )
+        print(f'speedup: {before / after:.1f}x')
+    print(dict(bot.dropped_events))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Compare :func:`shlex.split` with :func:`yui.box.utils.tokenize`.
+
+Run with ``python -m benchmarks.tokenizer``.
+
+"""
+
+import shlex
+
+from yui.box.utils import tokenize
+
+from .utils import bench
+
+SIZES = [1024, 4096, 10240, 40960]
+
+#: plain words such as long ``update`` payload
+PLAIN = 'update --name kirito --level 96 sword art online '
+#: quoted and escaped chunks such as multi-line calc block
+QUOTED = (
+    'calc "x = [i ** 2 for i in range(10)]\\nprint(\\"sum\\", sum(x))" '
+    "'single quoted' it\\'s --flag=\"a b\" "
+)
+
+
+def make_text(unit: str, size: int) -> str:
+    return (unit * max(1, size // len(unit))).strip()
+
+
+def main():
+    for label, unit in [('plain', PLAIN), ('quoted', QUOTED)]:
+        for size in SIZES:
+            text = make_text(unit, size)
+            assert tokenize(text) == shlex.split(text)
+            number = max(10, 400 * 1024 // size)
+            print(f'{label} {size // 1024}KB ({len(text)} chars)')
+            before = bench('  shlex.split', lambda: shlex.split(text), number)
+            after = bench('  tokenize', lambda: tokenize(text), number)
+            print(
+                f'  speedup: {before / after:.1f}x, '
+                f'{len(text) * number / after / 1024 / 1024:.1f}MB/s'
+            )
+
+
+if __name__ == '__main__':
+    main()
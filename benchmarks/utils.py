@@ -0,0 +1,58 @@
+import asyncio
+import copy
+import time
+from typing import Awaitable, Callable
+
+from yui.bot import Bot
+from yui.box import Box
+from yui.config import Config, DEFAULT
+
+
+def make_bot(box: Box = None, **kwargs) -> Bot:
+    """Make bot for benchmark without connecting to Slack."""
+
+    cfg = copy.deepcopy(DEFAULT)
+    cfg.update(
+        TOKEN='xoxb-benchmark',
+        DATABASE_URL='sqlite://',
+        REGISTER_CRONTAB=False,
+        CHANNELS={},
+        USERS={},
+    )
+    cfg.update(kwargs)
+    cfg['LOGGING']['loggers']['yui']['level'] = 'WARNING'
+    cfg['LOGGING']['loggers']['yui']['handlers'] = ['console']
+    del cfg['LOGGING']['handlers']['file']
+    bot = Bot(Config(**cfg), using_box=box or Box())
+    bot.loop = asyncio.get_event_loop()
+    return bot
+
+
+def bench(name: str, func: Callable[[], None], number: int) -> float:
+    """Run given function and print time per call."""
+
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f'{name}: {elapsed / number * 1e6:.2f}us per call ({number} calls)')
+    return elapsed
+
+
+def abench(
+    name: str,
+    func: Callable[[], Awaitable],
+    number: int,
+) -> float:
+    """Run given coroutine function and print time per call."""
+
+    async def run():
+        for _ in range(number):
+            await func()
+
+    loop = asyncio.get_event_loop()
+    start = time.perf_counter()
+    loop.run_until_complete(run())
+    elapsed = time.perf_counter() - start
+    print(f'{name}: {elapsed / number * 1e6:.2f}us per call ({number} calls)')
+    return elapsed
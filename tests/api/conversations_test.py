@@ -0,0 +1,99 @@
+import pytest
+
+from yui.api.encoder import bool2str
+
+from ..util import FakeBot
+
+
+@pytest.mark.asyncio
+async def test_slack_api_conversations_history():
+    bot = FakeBot()
+    channel = bot.add_channel('C4567', 'test')
+
+    await bot.api.conversations.history(
+        'C1234',
+        cursor='asdf',
+        inclusive=True,
+        latest='123',
+        limit=100,
+        oldest='456',
+    )
+    call = bot.call_queue.pop()
+    assert call.method == 'conversations.history'
+    assert call.data == {
+        'channel': 'C1234',
+        'cursor': 'asdf',
+        'inclusive': bool2str(True),
+        'latest': '123',
+        'limit': '100',
+        'oldest': '456',
+    }
+
+    await bot.api.conversations.history(channel)
+    call = bot.call_queue.pop()
+    assert call.method == 'conversations.history'
+    assert call.data == {'channel': channel.id}
+
+
+@pytest.mark.asyncio
+async def test_slack_api_conversations_info():
+    bot = FakeBot()
+    channel = bot.add_private_channel('G4567', 'secret')
+
+    await bot.api.conversations.info('D1234')
+    call = bot.call_queue.pop()
+    assert call.method == 'conversations.info'
+    assert call.data == {
+        'channel': 'D1234',
+        'include_locale': bool2str(False),
+    }
+
+    await bot.api.conversations.info(channel, True)
+    call = bot.call_queue.pop()
+    assert call.method == 'conversations.info'
+    assert call.data == {
+        'channel': channel.id,
+        'include_locale': bool2str(True),
+    }
+
+
+@pytest.mark.asyncio
+async def test_slack_api_conversations_list():
+    bot = FakeBot()
+
+    await bot.api.conversations.list()
+    call = bot.call_queue.pop()
+    assert call.method == 'conversations.list'
+    assert call.data == {
+        'exclude_archived': bool2str(True),
+        'limit': '0',
+    }
+
+    await bot.api.conversations.list(
+        '1234asdf',
+        False,
+        12,
+        ['public_channel', 'im'],
+    )
+    call = bot.call_queue.pop()
+    assert call.method == 'conversations.list'
+    assert call.data == {
+        'cursor': '1234asdf',
+        'exclude_archived': bool2str(False),
+        'limit': '12',
+        'types': 'public_channel,im',
+    }
+
+
+@pytest.mark.asyncio
+async def test_slack_api_conversations_members():
+    bot = FakeBot()
+
+    await bot.api.conversations.members('C1234', 'asdf', 100)
+    call = bot.call_queue.pop()
+    assert call.method == 'conversations.members'
+    assert call.data == {
+        'channel': 'C1234',
+        'cursor': 'asdf',
+        'limit': '100',
+    }
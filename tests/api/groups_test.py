@@ -38,4 +38,15 @@ async def test_slack_api_groups_list():
     assert call.data == {
         'exclude_archived': bool2str(True),
         'exclude_members': bool2str(True),
+        'limit': '0',
+    }
+
+    await bot.api.groups.list('1234asdf', False, False, 12)
+    call = bot.call_queue.pop()
+    assert call.method == 'groups.list'
+    assert call.data == {
+        'cursor': '1234asdf',
+        'exclude_archived': bool2str(False),
+        'exclude_members': bool2str(False),
+        'limit': '12',
     }
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from yui.api.hydration import Hydration, PAGE_SIZE
+from yui.types.slack.response import APIResponse
+
+
+def response(body):
+    return APIResponse(body=body, status=200, headers={})
+
+
+@pytest.mark.asyncio
+async def test_hydration_list():
+    hydration = Hydration(2)
+    pages = {
+        None: (['U1', 'U2'], 'page2'),
+        'page2': (['U3'], 'page3'),
+        'page3': ([], ''),
+    }
+    calls = []
+
+    async def call(cursor, limit, presence):
+        calls.append((cursor, limit, presence))
+        members, next_cursor = pages[cursor]
+        return response({
+            'ok': True,
+            'members': [{'id': id} for id in members],
+            'response_metadata': {'next_cursor': next_cursor},
+        })
+
+    result = await hydration.list('users', call, 'members', presence=False)
+    assert [u['id'] for u in result] == ['U1', 'U2', 'U3']
+    assert calls == [
+        (None, PAGE_SIZE, False),
+        ('page2', PAGE_SIZE, False),
+        ('page3', PAGE_SIZE, False),
+    ]
+    assert hydration.counts == {'users list': 3}
+
+
+@pytest.mark.asyncio
+async def test_hydration_fetch():
+    hydration = Hydration(3)
+    running = 0
+    max_running = 0
+
+    async def call(id):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01 if id != 'C1' else 0.03)
+        running -= 1
+        if id == 'C5':
+            return response({'ok': False, 'error': 'channel_not_found'})
+        return response({'ok': True, 'channel': {'id': id}})
+
+    ids = [f'C{i}' for i in range(10)]
+    result = await hydration.fetch('channels', call, 'channel', ids)
+    assert [c['id'] for c in result] == [id for id in ids if id != 'C5']
+    assert max_running == 3
+    assert hydration.counts == {'channels': 10}
+    assert hydration.report().startswith('hydrated in ')
+    assert hydration.report().endswith('(channels: 10)')
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from yui.api.scheduler import RateLimitScheduler, TIERS, TokenBucket
+from yui.types.slack.response import APIResponse
+
+
+@pytest.mark.asyncio
+async def test_token_bucket():
+    loop = asyncio.get_event_loop()
+    bucket = TokenBucket(600, 2)
+
+    start = loop.time()
+    await bucket.acquire()
+    await bucket.acquire()
+    assert loop.time() - start < 0.05
+    await bucket.acquire()
+    assert loop.time() - start >= 0.09
+
+    bucket.rate_limited(0.2)
+    assert bucket.rate == bucket.base_rate / 2
+    start = loop.time()
+    await bucket.acquire()
+    assert loop.time() - start >= 0.2
+
+    bucket.succeeded()
+    assert bucket.rate == bucket.base_rate * 0.6
+
+
+def test_scheduler_get_bucket():
+    scheduler = RateLimitScheduler()
+
+    bucket = scheduler.get_bucket('users.list')
+    assert scheduler.get_bucket('users.list') is bucket
+    assert bucket.burst == TIERS['tier2'][1]
+    assert scheduler.get_bucket('unknown.method').burst == TIERS['tier3'][1]
+
+    c1 = scheduler.get_bucket('chat.postMessage', {'channel': 'C1'})
+    c2 = scheduler.get_bucket('chat.postMessage', {'channel': 'C2'})
+    assert c1 is not c2
+    assert scheduler.get_bucket('chat.postMessage', {'channel': 'C1'}) is c1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_run():
+    scheduler = RateLimitScheduler()
+    responses = [
+        APIResponse(body={'ok': False}, status=429, headers={
+            'Retry-After': '0.1',
+        }),
+        APIResponse(body={'ok': True}, status=200, headers={}),
+    ]
+
+    async def call():
+        return responses.pop(0)
+
+    resp = await scheduler.run('users.info', {'user': 'U1'}, call)
+    assert resp.status == 200
+    assert not responses
+
+    stat = scheduler.stats['users.info']
+    assert stat.calls == 2
+    assert stat.rate_limited == 1
+    assert stat.max_wait >= 0.1
+    assert stat.average_wait == stat.total_wait / 2
+    assert scheduler.report().startswith('users.info: 2 calls, total ')
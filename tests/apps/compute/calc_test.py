@@ -3,7 +3,24 @@ from datetime import date, datetime
 
 import pytest
 
-from yui.apps.compute.calc import BadSyntax, Decimal as D, Evaluator, calculate
+from yui.apps.compute.calc import (
+    BadSyntax,
+    Budget,
+    Decimal as D,
+    Evaluator,
+    GLOBAL_SYMBOL_TABLE,
+    LimitExceeded,
+    ResultCache,
+    body,
+    calculate,
+    calculate_text,
+    make_cache_key,
+    parse,
+    result_cache,
+    sandbox,
+)
+
+from ...util import FakeBot
 
 
 class GetItemSpy:
@@ -697,6 +714,103 @@ def test_yield_from():
     assert 'x' not in e.symbol_table
 
 
+@pytest.mark.parametrize('compiled', [True, False])
+def test_budget_ops(compiled):
+    e = Evaluator(compiled=compiled, budget=Budget(ops=10, bits=64, length=8))
+
+    e.run('for x in [1, 2, 3]:\n    pass')
+    assert e.ops == 3
+    e.run('[x for x in [1, 2] for y in [1, 2]]')
+    assert e.ops == 6
+    e.run('max(1, 2)')
+    assert e.ops == 1
+
+    err = 'Too many operations'
+    with pytest.raises(LimitExceeded, match=err):
+        e.run('while True:\n    pass')
+    with pytest.raises(LimitExceeded, match=err):
+        e.run('[x for x in range(11)]')
+    with pytest.raises(LimitExceeded, match=err):
+        e.run('{x: y for x in range(3) for y in range(3)}')
+    with pytest.raises(LimitExceeded, match=err):
+        e.run('for x in range(5):\n    abs(x)')
+
+
+@pytest.mark.parametrize('compiled', [True, False])
+def test_budget_size(compiled):
+    e = Evaluator(compiled=compiled, budget=Budget(ops=10, bits=64, length=8))
+
+    assert e.run('2 ** 63') == 2 ** 63
+    assert e.run('(-2) ** 63') == (-2) ** 63
+    assert e.run('1 ** 1000') == 1
+    assert e.run('2 ** -100') == 2 ** -100
+    assert e.run('2.0 ** 100') == 2.0 ** 100
+    assert e.run('pow(2, 1000, 7)') == pow(2, 1000, 7)
+    assert e.run('"ab" * 4') == 'abababab'
+    assert e.run('4 * [0, 1]') == [0, 1] * 4
+    assert e.run('1 << 63') == 1 << 63
+    assert e.run('0 << 1000') == 0
+    assert e.run('(2 ** 31) * (2 ** 31)') == 2 ** 62
+
+    with pytest.raises(LimitExceeded, match='Result of power is too big'):
+        e.run('2 ** 64')
+    with pytest.raises(LimitExceeded, match='Result of power is too big'):
+        e.run('2 ** 10 ** 8')
+    with pytest.raises(LimitExceeded, match='Result of power is too big'):
+        e.run('pow(3, 41)')
+    with pytest.raises(LimitExceeded, match='Result of power is too big'):
+        e.run('operator.pow(3, 41)')
+    with pytest.raises(LimitExceeded, match='Result of repeat is too long'):
+        e.run('"a" * 10 ** 9')
+    with pytest.raises(LimitExceeded, match='Result of repeat is too long'):
+        e.run('x = [0]\nx *= 9')
+    with pytest.raises(LimitExceeded, match='Result of repeat is too long'):
+        e.run('operator.mul(3, (1, 2, 3))')
+    with pytest.raises(LimitExceeded, match='Result of shift is too big'):
+        e.run('1 << 64')
+    with pytest.raises(LimitExceeded, match='is too big'):
+        e.run('(2 ** 40) * (2 ** 40)')
+
+
+@pytest.mark.parametrize('expr', [
+    'a = 0\nfor x in range(10):\n    if x % 3 == 0:\n        continue\n'
+    '    a += x\n    if a > 20:\n        break\nelse:\n    a = -1\na',
+    'i = 0\nwhile i < 5:\n    i += 1\nelse:\n    i *= 10\ni',
+    '[(x, y) for x in range(4) if x for y in range(x) if x + y != 3]',
+    '{x: y for x, y in zip("abc", range(3))}',
+    '{x % 3 for x in range(10)}',
+    'a, b = [1, 2]; c = [0] * 4; c[1:3] = [a, b]; c[0] += 5; del c[-1]; c',
+    'd = {"k": 1}; d["k"] -= 1; del d["k"]; d',
+    '1 < 2 < 3 > 0 and 0 or "x"',
+    'f"{3.14159:.2f} {\'a\'}" + "b" * 2',
+    'x = -~3 if not None else ...; x',
+    'math.floor(2.5) + abs(-1) + max(1, key=None)',
+    '[1, 2, 3][::2] + list((1, 2))',
+    'a = b = 3; a + b',
+    'a = 1; del a; a',
+    '(1).real',
+    '[].__class__',
+    'a, b = 1, 2, 3',
+    '1 + f(*[1])',
+    '[x for x in (y for y in [])]',
+    '{**{1: 2}}',
+])
+@pytest.mark.parametrize('decimal_mode', [True, False])
+def test_compiled_same_as_visitor(expr, decimal_mode):
+    visitor = Evaluator(decimal_mode=decimal_mode, compiled=False)
+    compiled = Evaluator(decimal_mode=decimal_mode, compiled=True)
+
+    try:
+        expected = visitor.run(expr)
+    except Exception as e:
+        with pytest.raises(e.__class__):
+            compiled.run(expr)
+    else:
+        assert compiled.run(expr) == expected
+    assert compiled.symbol_table == visitor.symbol_table
+    assert compiled.current_interrupt is visitor.current_interrupt is None
+
+
 @pytest.mark.parametrize(
     ('expr, expected_decimal_result, expected_num_result,'
      'expected_decimal_local, expected_num_local'),
@@ -806,3 +920,145 @@ def test_calculate_fine(
         assert type(expected) == type(local)
 
         assert expected == local
+
+
+def test_calculate_text():
+    assert calculate_text('1 + 2') == ('3', {})
+    result, local = calculate_text('a = 1.5\nb = map(str, [1])')
+    assert result is None
+    assert local['a'] == "Decimal('1.5')"
+    assert local['b'].startswith('<map object')
+
+
+@pytest.mark.asyncio
+async def test_body_sandbox():
+    bot = FakeBot()
+    bot.add_channel('C1', 'general')
+    bot.add_user('U1', 'item4')
+    event = bot.create_message('C1', 'U1')
+
+    try:
+        await body(bot, event, '1 + 2', 'help', True)
+        said = bot.call_queue.pop()
+        assert said.data['text'] == '`1 + 2` == `3`'
+
+        await body(bot, event, '1 / 0', 'help', True)
+        said = bot.call_queue.pop()
+        assert said.data['text'] == (
+            '입력해주신 수식은 계산하다보면 0으로 나누기가 발생해서 계산할 수 없어요!'
+        )
+
+        killed = sandbox.killed
+        await body(bot, event, 'sum(range(int(10**12)))', 'help', True)
+        said = bot.call_queue.pop()
+        assert said.data['text'] == (
+            '입력해주신 수식을 계산하려고 했지만 연산 시간이 너무 길어서 중단했어요!'
+        )
+        assert sandbox.killed == killed + 1
+
+        await body(bot, event, 'while True:\n    pass', 'help', True)
+        said = bot.call_queue.pop()
+        assert said.data['text'] == (
+            '입력해주신 수식은 계산량이 너무 많아서 중단했어요! Too many operations'
+        )
+        assert sandbox.killed == killed + 1
+
+        await body(bot, event, '2 ** 10', 'help', True)
+        said = bot.call_queue.pop()
+        assert said.data['text'] == '`2 ** 10` == `1024`'
+    finally:
+        sandbox.close()
+
+
+def test_make_cache_key():
+    key = make_cache_key('a = 1\nif a:\n    a + 1', True)
+    assert key is not None
+    assert make_cache_key('a=1 # one\nif a :\n  a+1\n\n', True) == key
+    assert make_cache_key('a = 1\nif a:\n    a + 1', False) != key
+    assert make_cache_key('a = 1\nif a:\n    a\n+ 1', True) != key
+    assert make_cache_key('"a  b"', True) != make_cache_key('"a b"', True)
+
+    assert make_cache_key('random.random()', True) is None
+    assert make_cache_key('x = datetime.datetime\nx.now()', True) is None
+    assert make_cache_key('(1 + ', True) is None
+    assert make_cache_key('if 1:\n    1\n  2', True) is None
+
+
+def test_result_cache():
+    cache = ResultCache(2, 8)
+    cache.put('a', ('1', {}))
+    cache.put('b', ('2', {}))
+    assert cache.get('a') == ('1', {})
+    cache.put('c', ('3', {}))
+    assert cache.get('b') is None
+    assert cache.get('a') == ('1', {})
+    assert cache.get('c') == ('3', {})
+    cache.put('d', ('123456789', {}))
+    cache.put('e', ('1', {'long': '12345'}))
+    assert cache.get('d') is None
+    assert cache.get('e') is None
+    assert cache.get('a') == ('1', {})
+    cache.clear()
+    assert cache.get('a') is None
+
+
+def test_parse_cache():
+    assert parse('1 + 2') is parse('1 + 2')
+
+    e = Evaluator()
+    assert e.run('[x * 2 for x in [1, 2]]') == [2, 4]
+    assert e.run('[x * 2 for x in [1, 2]]') == [2, 4]
+
+
+@pytest.mark.asyncio
+async def test_body_result_cache(monkeypatch):
+    bot = FakeBot()
+    bot.add_channel('C1', 'general')
+    bot.add_user('U1', 'item4')
+    event = bot.create_message('C1', 'U1')
+    runs = []
+
+    async def run(expr, *, decimal_mode):
+        runs.append(expr)
+        return calculate_text(expr, decimal_mode=decimal_mode)
+
+    monkeypatch.setattr(sandbox, 'run', run)
+    result_cache.clear()
+
+    await body(bot, event, '1 + 2', 'help', True)
+    assert bot.call_queue.pop().data['text'] == '`1 + 2` == `3`'
+    await body(bot, event, '1+2  # three', 'help', True)
+    assert bot.call_queue.pop().data['text'] == '`1+2  # three` == `3`'
+    assert runs == ['1 + 2']
+
+    await body(bot, event, '1 + 2', 'help', False)
+    assert runs == ['1 + 2', '1 + 2']
+
+    await body(bot, event, '1 / 0', 'help', True)
+    await body(bot, event, '1 / 0', 'help', True)
+    assert runs[2:] == ['1 / 0', '1 / 0']
+
+    await body(bot, event, 'random.randint(1, 1)', 'help', True)
+    await body(bot, event, 'random.randint(1, 1)', 'help', True)
+    assert runs[4:] == ['random.randint(1, 1)', 'random.randint(1, 1)']
+    result_cache.clear()
+
+
+def test_shared_global_symbol_table():
+    e1 = Evaluator()
+    e2 = Evaluator()
+    assert e1.global_symbol_table is e2.global_symbol_table
+    assert e1.global_symbol_table is GLOBAL_SYMBOL_TABLE
+
+    with pytest.raises(TypeError):
+        GLOBAL_SYMBOL_TABLE['abs'] = 1  # type: ignore
+    with pytest.raises(AttributeError):
+        e1.allowed_modules[math].add('__loader__')  # type: ignore
+
+    e1.run('abs = 1\npi = 2')
+    assert e1.run('abs + pi') == 3
+    assert e2.run('abs(-pi)') == math.pi
+    assert GLOBAL_SYMBOL_TABLE['abs'] is abs
+
+    e1.run('del abs')
+    assert e1.run('abs(-1)') == 1
@@ -0,0 +1,237 @@
+import asyncio
+
+import pytest
+
+from yui.apps.core import (
+    ChannelRefresher,
+    channel_deleted,
+    channel_marked,
+    channel_mutation_detected,
+    im_created,
+    im_open_or_close,
+    on_start,
+    refresher,
+)
+from yui.event import (
+    ChannelCreated,
+    ChannelDeleted,
+    ChannelMarked,
+    ChannelRename,
+    ChatterboxSystemStart,
+    GroupRename,
+    IMClose,
+    IMCreated,
+    IMMarked,
+)
+from yui.types.slack.response import APIResponse
+
+from ..util import FakeBot
+
+
+def channel_info(channel_id, name):
+    return {
+        'id': channel_id,
+        'name': name,
+        'creator': 'U0',
+        'last_read': '0',
+    }
+
+
+@pytest.mark.asyncio
+async def test_channel_marked():
+    bot = FakeBot()
+    channel = bot.add_channel('C1', 'general', last_read=0)
+    dm = bot.add_dm('D1', 'U0')
+
+    await channel_marked(bot, ChannelMarked(channel='C1', ts='1234.5'))
+    await channel_marked(bot, IMMarked(channel='D1', ts='5678.9'))
+
+    assert channel.last_read == '1234.5'
+    assert dm.last_read == '5678.9'
+    assert not bot.call_queue
+
+
+@pytest.mark.asyncio
+async def test_on_start_from_rtm():
+    bot = FakeBot()
+
+    @bot.response('conversations.info')
+    def conversations_info(data):
+        return APIResponse(
+            body={
+                'ok': True,
+                'channel': channel_info(data['channel'], 'random'),
+            },
+            status=200,
+            headers={},
+        )
+
+    event = ChatterboxSystemStart(rtm={
+        'ok': True,
+        'users': [
+            {'id': 'U1', 'name': 'item4', 'team_id': 'T1'},
+            {'id': 'U2', 'name': 'kirito', 'team_id': 'T1'},
+        ],
+        'channels': [
+            channel_info('C1', 'general'),
+            {'id': 'C2', 'name': 'random'},
+        ],
+        'groups': [channel_info('G1', 'secret')],
+        'ims': [{'id': 'D1', 'user': 'U2', 'is_open': True}],
+    })
+    await on_start(bot, event)
+
+    assert bot.is_ready
+    assert [c.method for c in bot.call_queue] == ['conversations.info']
+    assert bot.call_queue[0].data['channel'] == 'C2'
+    assert [u.name for u in bot.users] == ['item4', 'kirito']
+    assert [c.name for c in bot.channels] == ['general', 'random']
+    assert [g.name for g in bot.groups] == ['secret']
+    assert bot.ims.get_by_key('U2').id == 'D1'
+    assert bot.ims[0].user.name == 'kirito'
+
+
+@pytest.mark.asyncio
+async def test_on_start_without_rtm():
+    bot = FakeBot()
+
+    def list_response(key, objs, data):
+        cursor = data.get('cursor')
+        page = int(cursor) if cursor else 0
+        next_cursor = str(page + 1) if page + 1 < len(objs) else ''
+        return APIResponse(
+            body={
+                'ok': True,
+                key: objs[page:page + 1],
+                'response_metadata': {'next_cursor': next_cursor},
+            },
+            status=200,
+            headers={},
+        )
+
+    @bot.response('users.list')
+    def users_list(data):
+        return list_response('members', [
+            {'id': 'U1', 'name': 'item4', 'team_id': 'T1'},
+            {'id': 'U2', 'name': 'kirito', 'team_id': 'T1'},
+        ], data)
+
+    @bot.response('conversations.list')
+    def conversations_list(data):
+        assert data['types'] == 'im,private_channel,public_channel'
+        return list_response('channels', [
+            channel_info('C1', 'C1'),
+            {'id': 'D1', 'user': 'U2', 'is_im': True},
+            channel_info('C2', 'C2'),
+        ], data)
+
+    await on_start(bot, ChatterboxSystemStart())
+
+    assert bot.is_ready
+    methods = [c.method for c in bot.call_queue]
+    assert methods.count('users.list') == 2
+    assert methods.count('conversations.list') == 3
+    assert [u.id for u in bot.users] == ['U1', 'U2']
+    assert [c.name for c in bot.channels] == ['C1', 'C2']
+    assert not bot.groups
+    assert [d.id for d in bot.ims] == ['D1']
+
+
+@pytest.mark.asyncio
+async def test_channel_refresher(monkeypatch):
+    bot = FakeBot()
+    bot.add_channel('C1', 'general')
+    bot.add_channel('C2', 'random')
+    bot.add_private_channel('G1', 'secret')
+    monkeypatch.setattr(refresher, 'delay', 0.01)
+
+    @bot.response('conversations.info')
+    def conversations_info(data):
+        if data['channel'] == 'C2':
+            return APIResponse(
+                body={'ok': False, 'error': 'channel_not_found'},
+                status=200,
+                headers={},
+            )
+        name = 'new-secret' if data['channel'] == 'G1' else 'new-name'
+        return APIResponse(
+            body={
+                'ok': True,
+                'channel': channel_info(data['channel'], name),
+            },
+            status=200,
+            headers={},
+        )
+
+    for _ in range(10):
+        await channel_mutation_detected(bot, ChannelRename(channel='C1'))
+    await channel_mutation_detected(bot, ChannelCreated(channel={
+        'id': 'C3',
+        'name': 'new',
+    }))
+    await channel_mutation_detected(bot, ChannelRename(channel='C2'))
+    await channel_mutation_detected(bot, GroupRename(channel='G1'))
+    await refresher.task
+
+    assert [c.method for c in bot.call_queue] == [
+        'conversations.info',
+        'conversations.info',
+        'conversations.info',
+        'conversations.info',
+    ]
+    assert [(c.id, c.name) for c in bot.channels] == [
+        ('C1', 'new-name'),
+        ('C3', 'new-name'),
+    ]
+    assert [(g.id, g.name) for g in bot.groups] == [('G1', 'new-secret')]
+
+
+@pytest.mark.asyncio
+async def test_channel_refresher_invalidate():
+    bot = FakeBot()
+    refresher = ChannelRefresher()
+    refresher.delay = 0.01
+
+    @bot.response('conversations.list')
+    def conversations_list(data):
+        assert data['types'] == 'im'
+        return APIResponse(
+            body={'ok': True, 'channels': [{'id': 'D1', 'user': 'U0'}]},
+            status=200,
+            headers={},
+        )
+
+    refresher.refresh(bot, 'D2')
+    refresher.invalidate(bot, 'ims')
+    refresher.invalidate(bot, 'ims')
+    await refresher.task
+    await asyncio.sleep(0)
+
+    assert [c.method for c in bot.call_queue] == ['conversations.list']
+    assert [d.id for d in bot.ims] == ['D1']
+
+
+@pytest.mark.asyncio
+async def test_channel_deleted():
+    bot = FakeBot()
+    bot.add_channel('C1', 'general')
+    bot.add_channel('C2', 'random')
+
+    await channel_deleted(bot, ChannelDeleted(channel='C2'))
+
+    assert [c.id for c in bot.channels] == ['C1']
+
+
+@pytest.mark.asyncio
+async def test_im_events():
+    bot = FakeBot()
+    bot.add_user('U1', 'kirito')
+
+    await im_created(bot, IMCreated(user='U1', channel={'id': 'D1'}))
+    assert [(d.id, d.user.id, d.is_open) for d in bot.ims] == [
+        ('D1', 'U1', True),
+    ]
+
+    await im_open_or_close(bot, IMClose(user='U1', channel='D1'))
+    assert not bot.ims[0].is_open
+    assert not bot.call_queue
@@ -1,5 +1,7 @@
 import pytest
 
+from yarl import URL
+
 from yui.apps.search.ref import (
     css,
     fetch_css_ref,
@@ -8,6 +10,7 @@ from yui.apps.search.ref import (
     html,
     python,
 )
+from yui.apps.shared.cache import JSONCache
 
 from ...util import FakeBot
 
@@ -118,3 +121,77 @@ async def test_python_command(fx_sess):
     assert said.method == 'chat.postMessage'
     assert said.data['channel'] == 'C1'
     assert said.data['text'] == '비슷한 Python library를 찾지 못하겠어요!'
+
+
+@pytest.mark.asyncio
+async def test_fetch_ref_validators(fx_sess, response_mock):
+    url = 'https://developer.mozilla.org/en-US/docs/Web/CSS/Reference'
+    page = (
+        '<html><body>'
+        '<a href="/en-US/docs/Web/CSS/color">color</a>'
+        '</body></html>'
+    )
+    bot = FakeBot()
+
+    response_mock.get(
+        url,
+        body=page,
+        headers={'ETag': '"v1"', 'Last-Modified': 'Sat, 17 Oct 2026'},
+    )
+    await fetch_css_ref(bot, fx_sess)
+    ref = fx_sess.query(JSONCache).filter_by(name='css').one()
+    assert ref.body == [
+        ['color', 'https://developer.mozilla.org/en-US/docs/Web/CSS/color'],
+    ]
+    assert ref.etag == '"v1"'
+    created_at = ref.created_at
+
+    # fresh cache does not make request
+    await fetch_css_ref(bot, fx_sess)
+    assert len(response_mock.requests[('GET', URL(url))]) == 1
+
+    response_mock.get(url, status=304)
+    await fetch_css_ref(bot, fx_sess, force=True)
+    ref = fx_sess.query(JSONCache).filter_by(name='css').one()
+    assert ref.created_at > created_at
+    created_at = ref.created_at
+    request = response_mock.requests[('GET', URL(url))][-1]
+    assert request.kwargs['headers'] == {
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': 'Sat, 17 Oct 2026',
+    }
+
+    response_mock.get(url, body=page, headers={'ETag': '"v2"'})
+    await fetch_css_ref(bot, fx_sess, force=True)
+    ref = fx_sess.query(JSONCache).filter_by(name='css').one()
+    assert ref.etag == '"v1"'
+    assert ref.created_at > created_at
+
+    # revalidated cache is fresh again
+    bot.config.REF_MAX_AGE = 0
+    response_mock.get(url, status=304)
+    await fetch_css_ref(bot, fx_sess)
+    bot.config.REF_MAX_AGE = 60
+    await fetch_css_ref(bot, fx_sess)
+    assert len(response_mock.requests[('GET', URL(url))]) == 4
+
+
+@pytest.mark.asyncio
+async def test_ref_not_ready(fx_sess):
+    bot = FakeBot()
+    bot.add_channel('C1', 'general')
+    bot.add_user('U1', 'item4')
+    event = bot.create_message('C1', 'U1')
+
+    await html(bot, event, fx_sess, 'tbody')
+    said = bot.call_queue.pop()
+    assert said.data['text'] == (
+        '아직 레퍼런스 관련 명령어의 실행준비가 덜 되었어요. 잠시만 기다려주세요!'
+    )
+
+    bot.warmed_up.add('html')
+    await html(bot, event, fx_sess, 'tbody')
+    said = bot.call_queue.pop()
+    assert said.data['text'] == (
+        '레퍼런스 데이터를 찾지 못했어요. 잠시 후에 다시 시도해주세요!'
+    )
@@ -5,8 +5,10 @@ import pytest
 import ujson
 
 from yui.api import SlackAPI
-from yui.bot import Bot
+from yui.bot import Bot, can_send_by_rtm, peek_event_type
 from yui.box import Box
+from yui.event import Message
+from yui.types.channel import PublicChannel
 from yui.types.slack.response import APIResponse
 
 from .util import FakeImportLib
@@ -121,3 +123,256 @@ async def test_call(fx_config, response_mock):
         status=200,
         headers={'content-type': 'application/json'},
     )
+
+    await bot.close_session()
+    assert bot.session is None
+
+
+@pytest.mark.asyncio
+async def test_session(fx_config):
+    fx_config.API_CONNECTION_LIMIT = 3
+    bot = Bot(fx_config, using_box=Box())
+    assert bot.session is None
+
+    session = bot.get_session()
+    assert bot.session is session
+    assert bot.get_session() is session
+    assert session.connector.limit == 3
+
+    await bot.close_session()
+    assert bot.session is None
+    assert session.closed
+
+    new_session = bot.get_session()
+    assert new_session is not session
+    await new_session.close()
+    assert bot.get_session() is not new_session
+    await bot.close_session()
+
+
+@pytest.mark.asyncio
+async def test_process(fx_config):
+    fx_config.DISPATCH_CONCURRENCY = 2
+    box = Box()
+    bot = Bot(fx_config, using_box=box)
+    bot.loop = asyncio.get_event_loop()
+    log = []
+
+    @box.on(Message)
+    async def first(event):
+        log.append(('start', event.channel.id, event.text))
+        if event.channel.id == 'C1':
+            await asyncio.sleep(0.1)
+        log.append(('end', event.channel.id, event.text))
+        return event.text != 'stop'
+
+    @box.on(Message)
+    async def second(event):
+        log.append(('second', event.channel.id, event.text))
+        return True
+
+    task = bot.loop.create_task(bot.process())
+    # bad event which can not be routed does not stop processing
+    await bot.queue.put(Message(channel='X1', text='bad'))
+    await bot.queue.put(Message(channel='C1', text='slow'))
+    await bot.queue.put(Message(channel='C1', text='stop'))
+    await bot.queue.put(Message(channel='C2', text='fast'))
+    await asyncio.sleep(0.5)
+    task.cancel()
+
+    assert log == [
+        ('start', 'C1', 'slow'),
+        ('start', 'C2', 'fast'),
+        ('end', 'C2', 'fast'),
+        ('second', 'C2', 'fast'),
+        ('end', 'C1', 'slow'),
+        ('second', 'C1', 'slow'),
+        ('start', 'C1', 'stop'),
+        ('end', 'C1', 'stop'),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_process_concurrency(fx_config):
+    fx_config.DISPATCH_CONCURRENCY = 2
+    box = Box()
+    bot = Bot(fx_config, using_box=box)
+    bot.loop = asyncio.get_event_loop()
+    running = []
+    peak = []
+    done = []
+
+    @box.on(Message)
+    async def slow(event):
+        if event.text == 'error':
+            raise ValueError(event.text)
+        running.append(event.channel.id)
+        peak.append(len(running))
+        await asyncio.sleep(0.05)
+        running.remove(event.channel.id)
+        done.append(event.channel.id)
+        return True
+
+    async def fail_to_say(*args, **kwargs):
+        raise RuntimeError('can not report error')
+
+    bot.say = fail_to_say
+
+    task = bot.loop.create_task(bot.process())
+    await bot.queue.put(Message(channel='C1', text='error'))
+    for channel in ['C1', 'C2', 'C3', 'C4', 'C5']:
+        await bot.queue.put(Message(channel=channel, text='hi'))
+    await asyncio.sleep(0.5)
+    task.cancel()
+
+    assert sorted(done) == ['C1', 'C2', 'C3', 'C4', 'C5']
+    assert max(peak) == 2
+
+
+def test_can_send_by_rtm():
+    assert can_send_by_rtm('C1', 'hello', {})
+    assert can_send_by_rtm('D1', 'hello', {'thread_ts': '1.2'})
+    assert not can_send_by_rtm('U1', 'hello', {})
+    assert not can_send_by_rtm('', 'hello', {})
+    assert not can_send_by_rtm('Cat', 'hello', {})
+    assert not can_send_by_rtm('owner', 'hello', {})
+    assert not can_send_by_rtm('C', 'hello', {})
+    assert not can_send_by_rtm(None, 'hello', {})  # type: ignore
+    assert not can_send_by_rtm(1, 'hello', {})  # type: ignore
+    channel = PublicChannel(id='C1', name='general', creator='U1', last_read=0)
+    assert can_send_by_rtm(channel, 'hello', {})
+    assert not can_send_by_rtm('C1', '', {})
+    assert not can_send_by_rtm('C1', 'hello @item4', {})
+    assert not can_send_by_rtm('C1', 'see #general', {})
+    assert not can_send_by_rtm('C1', 'a' * 5000, {})
+    assert not can_send_by_rtm('C1', 'hello', {'attachments': []})
+    assert not can_send_by_rtm('C1', 'hello', {'username': 'yui'})
+
+
+class FakeWebSocket:
+
+    def __init__(self, bot, reply):
+        self.bot = bot
+        self.reply = reply
+        self.sent = []
+
+    async def send_str(self, data):
+        payload = ujson.loads(data)
+        self.sent.append(payload)
+        if self.reply is not None:
+            self.bot.loop.call_soon(
+                self.bot.resolve_rtm_reply,
+                dict(self.reply, reply_to=payload['id']),
+            )
+
+
+@pytest.mark.asyncio
+async def test_say_via_rtm(fx_config, response_mock):
+    response_mock.post(
+        'https://slack.com/api/chat.postMessage',
+        body=ujson.dumps({'ok': True, 'ts': '2.0'}),
+        headers={'content-type': 'application/json'},
+    )
+    fx_config.RTM_FAST_REPLY = True
+    bot = Bot(fx_config, using_box=Box())
+    bot.loop = asyncio.get_event_loop()
+
+    bot.ws = FakeWebSocket(bot, {'ok': True, 'ts': '1.0', 'text': 'hi'})
+    res = await bot.say('C1', 'hi', thread_ts='0.1')
+    assert res.body['ok']
+    assert res.body['ts'] == '1.0'
+    assert res.body['channel'] == 'C1'
+    assert bot.ws.sent == [{
+        'id': 1,
+        'type': 'message',
+        'channel': 'C1',
+        'text': 'hi',
+        'thread_ts': '0.1',
+    }]
+    assert not bot.rtm_replies
+
+    bot.ws = FakeWebSocket(bot, {'ok': False, 'error': {'code': 2}})
+    res = await bot.say('C1', 'hi')
+    assert bot.ws.sent[0]['id'] == 2
+    assert res.body == {'ok': True, 'ts': '2.0'}
+
+    bot.ws = FakeWebSocket(bot, None)
+    task = bot.loop.create_task(bot.say('C1', 'hi'))
+    await asyncio.sleep(0.01)
+    bot.abort_rtm_replies()
+    res = await task
+    assert res.body == {'ok': False, 'error': 'rtm_reply_timeout'}
+
+    await bot.close_session()
+
+
+def test_peek_event_type():
+    assert peek_event_type('{"type":"hello"}') == 'hello'
+    assert peek_event_type(' { "type" : "user_typing", "user": "U1"}') == \
+        'user_typing'
+    assert peek_event_type('{"channel":"C1","type":"message"}') is None
+    assert peek_event_type('{"ok":true,"reply_to":1}') is None
+
+
+def test_decode_frame(fx_config):
+    box = Box()
+    bot = Bot(fx_config, using_box=box)
+
+    @box.on(Message)
+    async def on_message():
+        pass
+
+    event = bot.decode_frame(
+        '{"type":"message","channel":"C1","user":"U1","text":"hi"}'
+    )
+    assert isinstance(event, Message)
+    assert event.text == 'hi'
+
+    with pytest.raises(KeyError):
+        bot.decode_frame('{"type":"message","channel":"X1","text":"hi"}')
+
+    assert bot.decode_frame('{"type":"user_typing","channel":"C1"}') is None
+    assert bot.decode_frame('{"type":"user_typing","user":"U1"}') is None
+    assert bot.decode_frame('{"user":"U1","type":"presence_change"}') is None
+    assert bot.decode_frame('{"ok":true,"reply_to":1,"ts":"1.0"}') is None
+    assert bot.dropped_events == {'user_typing': 2, 'presence_change': 1}
+
+
+@pytest.mark.asyncio
+async def test_warmup(fx_config):
+    box = Box()
+    bot = Bot(fx_config, using_box=box)
+    bot.loop = asyncio.get_event_loop()
+    started = asyncio.Event()
+    finish = asyncio.Event()
+    log = []
+
+    @box.warmup('slow')
+    async def slow(bot, sess):
+        log.append(('slow', bot is not None, sess is not None))
+        started.set()
+        await finish.wait()
+
+    @box.warmup('broken')
+    async def broken():
+        log.append(('broken',))
+        raise ValueError()
+
+    bot.start_warmups()
+    await started.wait()
+    bot.start_warmups()
+    await asyncio.sleep(0)
+
+    assert not bot.is_warmed_up('slow')
+    assert not bot.is_warmed_up('broken')
+
+    finish.set()
+    await asyncio.wait(bot.warmup_tasks.values())
+
+    assert bot.is_warmed_up('slow')
+    assert not bot.is_warmed_up('broken')
+    assert log == [
+        ('slow', True, True),
+        ('broken',),
+        ('broken',),
+    ]
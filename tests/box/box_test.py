@@ -1,6 +1,10 @@
 from yui.box import Box
+from yui.box.apps.base import BaseApp
 from yui.box.apps.basic import App
-from yui.event import Hello
+from yui.box.apps.route import RouteApp
+from yui.event import Hello, Message, UserTyping
+
+from ..util import FakeBot
 
 
 def test_box_class():
@@ -57,3 +61,112 @@ def test_box_class():
 
     assert box.tasks[0].spec == '*/3 * * * *'
     assert box.tasks[0].handler == test4
+    assert not box.warmups
+
+    @box.warmup('dataset')
+    async def test5():
+        pass
+
+    assert box.warmups[0].name == 'dataset'
+    assert box.warmups[0].handler == test5
+
+
+def test_box_get_apps():
+    bot = FakeBot()
+    bot.add_channel('C1', 'general')
+    box = Box()
+
+    @box.command('foo', ['f'])
+    async def foo():
+        pass
+
+    @box.on(Message)
+    async def everything():
+        pass
+
+    @box.command('bar')
+    async def bar():
+        pass
+
+    class Baz(RouteApp):
+
+        def __init__(self) -> None:
+            self.name = 'baz'
+            self.route_list = []
+
+    baz = Baz()
+    box.register(baz)
+
+    @box.on(Hello)
+    async def hello():
+        pass
+
+    foo_app, everything_app, bar_app, _, hello_app = box.apps
+
+    def message(text):
+        return Message(channel='C1', user='U1', text=text)
+
+    assert box.get_apps(message('=foo'), '=') == [
+        foo_app,
+        everything_app,
+    ]
+    assert box.get_apps(message('=f 1 2 3'), '=') == [
+        foo_app,
+        everything_app,
+    ]
+    assert box.get_apps(message('=bar'), '=') == [
+        everything_app,
+        bar_app,
+    ]
+    assert box.get_apps(message('=baz add'), '=') == [
+        everything_app,
+        baz,
+    ]
+    assert box.get_apps(message('foo'), '=') == [everything_app]
+    assert box.get_apps(message('=qux'), '=') == [everything_app]
+    assert box.get_apps(Hello(), '=') == [hello_app]
+    assert box.get_apps(UserTyping(channel='C1', user='U1'), '=') == []
+    assert box.get_apps(
+        Message(channel='C1', user='U1', text='=baz', subtype='bot_message'),
+        '=',
+    ) == [baz]
+
+    @box.command('qux')
+    async def qux():
+        pass
+
+    assert box.get_apps(message('=qux'), '=') == [
+        everything_app,
+        box.apps[-1],
+    ]
+
+
+def test_box_subscribes():
+    box = Box()
+
+    @box.on(Hello)
+    async def hello():
+        pass
+
+    assert box.subscribes('hello')
+    assert not box.subscribes('message')
+    assert not box.subscribes('user_typing')
+
+    @box.command('foo')
+    async def foo():
+        pass
+
+    assert box.subscribes('message')
+    assert not box.subscribes('user_typing')
+
+    class Baz(RouteApp):
+
+        def __init__(self) -> None:
+            self.name = 'baz'
+            self.route_list = []
+
+    box.register(Baz())
+    assert not box.subscribes('user_typing')
+
+    box.register(BaseApp())
+    assert box.subscribes('user_typing')
@@ -0,0 +1,73 @@
+import pytest
+
+from yui.box import Box
+from yui.box.injection import InjectionContext, get_injection_plan
+from yui.event import Message
+from yui.orm import EngineConfig
+
+from ..util import FakeBot
+
+
+def test_injection_plan(fx_config):
+    box = Box()
+    bot = FakeBot(fx_config, using_box=box)
+
+    @box.command('test')
+    async def test(self, bot, engine_config, cache):
+        pass
+
+    handler = box.apps[0].handler
+    plan = get_injection_plan(box, handler)
+    assert [key for key, _ in plan.steps] == [
+        '_self',
+        'bot',
+        'engine_config',
+    ]
+    assert get_injection_plan(box, handler) is plan
+
+    ctx = InjectionContext(bot=bot, app=box.apps[0])
+    kwargs = plan.resolve(ctx, {'raw': 'foo'})
+    assert kwargs['raw'] == 'foo'
+    assert kwargs['_self'] is box.apps[0]
+    assert kwargs['bot'] is bot
+    assert kwargs['engine_config'] == EngineConfig(
+        url=fx_config.DATABASE_URL,
+        echo=fx_config.DATABASE_ECHO,
+    )
+    assert kwargs['engine_config'] is plan.resolve(ctx, {})['engine_config']
+    assert ctx._sess is None
+
+    cache = {}
+
+    @box.provide('cache')
+    def provide_cache(ctx: InjectionContext):
+        return cache
+
+    new_plan = get_injection_plan(box, handler)
+    assert new_plan is not plan
+    assert new_plan.resolve(ctx, {})['cache'] is cache
+
+
+@pytest.mark.asyncio
+async def test_prepare_kwargs(fx_config, fx_engine):
+    fx_config.DATABASE_ENGINE = fx_engine
+    box = Box()
+    bot = FakeBot(fx_config, using_box=box)
+    called = []
+
+    @box.provide('counter')
+    def provide_counter(ctx: InjectionContext):
+        called.append(ctx.event)
+        return len(called)
+
+    @box.on(Message)
+    async def on_message(event, counter, sess):
+        assert sess.bind is fx_engine
+        assert counter == len(called)
+        return True
+
+    app = box.apps[0]
+    event = bot.create_message('C1', 'U1')
+    assert await app.run(bot, event)
+    assert await app.run(bot, event)
+    assert called == [event, event]
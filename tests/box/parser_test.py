@@ -243,3 +243,42 @@ def test_parse_option_and_arguments():
         parse_option_and_arguments(app.handler, chunks)
     assert e.value.msg == ('args: fail to transform argument value '
                            '(day is out of range for month)')
+
+
+def test_parser_plan():
+    box = Box()
+
+    @box.command('test-plan')
+    @option('--count', '-c')
+    @option('--flag', is_flag=True)
+    @argument('words', nargs=-1)
+    async def test_plan(count: int, flag: bool, words, name=None):
+        pass
+
+    app: App = box.apps.pop()
+    handler = app.handler
+    assert handler.parser_plan is None
+
+    chunks = ['-c=3', '--flag=a', 'b']
+    kw, remain_chunks = parse_option_and_arguments(handler, chunks)
+    assert kw == {'count': 3, 'flag': True, 'words': ('a', 'b')}
+    assert not remain_chunks
+    assert chunks == ['-c=3', '--flag=a', 'b']
+
+    plan = handler.parser_plan
+    assert plan is not None
+    assert set(plan.options) == {'--count', '-c', '--flag'}
+    assert plan.arguments[0].rest_nargs == -1
+
+    parse_option_and_arguments(handler, ['a'])
+    assert handler.parser_plan is plan
+
+    option('--name', default='yui')(handler)
+    assert handler.parser_plan is None
+
+    kw, remain_chunks = parse_option_and_arguments(
+        handler,
+        ['--name', 'kirito', 'a'],
+    )
+    assert kw == {'count': None, 'flag': None, 'name': 'kirito',
+                  'words': ('a',)}
@@ -1,6 +1,14 @@
+import random
+import shlex
 from typing import List, Set, Tuple
 
-from yui.box.utils import is_container
+import pytest
+
+from yui.box.utils import is_container, split_call, tokenize
+from yui.event import Message
+from yui.types.objects import MessageMessage
+
+from ..util import FakeBot
 
 
 def test_is_container():
@@ -13,3 +21,75 @@ def test_is_container():
     assert not is_container(int)
     assert not is_container(float)
     assert not is_container(bool)
+
+
+def test_split_call():
+    FakeBot()
+    event = Message(channel='C1', user='U1', text='=foo  bar &amp; baz')
+    assert split_call(event) == ('=foo', 'bar &amp; baz')
+    assert event.__dict__['_call'] == ('=foo', 'bar &amp; baz')
+
+    event = Message(channel='C1', user='U1', text='=foo')
+    assert split_call(event) == ('=foo', '')
+
+    event = Message(channel='C1', user='U1', subtype='message_changed')
+    event.message = MessageMessage(user='U1', ts='1', text='=bar baz')
+    assert split_call(event) == ('=bar', 'baz')
+
+    event = Message(channel='C1', user='U1')
+    assert split_call(event) == ('', '')
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    '   ',
+    'foo bar  baz',
+    ' \t foo\nbar\r\nbaz ',
+    'foo\u3000bar\x0bbaz',
+    '--option=value "quoted value" \'single quoted\'',
+    'a"b c"d',
+    "a'b c'd",
+    '"" \'\' a""',
+    '"\\"" "\\\\" "\\a" "\\\n"',
+    "'\\' '\\\"'",
+    'foo\\ bar \\"baz\\" \\\\',
+    'a\\\nb',
+    '"multi\nline" \'block\nof text\'',
+    '한글 "따옴표 안" \'작은 따옴표\'',
+    '1 + 2 * (3 - 4) # not a comment',
+])
+def test_tokenize(text):
+    assert tokenize(text) == shlex.split(text)
+
+
+@pytest.mark.parametrize('text', [
+    '"unclosed',
+    "'unclosed",
+    'trailing\\',
+    'a "b\\" c',
+])
+def test_tokenize_error(text):
+    with pytest.raises(ValueError) as e:
+        shlex.split(text)
+    with pytest.raises(ValueError) as e2:
+        tokenize(text)
+    assert str(e2.value) == str(e.value)
+
+
+def test_tokenize_random():
+    rnd = random.Random(18)
+    alphabet = [
+        'a', '가', '=', '-', ' ', '\t', '\n', '\r', '\x0b', '\u3000',
+        "'", '"', '\\', '\\"', "''", '""',
+    ]
+    for _ in range(5000):
+        text = ''.join(
+            rnd.choice(alphabet) for _ in range(rnd.randint(0, 16))
+        )
+        try:
+            expected = shlex.split(text)
+        except ValueError:
+            with pytest.raises(ValueError):
+                tokenize(text)
+        else:
+            assert tokenize(text) == expected, text
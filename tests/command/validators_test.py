@@ -1,7 +1,15 @@
 import pytest
 
 from yui.command.helpers import C, Cs
-from yui.command.validators import DM, get_channel_names, not_, only
+from yui.command.validators import (
+    ChannelSpec,
+    DM,
+    get_channel_ids,
+    get_channel_names,
+    not_,
+    only,
+)
+from yui.exceptions import AllChannelsError
 from yui.types.namespace import name_convert
 
 from ..util import FakeBot
@@ -42,6 +50,63 @@ def test_get_channel_names(fx_config):
     assert fetch_error is True
 
 
+def test_get_channel_ids(fx_config):
+    fx_config.CHANNELS = {
+        'general': 'general',
+        'commons': ['general', 'random'],
+    }
+
+    bot = FakeBot(fx_config)
+    bot.add_user('U1', 'item4')
+    bot.add_channel('C1', 'general')
+    bot.add_channel('C2', 'random')
+    bot.add_channel('C3', 'food')
+    bot.add_channel('C4', 'work')
+    bot.add_dm('D1', 'U1')
+    bot.add_private_channel('G1', 'secret')
+
+    ids, dm, fetch_error = get_channel_ids([
+        C.general,
+        Cs.commons,
+        name_convert('food'),
+        DM,
+        'work',
+        'secret',
+        'unknown',
+    ])
+
+    assert ids == {'C1', 'C2', 'C3', 'C4', 'G1'}
+    assert dm is True
+    assert fetch_error is False
+
+
+def test_channel_spec(fx_config):
+    fx_config.CHANNELS = {
+        'commons': ['general', 'random'],
+    }
+    bot = FakeBot(fx_config)
+    bot.add_channel('C1', 'general')
+
+    spec = ChannelSpec([Cs.commons, 'food'])
+    with pytest.raises(KeyError):
+        name_convert('random')
+    ids, dm, fetch_error = spec.resolve()
+    assert fetch_error is True
+
+    bot.add_channel('C2', 'random')
+    bot.add_channel('C3', 'food')
+    result = spec.resolve()
+    assert result == ({'C1', 'C2', 'C3'}, False, False)
+    assert spec.resolve() is result
+
+    fx_config.CHANNELS['commons'].remove('random')
+    assert spec.resolve() == ({'C1', 'C3'}, False, False)
+
+    fx_config.CHANNELS['commons'] = '*'
+    with pytest.raises(AllChannelsError):
+        spec.resolve()
+
+
 @pytest.mark.asyncio
 async def test_only(fx_config):
     fx_config.CHANNELS = {
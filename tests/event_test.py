@@ -1,4 +1,14 @@
-from yui.event import Hello, TeamMigrationStarted, UnknownEvent, create_event
+import pytest
+
+from yui.event import (
+    Hello,
+    Message,
+    TeamMigrationStarted,
+    UnknownEvent,
+    create_event,
+)
+
+from .util import FakeBot
 
 
 def test_create_event():
@@ -14,3 +24,43 @@ def test_create_event():
     event: UnknownEvent = create_event({'type': 'not exists it'})
     assert type(event) == UnknownEvent
     assert event.type == 'not exists it'
+
+
+def test_lazy_field():
+    bot = FakeBot()
+    bot.add_channel('C1', 'general')
+    bot.add_user('U1', 'item4')
+
+    event: Message = create_event({
+        'type': 'message',
+        'channel': 'C1',
+        'user': 'U1',
+        'text': 'hello',
+        'ts': '1234.5678',
+        'unknown': 'value',
+    })
+    assert event._raw['channel'] == 'C1'
+    assert event._raw['user'] == 'U1'
+    assert event.unknown == 'value'
+
+    assert event.text == 'hello'
+    assert 'text' not in event._raw
+    assert 'channel' in event._raw
+
+    channel = event.channel
+    assert channel.name == 'general'
+    assert event.channel is channel
+    assert 'channel' not in event._raw
+
+    event.user = 'U2'
+    assert event.user == 'U2'
+    assert 'user' not in event._raw
+
+    assert event.hidden is False
+    assert event.message is None
+
+    bad: Message = create_event({'type': 'message', 'channel': 'X1'})
+    for _ in range(2):
+        with pytest.raises(KeyError):
+            bad.channel
+    assert bad._raw['channel'] == 'X1'
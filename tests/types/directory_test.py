@@ -0,0 +1,105 @@
+from yui.types.directory import Directory
+from yui.types.user import User
+
+from ..util import FakeBot
+
+
+def test_directory_lookup():
+    FakeBot()
+    u1 = User(id='U1', team_id='T1', name='item4')
+    u2 = User(id='U2', team_id='T1', name='item4_2')
+    dup = User(id='U1', team_id='T1', name='dup')
+    users = Directory([u1, u2, dup])
+
+    assert users.get('U1') is u1
+    assert users.get('U2') is u2
+    assert users.get('U3') is None
+    assert users.get_by_key('item4') is u1
+    assert users.get_by_key('dup') is dup
+    assert users.get_by_key('unknown') is None
+
+
+def test_directory_mutation():
+    FakeBot()
+    u1 = User(id='U1', team_id='T1', name='item4')
+    u2 = User(id='U2', team_id='T1', name='item4_2')
+    u3 = User(id='U3', team_id='T1', name='kirito')
+    users = Directory([u1])
+
+    assert users.get('U1') is u1
+    users.append(u2)
+    assert users.get('U2') is u2
+    assert users.get_by_key('item4_2') is u2
+
+    renamed = User(id='U2', team_id='T1', name='asuna')
+    users.upsert(renamed)
+    assert users == [u1, renamed]
+    assert users.get('U2') is renamed
+    assert users.get_by_key('asuna') is renamed
+    assert users.get_by_key('item4_2') is None
+
+    users.upsert(u3)
+    assert users == [u1, renamed, u3]
+    assert users.get_by_key('kirito') is u3
+
+    users.discard('U1')
+    users.discard('U4')
+    assert users == [renamed, u3]
+    assert users.get('U1') is None
+
+    users[0] = u1
+    assert users.get('U1') is u1
+    assert users.get('U2') is None
+
+    users.extend([u2])
+    assert users.get_by_key('item4_2') is u2
+
+    users.clear()
+    assert users.get('U1') is None
+
+
+def test_directory_rename():
+    FakeBot()
+    u1 = User(id='U1', team_id='T1', name='a')
+    u2 = User(id='U2', team_id='T1', name='b')
+    users = Directory([u1, u2])
+    assert users.get('U1') is u1
+
+    # upserts right after rename without lookup between them
+    renamed = User(id='U1', team_id='T1', name='a2')
+    users.upsert(renamed)
+    renamed2 = User(id='U2', team_id='T1', name='b2')
+    users.upsert(renamed2)
+    assert users == [renamed, renamed2]
+    assert users.get_by_key('a2') is renamed
+    assert users.get_by_key('b2') is renamed2
+    assert users.get_by_key('a') is None
+    assert users.get_by_key('b') is None
+
+    # duplicated key which was hidden behind renamed object
+    dup = User(id='U3', team_id='T1', name='a2')
+    users.append(dup)
+    users.upsert(User(id='U1', team_id='T1', name='c'))
+    assert users.get_by_key('a2') is dup
+
+    # renamed to key which later object has, so it wins by order
+    first = User(id='U1', team_id='T1', name='b2')
+    users.upsert(first)
+    assert users.get_by_key('b2') is first
+    assert users.get('U2') is renamed2
+
+    users.discard('U1')
+    users.upsert(User(id='U4', team_id='T1', name='d'))
+    assert users.get_by_key('b2') is renamed2
+    assert users.get_by_key('d').id == 'U4'
+
+
+def test_directory_key():
+    FakeBot()
+    users = Directory(
+        [User(id='U1', team_id='T1', name='item4')],
+        key=lambda x: x.name.upper(),
+    )
+
+    assert users.get_by_key('ITEM4').id == 'U1'
+    assert users.get_by_key('item4') is None
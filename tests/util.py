@@ -1,18 +1,21 @@
 import asyncio
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
-from typing import Callable, Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Set, Union
 
 import attr
 
 from yui.api import SlackAPI
 from yui.bot import Bot
+from yui.box import Box, box
 from yui.config import Config, DEFAULT
 from yui.event import Message
 from yui.types.channel import (
     DirectMessageChannel,
     PrivateChannel,
     PublicChannel,
+    get_dm_user_id,
 )
+from yui.types.directory import Directory
 from yui.types.namespace import Namespace
 from yui.types.user import User
 
@@ -29,7 +32,12 @@ class Call:
 class FakeBot(Bot):
     """Fake bot for test"""
 
-    def __init__(self, config: Config = None) -> None:
+    def __init__(
+        self,
+        config: Config = None,
+        *,
+        using_box: Box = None,
+    ) -> None:
         if config is None:
             config = Config(**DEFAULT, TOKEN='asdf', CHANNELS={}, USERS={})
 
@@ -37,12 +45,19 @@ class FakeBot(Bot):
         self.loop = asyncio.get_event_loop()
         self.call_queue: List[Call] = []
         self.api = SlackAPI(self)
-        self.channels: List[PublicChannel] = []
-        self.ims: List[DirectMessageChannel] = []
-        self.groups: List[PrivateChannel] = []
-        self.users: List[User] = [User(id='U0', team_id='T0', name='system')]
+        self.channels: Directory[PublicChannel] = Directory()
+        self.ims: Directory[DirectMessageChannel] = Directory(
+            key=get_dm_user_id,
+        )
+        self.groups: Directory[PrivateChannel] = Directory()
+        self.users: Directory[User] = Directory([
+            User(id='U0', team_id='T0', name='system'),
+        ])
         self.responses: Dict[str, Callable] = {}
         self.config = config
+        self.box = using_box or box
+        self.warmup_tasks: Dict[str, asyncio.Task] = {}
+        self.warmed_up: Set[str] = set()
         self.process_pool_executor = ProcessPoolExecutor()
         self.thread_pool_executor = ThreadPoolExecutor()
 
@@ -1,9 +1,19 @@
-from typing import Any, Dict, List, NewType, Optional, Set, Tuple, Union
+from typing import (
+    Any,
+    Dict,
+    List,
+    NewType,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import pytest
 
 from yui.types.namespace import Field, namespace
-from yui.utils.cast import cast
+from yui.utils.cast import CastError, cast
 
 from ..util import FakeBot
 
@@ -68,3 +78,19 @@ def test_cast():
 
     with pytest.raises(ValueError):
         cast(Union[int, float], 'asdf')
+
+
+def test_cast_plan():
+    plan = cast.get_plan(List[int])
+    assert cast.get_plan(List[int]) is plan
+    assert plan(['1', '2']) == [1, 2]
+
+    Number = TypeVar('Number', int, float)
+    assert cast(Number, '3') == 3
+    assert cast(Number, '3.5') == 3.5
+    assert cast(List[Number], ['1', '2.5']) == [1, 2.5]
+
+    with pytest.raises(CastError):
+        cast.cast(int, 'asdf')
+    with pytest.raises(ValueError):
+        cast(int, 'asdf')
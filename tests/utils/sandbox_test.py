@@ -0,0 +1,50 @@
+import asyncio
+import os
+
+import pytest
+
+from yui.utils.sandbox import SandboxPool
+
+
+def work(kind: str, value=None):
+    if kind == 'echo':
+        return os.getpid(), value
+    if kind == 'loop':
+        while True:
+            pass
+    if kind == 'memory':
+        return len(bytearray(value))
+    if kind == 'error':
+        raise ZeroDivisionError('division by zero')
+    if kind == 'unpicklable':
+        return lambda: None
+
+
+@pytest.mark.asyncio
+async def test_sandbox_pool():
+    pool = SandboxPool(work, size=1, timeout=1.0, memory_limit=64 * 1024 ** 2)
+    try:
+        pid, value = await pool.run('echo', 'hello')
+        assert value == 'hello'
+        assert pid != os.getpid()
+        assert (await pool.run('echo'))[0] == pid
+
+        with pytest.raises(ZeroDivisionError):
+            await pool.run('error')
+        assert (await pool.run('echo'))[0] == pid
+
+        with pytest.raises(RuntimeError):
+            await pool.run('unpicklable')
+
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run('loop')
+        assert pool.killed == 1
+        new_pid, _ = await pool.run('echo')
+        assert new_pid != pid
+
+        with pytest.raises(MemoryError):
+            await pool.run('memory', 512 * 1024 ** 2)
+        assert pool.killed == 2
+        assert await pool.run('memory', 1024) == 1024
+    finally:
+        pool.close()
@@ -1,5 +1,6 @@
 from .channels import Channels
 from .chat import Chat
+from .conversations import Conversations
 from .endpoint import Endpoint
 from .groups import Groups
 from .im import Im
@@ -11,6 +12,7 @@ class SlackAPI:
 
     channels: Channels
     chat: Chat
+    conversations: Conversations
     groups: Groups
     im: Im
     users: Users
@@ -20,6 +22,7 @@ class SlackAPI:
 
         self.channels = Channels(bot)
         self.chat = Chat(bot)
+        self.conversations = Conversations(bot)
         self.groups = Groups(bot)
         self.im = Im(bot)
         self.users = Users(bot)
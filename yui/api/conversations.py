@@ -0,0 +1,106 @@
+from typing import List, Optional, Union
+
+from .encoder import bool2str
+from .endpoint import Endpoint
+from ..types.base import ChannelID, Ts
+from ..types.channel import Channel
+from ..types.slack.response import APIResponse
+
+
+def get_channel_id(channel: Union[Channel, ChannelID]) -> ChannelID:
+    if isinstance(channel, Channel):
+        return channel.id
+    return channel
+
+
+class Conversations(Endpoint):
+
+    name = 'conversations'
+
+    async def history(
+        self,
+        channel: Union[Channel, ChannelID],
+        cursor: Optional[str] = None,
+        inclusive: Optional[bool] = None,
+        latest: Optional[Ts] = None,
+        limit: Optional[int] = None,
+        oldest: Optional[Ts] = None,
+    ) -> APIResponse:
+        """https://api.slack.com/methods/conversations.history"""
+
+        params = {
+            'channel': get_channel_id(channel),
+        }
+
+        if cursor:
+            params['cursor'] = cursor
+
+        if inclusive is not None:
+            params['inclusive'] = bool2str(inclusive)
+
+        if latest is not None:
+            params['latest'] = latest
+
+        if limit:
+            params['limit'] = str(limit)
+
+        if oldest is not None:
+            params['oldest'] = oldest
+
+        return await self._call('history', params)
+
+    async def info(
+        self,
+        channel: Union[Channel, ChannelID],
+        include_locale: bool = False,
+    ) -> APIResponse:
+        """https://api.slack.com/methods/conversations.info"""
+
+        return await self._call(
+            'info',
+            {
+                'channel': get_channel_id(channel),
+                'include_locale': bool2str(include_locale),
+            }
+        )
+
+    async def list(
+        self,
+        cursor: Optional[str] = None,
+        exclude_archived: bool = True,
+        limit: int = 0,
+        types: Optional[List[str]] = None,
+    ) -> APIResponse:
+        """https://api.slack.com/methods/conversations.list"""
+
+        params = {
+            'exclude_archived': bool2str(exclude_archived),
+            'limit': str(limit),
+        }
+        if cursor:
+            params['cursor'] = cursor
+
+        if types:
+            params['types'] = ','.join(types)
+
+        return await self._call('list', params)
+
+    async def members(
+        self,
+        channel: Union[Channel, ChannelID],
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> APIResponse:
+        """https://api.slack.com/methods/conversations.members"""
+
+        params = {
+            'channel': get_channel_id(channel),
+        }
+
+        if cursor:
+            params['cursor'] = cursor
+
+        if limit:
+            params['limit'] = str(limit)
+
+        return await self._call('members', params)
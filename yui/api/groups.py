@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Optional, Union
 
 from .encoder import bool2str
 from .endpoint import Endpoint
@@ -33,15 +33,19 @@ class Groups(Endpoint):
 
     async def list(
         self,
+        cursor: Optional[str] = None,
         exclude_archived: bool = True,
         exclude_members: bool = True,
+        limit: int = 0,
     ) -> APIResponse:
         """https://api.slack.com/methods/groups.list"""
 
-        return await self._call(
-            'list',
-            {
-                'exclude_archived': bool2str(exclude_archived),
-                'exclude_members': bool2str(exclude_members),
-            }
-        )
+        params = {
+            'exclude_archived': bool2str(exclude_archived),
+            'exclude_members': bool2str(exclude_members),
+            'limit': str(limit),
+        }
+        if cursor:
+            params['cursor'] = cursor
+
+        return await self._call('list', params)
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from ..types.slack.response import APIResponse
+
+#: Number of objects requested per page of list API.
+PAGE_SIZE = 200
+
+logger = logging.getLogger(__name__)
+
+APICall = Callable[..., Awaitable[APIResponse]]
+
+
+class Hydration:
+    """Fetch every object of Slack workspace with bounded concurrency.
+
+    List APIs are paged to the end, and info calls run concurrently up to
+    given limit. Progress of each kind is logged per page and per
+    :attr:`report_every` info calls.
+
+    """
+
+    report_every: int = 100
+
+    def __init__(self, concurrency: int) -> None:
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.counts: Dict[str, int] = {}
+        self.started_at = asyncio.get_event_loop().time()
+
+    @property
+    def elapsed(self) -> float:
+        return asyncio.get_event_loop().time() - self.started_at
+
+    def progress(self, kind: str, count: int = 1, *, page: bool = False):
+        before = self.counts.get(kind, 0)
+        after = self.counts[kind] = before + count
+        if page or before // self.report_every != after // self.report_every:
+            logger.info(f'hydrating {kind}: {after} ({self.elapsed:.2f}s)')
+
+    async def list(
+        self,
+        kind: str,
+        call: APICall,
+        key: str,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Call list API from first page to last page and join results.
+
+        Given call takes cursor as first positional argument.
+
+        """
+
+        result: List[Dict[str, Any]] = []
+        cursor: Optional[str] = None
+        while True:
+            async with self.semaphore:
+                res = await call(cursor, limit=PAGE_SIZE, **kwargs)
+            body: Dict[str, Any] = res.body  # type: ignore
+            result.extend(body[key])
+            self.progress(f'{kind} list', len(body[key]), page=True)
+            cursor = body.get('response_metadata', {}).get('next_cursor')
+            if not cursor:
+                return result
+
+    async def fetch(
+        self,
+        kind: str,
+        call: APICall,
+        key: str,
+        ids: Iterable[str],
+    ) -> List[Dict[str, Any]]:
+        """Call info API for each given ID concurrently, keeping order.
+
+        Objects which info API fails to find are left out.
+
+        """
+
+        async def fetch_one(id: str) -> Optional[Dict[str, Any]]:
+            async with self.semaphore:
+                res = await call(id)
+            self.progress(kind)
+            if isinstance(res.body, dict) and res.body['ok']:
+                return res.body[key]
+            return None
+
+        results = await asyncio.gather(*map(fetch_one, ids))
+        return [r for r in results if r is not None]
+
+    def report(self) -> str:
+        counts = ', '.join(
+            f'{kind}: {count}' for kind, count in sorted(self.counts.items())
+        )
+        return f'hydrated in {self.elapsed:.2f}s ({counts})'
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import attr
+
+from ..types.slack.response import APIResponse
+
+#: Rate limit tiers of Slack Web API. Values are calls per minute and burst.
+#: See https://api.slack.com/docs/rate-limits
+TIERS: Dict[str, Tuple[float, int]] = {
+    'tier1': (1, 1),
+    'tier2': (20, 5),
+    'tier3': (50, 10),
+    'tier4': (100, 20),
+    'post': (60, 3),
+}
+
+#: Tier of each method. Unknown methods are treated as tier 3.
+METHOD_TIERS: Dict[str, str] = {
+    'channels.history': 'tier3',
+    'channels.info': 'tier3',
+    'channels.list': 'tier2',
+    'chat.delete': 'tier3',
+    'chat.postMessage': 'post',
+    'conversations.history': 'tier3',
+    'conversations.info': 'tier3',
+    'conversations.list': 'tier2',
+    'conversations.members': 'tier4',
+    'groups.info': 'tier3',
+    'groups.list': 'tier2',
+    'im.list': 'tier2',
+    'im.open': 'tier3',
+    'rtm.connect': 'tier1',
+    'rtm.start': 'tier1',
+    'users.info': 'tier4',
+    'users.list': 'tier2',
+}
+
+DEFAULT_TIER = 'tier3'
+
+#: Methods which Slack limits per channel instead of per workspace.
+PER_CHANNEL_METHODS = {'chat.postMessage'}
+
+MAX_RATE_LIMITED_RETRY = 3
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket for one API method."""
+
+    def __init__(self, per_minute: float, burst: int) -> None:
+        self.base_rate = per_minute / 60
+        self.rate = self.base_rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at: Optional[float] = None
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def refill(self, now: float):
+        if self.updated_at is None:
+            self.updated_at = now
+        elif now > self.updated_at:
+            self.tokens = min(
+                self.burst,
+                self.tokens + (now - self.updated_at) * self.rate,
+            )
+            self.updated_at = now
+
+    async def acquire(self):
+        """Wait until bucket has token and take it. Waiters are FIFO."""
+
+        loop = asyncio.get_event_loop()
+        async with self.lock:
+            while True:
+                now = loop.time()
+                self.refill(now)
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def rate_limited(self, retry_after: float):
+        """Stop using bucket for given seconds and slow down its rate."""
+
+        now = asyncio.get_event_loop().time()
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        # allow only one call right after blocking, then refill slowly
+        self.tokens = 1
+        self.updated_at = self.blocked_until
+        self.rate = max(self.base_rate / 8, self.rate / 2)
+
+    def succeeded(self):
+        """Recover rate slowly after successful call."""
+
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate / 10)
+
+
+@attr.dataclass(slots=True)
+class WaitStat:
+    """Queue wait time statistics of one API method."""
+
+    calls: int = 0
+    rate_limited: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        if self.calls:
+            return self.total_wait / self.calls
+        return 0.0
+
+
+class RateLimitScheduler:
+    """Schedule API calls under rate limit of Slack Web API."""
+
+    def __init__(self) -> None:
+        self.buckets: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+        self.stats: Dict[str, WaitStat] = {}
+
+    def get_bucket(
+        self,
+        method: str,
+        data: Optional[Dict[str, str]] = None,
+    ) -> TokenBucket:
+        channel = None
+        if method in PER_CHANNEL_METHODS and data:
+            channel = data.get('channel')
+        key = method, channel
+        try:
+            return self.buckets[key]
+        except KeyError:
+            tier = METHOD_TIERS.get(method, DEFAULT_TIER)
+            bucket = self.buckets[key] = TokenBucket(*TIERS[tier])
+            return bucket
+
+    async def run(
+        self,
+        method: str,
+        data: Optional[Dict[str, str]],
+        call: Callable[[], Awaitable[APIResponse]],
+    ) -> APIResponse:
+        """Run given call when bucket of method allows it.
+
+        If Slack still responds with HTTP 429, wait as ``Retry-After`` header
+        says and try again.
+
+        """
+
+        loop = asyncio.get_event_loop()
+        bucket = self.get_bucket(method, data)
+        try:
+            stat = self.stats[method]
+        except KeyError:
+            stat = self.stats[method] = WaitStat()
+
+        for _ in range(MAX_RATE_LIMITED_RETRY):
+            start = loop.time()
+            await bucket.acquire()
+            wait = loop.time() - start
+            stat.calls += 1
+            stat.total_wait += wait
+            stat.max_wait = max(stat.max_wait, wait)
+            if wait >= 1:
+                logger.info(f'{method} waited {wait:.2f}s in queue')
+
+            resp = await call()
+            if resp.status != 429:
+                bucket.succeeded()
+                return resp
+
+            stat.rate_limited += 1
+            try:
+                retry_after = float(resp.headers['Retry-After'])
+            except (KeyError, TypeError, ValueError):
+                retry_after = 1.0
+            logger.warning(f'{method} was rate limited ({retry_after}s)')
+            bucket.rate_limited(retry_after)
+        return resp
+
+    def report(self) -> str:
+        """Make report of queue wait time per method, longest first."""
+
+        return '\n'.join(
+            f'{method}: {stat.calls} calls, '
+            f'total {stat.total_wait:.2f}s, '
+            f'avg {stat.average_wait:.2f}s, '
+            f'max {stat.max_wait:.2f}s, '
+            f'{stat.rate_limited} rate limited'
+            for method, stat in sorted(
+                self.stats.items(),
+                key=lambda x: x[1].total_wait,
+                reverse=True,
+            )
+        )
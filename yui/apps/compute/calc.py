@@ -4,24 +4,117 @@ import datetime
 import decimal
 import functools
 import html
+import io
 import itertools
 import math
 import operator
 import random
 import statistics
-from typing import Any, Callable, Dict, List, Optional, Set, Union
+import tokenize
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import _ast
 
-from async_timeout import timeout
+import attr
 
 import ujson
 
 from ...bot import Bot
 from ...box import box
 from ...event import Message
+from ...utils.sandbox import SandboxPool
 
 TIMEOUT = 1
+SANDBOX_SIZE = 2
+MEMORY_LIMIT = 256 * 1024 * 1024
+CACHE_SIZE = 256
+#: Results whose text is longer than this are not cached.
+CACHE_MAX_LENGTH = 4096
+
+#: Results of expressions which use these names differ on each run.
+IMPURE_NAMES = frozenset({'datetime', 'random'})
+#: Tokens which do not change meaning of expression.
+IGNORED_TOKENS = frozenset({
+    tokenize.COMMENT,
+    tokenize.ENCODING,
+    tokenize.ENDMARKER,
+    tokenize.NL,
+})
+
+
+def make_cache_key(expr: str, decimal_mode: bool) -> Optional[Hashable]:
+    """Make key of result cache from tokens of expression.
+
+    Whitespace and comments do not change key. It returns :const:`None`
+    if expression can not be tokenized or its result can differ on each
+    run, so result should not be cached.
+
+    """
+
+    tokens: List[Tuple[int, str]] = []
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(expr).readline):
+            if token.type in IGNORED_TOKENS:
+                continue
+            if token.type == tokenize.NAME and token.string in IMPURE_NAMES:
+                return None
+            if token.type in (tokenize.NEWLINE, tokenize.INDENT):
+                tokens.append((token.type, ''))
+            else:
+                tokens.append((token.type, token.string))
+    except (tokenize.TokenError, SyntaxError):
+        return None
+    return decimal_mode, tuple(tokens)
+
+
+class ResultCache:
+    """LRU cache of texts of result and local state.
+
+    Result longer than ``max_length`` is not kept, so cache can not hold
+    more than ``size * max_length`` characters.
+
+    """
+
+    def __init__(self, size: int, max_length: int) -> None:
+        self.size = size
+        self.max_length = max_length
+        self.results: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Tuple[Optional[str], Dict]]:
+        try:
+            self.results.move_to_end(key)
+        except KeyError:
+            return None
+        return self.results[key]
+
+    def put(self, key: Hashable, value: Tuple[Optional[str], Dict]):
+        result, local = value
+        length = len(result or '') + sum(
+            len(name) + len(text) for name, text in local.items()
+        )
+        if length > self.max_length:
+            return
+        self.results[key] = value
+        self.results.move_to_end(key)
+        while len(self.results) > self.size:
+            self.results.popitem(last=False)
+
+    def clear(self):
+        self.results.clear()
 
 
 async def body(
@@ -38,45 +131,55 @@ async def body(
         await bot.say(event.channel, help)
         return
 
-    try:
-        async with timeout(TIMEOUT):
-            result, local = await bot.run_in_other_thread(
-                calculate,
+    cache_key = make_cache_key(expr, decimal_mode)
+    cached = None if cache_key is None else result_cache.get(cache_key)
+    if cached is not None:
+        result_string, local = cached
+    else:
+        try:
+            result_string, local = await sandbox.run(
                 expr,
                 decimal_mode=decimal_mode,
             )
-    except (SyntaxError, BadSyntax) as e:
-        await bot.say(
-            event.channel,
-            '입력해주신 수식에 문법 오류가 있어요! {}'.format(e),
-            thread_ts=ts,
-        )
-        return
-    except ZeroDivisionError:
-        await bot.say(
-            event.channel,
-            '입력해주신 수식은 계산하다보면 0으로 나누기가 발생해서 계산할 수 없어요!',
-            thread_ts=ts,
-        )
-        return
-    except asyncio.TimeoutError:
-        await bot.say(
-            event.channel,
-            '입력해주신 수식을 계산하려고 했지만 연산 시간이 너무 길어서 중단했어요!',
-            thread_ts=ts,
-        )
-        return
-    except Exception as e:
-        await bot.say(
-            event.channel,
-            '예기치 않은 에러가 발생했어요! {}: {}'.format(e.__class__.__name__, e),
-            thread_ts=ts,
-        )
-        return
-
-    if result is not None:
-        result_string = str(result)
+        except (SyntaxError, BadSyntax) as e:
+            await bot.say(
+                event.channel,
+                '입력해주신 수식에 문법 오류가 있어요! {}'.format(e),
+                thread_ts=ts,
+            )
+            return
+        except LimitExceeded as e:
+            await bot.say(
+                event.channel,
+                '입력해주신 수식은 계산량이 너무 많아서 중단했어요! {}'.format(e),
+                thread_ts=ts,
+            )
+            return
+        except ZeroDivisionError:
+            await bot.say(
+                event.channel,
+                '입력해주신 수식은 계산하다보면 0으로 나누기가 발생해서 계산할 수 없어요!',
+                thread_ts=ts,
+            )
+            return
+        except asyncio.TimeoutError:
+            await bot.say(
+                event.channel,
+                '입력해주신 수식을 계산하려고 했지만 연산 시간이 너무 길어서 중단했어요!',
+                thread_ts=ts,
+            )
+            return
+        except Exception as e:
+            await bot.say(
+                event.channel,
+                '예기치 않은 에러가 발생했어요! {}: {}'.format(e.__class__.__name__, e),
+                thread_ts=ts,
+            )
+            return
+        if cache_key is not None:
+            result_cache.put(cache_key, (result_string, local))
 
+    if result_string is not None:
         if expr_is_multiline or '\n' in result_string:
             r = (
                 f'```\n{result_string}\n```'
@@ -101,7 +204,7 @@ async def body(
         )
     elif local:
         r = '\n'.join(
-            '{} = {}'.format(key, repr(value))
+            '{} = {}'.format(key, value)
             for key, value in local.items()
         )
         if ts is None:
@@ -287,6 +390,28 @@ class BadSyntax(Exception):
     pass
 
 
+class LimitExceeded(Exception):
+    pass
+
+
+@attr.dataclass(slots=True, frozen=True)
+class Budget:
+    """Limits of work which one expression can do."""
+
+    #: max count of loop iterations, comprehension iterations and calls
+    ops: int
+    #: max bit length of int which operator makes
+    bits: int
+    #: max length of sequence which repeating makes
+    length: int
+
+
+#: Budget of ``calc_decimal``. Decimal operations are slower.
+DECIMAL_BUDGET = Budget(ops=200_000, bits=100_000, length=1_000_000)
+#: Budget of ``calc_num``.
+NUM_BUDGET = Budget(ops=500_000, bits=100_000, length=1_000_000)
+
+
 BINOP_TABLE: Dict[Any, Callable[[Any, Any], Any]] = {
     _ast.Add: lambda a, b: a + b,
     _ast.BitAnd: lambda a, b: a & b,
@@ -326,564 +451,648 @@ UNARYOP_TABLE: Dict[Any, Callable[[Any], Any]] = {
 }
 
 
-class Evaluator:
+def check_pow(budget: Budget, a, b):
+    if isinstance(a, int) and isinstance(b, int) and b > 0 and abs(a) > 1:
+        if b > budget.bits or b * math.log2(abs(a)) >= budget.bits:
+            raise LimitExceeded('Result of power is too big')
+
+
+def check_mul(budget: Budget, a, b):
+    if isinstance(a, int):
+        a, b = b, a
+    if not isinstance(b, int):
+        return
+    if isinstance(a, (str, bytes, list, tuple)):
+        if len(a) * b > budget.length:
+            raise LimitExceeded('Result of repeat is too long')
+    elif isinstance(a, int):
+        if a.bit_length() + b.bit_length() > budget.bits:
+            raise LimitExceeded('Result of multiplication is too big')
 
-    last_dump: str
 
-    def __init__(self, decimal_mode: bool = False) -> None:
+def check_lshift(budget: Budget, a, b):
+    if isinstance(a, int) and isinstance(b, int) and a and b > 0:
+        if a.bit_length() + b > budget.bits:
+            raise LimitExceeded('Result of shift is too big')
+
+
+#: Checks which reject operands before operator allocates huge result.
+BINOP_GUARDS: Dict[Any, Callable[[Budget, Any, Any], None]] = {
+    _ast.LShift: check_lshift,
+    _ast.Mult: check_mul,
+    _ast.Pow: check_pow,
+}
+#: Checks of functions which do same as guarded operators.
+CALL_GUARDS: Dict[Any, Callable[[Budget, Any, Any], None]] = {
+    pow: check_pow,
+    operator.lshift: check_lshift,
+    operator.mul: check_mul,
+    operator.pow: check_pow,
+}
+
+
+def none() -> None:
+    return None
+
+
+def freeze(table: Dict[Any, Set[str]]) -> Mapping[Any, FrozenSet[str]]:
+    return MappingProxyType({
+        key: frozenset(names) for key, names in table.items()
+    })
+
+
+#: Modules and names of attributes which expression can access.
+ALLOWED_MODULES = freeze({
+    datetime: {
+        'date',
+        'datetime',
+        'time',
+        'timedelta',
+        'tzinfo',
+    },
+    functools: {
+        'reduce',
+    },
+    html: {
+        'escape',
+        'unescape',
+    },
+    itertools: {
+        'accumulate',
+        'chain',
+        'chain.from_iterable',
+        'compress',
+        'dropwhile',
+        'filterfalse',
+        'groupby',
+        'starmap',
+        'takewhile',
+        'tee',
+        'zip_longest',
+        'product',
+        'permutations',
+        'combinations',
+        'combinations_with_replacement',
+    },
+    math: {
+        'acos',
+        'acosh',
+        'asin',
+        'asinh',
+        'atan',
+        'atan2',
+        'atanh',
+        'ceil',
+        'copysign',
+        'cos',
+        'cosh',
+        'degrees',
+        'erf',
+        'erfc',
+        'exp',
+        'expm1',
+        'fabs',
+        'factorial',
+        'floor',
+        'fmod',
+        'frexp',
+        'fsum',
+        'gamma',
+        'gcd',
+        'hypot',
+        'isclose',
+        'isfinite',
+        'isinf',
+        'isnan',
+        'ldexp',
+        'lgamma',
+        'log',
+        'log1p',
+        'log10',
+        'log2',
+        'modf',
+        'pow',
+        'radians',
+        'sin',
+        'sinh',
+        'sqrt',
+        'tan',
+        'tanh',
+        'trunc',
+        'pi',
+        'e',
+        'tau',
+        'inf',
+        'nan',
+    },
+    operator: {
+        'lt',
+        'le',
+        'eq',
+        'ne',
+        'ge',
+        'gt',
+        'not_',
+        'truth',
+        'is_',
+        'is_not',
+        'add',
+        'and_',
+        'floordiv',
+        'index',
+        'inv',
+        'invert',
+        'lshift',
+        'mod',
+        'mul',
+        'matmul',
+        'neg',
+        'or_',
+        'pos',
+        'pow',
+        'rshift',
+        'sub',
+        'truediv',
+        'xor',
+        'concat',
+        'contains',
+        'countOf',
+        'delitem',
+        'getitem',
+        'indexOf',
+        'setitem',
+        'length_hint',
+        'itemgetter',
+    },
+    random: {
+        'randrange',
+        'randint',
+        'choice',
+        'choices',
+        'shuffle',
+        'sample',
+        'random',
+        'uniform',
+        'triangular',
+        'betavariate',
+        'expovariate',
+        'gammavariate',
+        'gauss',
+        'lognormvariate',
+        'normalvariate',
+        'vonmisesvariate',
+        'paretovariate',
+        'weibullvariate',
+    },
+    statistics: {
+        'mean',
+        'harmonic_mean',
+        'median',
+        'median_low',
+        'median_high',
+        'median_grouped',
+        'mode',
+        'pstdev',
+        'pvariance',
+        'stdev',
+        'variance',
+    },
+    ujson: {
+        'dumps',
+        'loads',
+    },
+})
+#: Classes and names of their attributes which expression can access.
+ALLOWED_CLASS_PROPERTIES = freeze({
+    bytes: {
+        'fromhex',
+        'maketrans',
+    },
+    datetime.date: {
+        'today',
+        'fromtimestamp',
+        'fromordinal',
+        'fromisoformat',
+        'min',
+        'max',
+        'resolution',
+    },
+    datetime.datetime: {
+        'today',
+        'now',
+        'utcnow'
+        'fromtimestamp',
+        'utcfromtimestamp',
+        'fromordinal',
+        'combine',
+        'fromisoformat',
+        'strptime',
+        'min',
+        'max',
+        'resolution',
+    },
+    datetime.time: {
+        'min',
+        'max',
+        'resolution',
+        'fromisoformat',
+    },
+    datetime.timedelta: {
+        'min',
+        'max',
+        'resolution',
+    },
+    datetime.timezone: {
+        'utc',
+    },
+    dict: {
+        'fromkeys',
+    },
+    float: {
+        'fromhex',
+    },
+    int: {
+        'from_bytes',
+    },
+    str: {
+        'maketrans',
+    },
+})
+#: Types and names of attributes of their instances.
+ALLOWED_INSTANCE_PROPERTIES = freeze({
+    bytes: {
+        'hex',
+        'count',
+        'decode',
+        'endswith',
+        'find',
+        'index',
+        'join',
+        'partition',
+        'replace',
+        'rfind',
+        'rindex',
+        'rpartition',
+        'startswith',
+        'translate',
+        'center',
+        'ljust',
+        'lstrip',
+        'rjust',
+        'rsplit',
+        'rstrip',
+        'split',
+        'strip',
+        'capitalize',
+        'expandtabs',
+        'isalnum',
+        'isalpha',
+        'isdigit',
+        'islower',
+        'isspace',
+        'istitle',
+        'isupper',
+        'lower',
+        'splitlines',
+        'swapcase',
+        'title',
+        'upper',
+        'zfill',
+    },
+    datetime.date: {
+        'year',
+        'month',
+        'day',
+        'replace',
+        'timetuple',
+        'toordinal',
+        'weekday',
+        'isoweekday',
+        'isocalendar',
+        'isoformat',
+        'ctime',
+        'strftime',
+    },
+    datetime.datetime: {
+        'year',
+        'month',
+        'day'
+        'hour',
+        'minute',
+        'second',
+        'microsecond',
+        'tzinfo',
+        'fold',
+        'date',
+        'time',
+        'timetz',
+        'replace',
+        'astimezone',
+        'dst',
+        'tzname',
+        'timetuple',
+        'utctimetuple',
+        'toordinal',
+        'timestamp',
+        'weekday',
+        'isoweekday',
+        'isocalendar',
+        'isoformat',
+        'ctime',
+        'strftime',
+    },
+    datetime.time: {
+        'hour',
+        'minute',
+        'second',
+        'microsecond',
+        'tzinfo',
+        'fold',
+        'replace',
+        'isoformat',
+        'strftime',
+        'utcoffset',
+        'dst',
+        'tzname',
+    },
+    datetime.timedelta: {
+        'total_seconds',
+    },
+    datetime.timezone: {
+        'utcoffset',
+        'tzname',
+        'dst',
+        'fromutc',
+    },
+    datetime.tzinfo: {
+        'utcoffset',
+        'dst',
+        'tzname',
+        'fromutc',
+    },
+    dict: {
+        'copy',
+        'get',
+        'items',
+        'keys',
+        'pop',
+        'popitem',
+        'setdefault',
+        'update',
+        'values',
+    },
+    float: {
+        'as_integer_ratio',
+        'is_integer',
+        'hex',
+    },
+    int: {
+        'bit_length',
+        'to_bytes',
+    },
+    list: {
+        'index',
+        'count',
+        'append',
+        'clear',
+        'copy',
+        'extend',
+        'insert',
+        'pop',
+        'remove',
+        'reverse',
+        'sort',
+    },
+    range: {
+        'start',
+        'stop',
+        'step',
+    },
+    str: {
+        'capitalize',
+        'casefold',
+        'center',
+        'count',
+        'encode',
+        'endswith',
+        'expandtabs',
+        'find',
+        'format',
+        'format_map',
+        'index',
+        'isalnum',
+        'isalpha',
+        'isdecimal',
+        'isdigit',
+        'isidentifier',
+        'islower',
+        'isnumeric',
+        'isprintable',
+        'isspace',
+        'istitle',
+        'isupper',
+        'join',
+        'ljust',
+        'lower',
+        'lstrip',
+        'partition',
+        'replace',
+        'rfind',
+        'rindex',
+        'rjust',
+        'rpartition',
+        'rsplit',
+        'rstrip',
+        'split',
+        'splitlines',
+        'swapcase',
+        'startswith',
+        'strip',
+        'title',
+        'translate',
+        'upper',
+        'zfill',
+    },
+    set: {
+        'isdisjoint',
+        'issubset',
+        'issuperset',
+        'union',
+        'intersection',
+        'difference',
+        'symmetric_difference',
+        'copy',
+        'update',
+        'intersection_update',
+        'difference_update',
+        'symmetric_difference_update',
+        'add',
+        'remove',
+        'discard',
+        'pop',
+        'clear',
+    },
+    tuple: {
+        'index',
+        'count',
+        'append',
+        'clear',
+        'copy',
+        'extend',
+        'insert',
+        'pop',
+        'remove',
+        'reverse',
+    },
+})
+#: Names which every expression can use. Evaluator keeps names assigned by
+#: expression in its own symbol table over this.
+GLOBAL_SYMBOL_TABLE: Mapping[str, Any] = MappingProxyType({
+    # builtin func
+    'abs': abs,
+    'all': all,
+    'any': any,
+    'ascii': ascii,
+    'bin': bin,
+    'bool': bool,
+    'bytes': bytes,
+    'chr': chr,
+    'complex': complex,
+    'dict': dict,
+    'divmod': divmod,
+    'enumerate': enumerate,
+    'filter': filter,
+    'float': float,
+    'format': format,
+    'frozenset': frozenset,
+    'hex': hex,
+    'int': int,
+    'isinstance': isinstance,
+    'issubclass': issubclass,
+    'len': len,
+    'list': list,
+    'map': map,
+    'max': max,
+    'min': min,
+    'oct': oct,
+    'ord': ord,
+    'pow': pow,
+    'range': range,
+    'repr': repr,
+    'reversed': reversed,
+    'round': round,
+    'set': set,
+    'slice': slice,
+    'sorted': sorted,
+    'str': str,
+    'sum': sum,
+    'tuple': tuple,
+    'zip': zip,
+    # additional type
+    'Decimal': Decimal,
+    # math shortcut
+    'acos': math.acos,
+    'acosh': math.acosh,
+    'asin': math.asin,
+    'asinh': math.asinh,
+    'atan': math.atan,
+    'atan2': math.atan2,
+    'atanh': math.atanh,
+    'ceil': math.ceil,
+    'copysign': math.copysign,
+    'cos': math.cos,
+    'cosh': math.cosh,
+    'degrees': math.degrees,
+    'erf': math.erf,
+    'erfc': math.erfc,
+    'exp': math.exp,
+    'expm1': math.expm1,
+    'fabs': math.fabs,
+    'factorial': math.factorial,
+    'floor': math.floor,
+    'fmod': math.fmod,
+    'frexp': math.frexp,
+    'fsum': math.fsum,
+    'gamma': math.gamma,
+    'gcd': math.gcd,
+    'hypot': math.hypot,
+    'isclose': math.isclose,
+    'isfinite': math.isfinite,
+    'isinf': math.isinf,
+    'isnan': math.isnan,
+    'ldexp': math.ldexp,
+    'lgamma': math.lgamma,
+    'log': math.log,
+    'log1p': math.log1p,
+    'log10': math.log10,
+    'log2': math.log2,
+    'modf': math.modf,
+    'radians': math.radians,
+    'sin': math.sin,
+    'sinh': math.sinh,
+    'sqrt': math.sqrt,
+    'tan': math.tan,
+    'tanh': math.tanh,
+    'trunc': math.trunc,
+    'pi': math.pi,
+    'e': math.e,
+    'tau': math.tau,
+    'inf': math.inf,
+    'nan': math.nan,
+    # module level injection
+    'datetime': datetime,
+    'functools': functools,
+    'html': html,
+    'itertools': itertools,
+    'json': ujson,
+    'math': math,
+    'operator': operator,
+    'random': random,
+    'statistics': statistics,
+})
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def parse(expr: str) -> ast.AST:
+    """Parse expression into AST.
+
+    :class:`Evaluator` does not change AST, so it is shared between runs of
+    same expression.
+
+    """
+
+    return ast.parse(expr, mode='exec')
+
+
+class Evaluator:
+
+    def __init__(
+        self,
+        decimal_mode: bool = False,
+        compiled: bool = True,
+        budget: Optional[Budget] = None,
+    ) -> None:
         self.decimal_mode = decimal_mode
-        self.allowed_modules = {
-            datetime: {
-                'date',
-                'datetime',
-                'time',
-                'timedelta',
-                'tzinfo',
-            },
-            functools: {
-                'reduce',
-            },
-            html: {
-                'escape',
-                'unescape',
-            },
-            itertools: {
-                'accumulate',
-                'chain',
-                'chain.from_iterable',
-                'compress',
-                'dropwhile',
-                'filterfalse',
-                'groupby',
-                'starmap',
-                'takewhile',
-                'tee',
-                'zip_longest',
-                'product',
-                'permutations',
-                'combinations',
-                'combinations_with_replacement',
-            },
-            math: {
-                'acos',
-                'acosh',
-                'asin',
-                'asinh',
-                'atan',
-                'atan2',
-                'atanh',
-                'ceil',
-                'copysign',
-                'cos',
-                'cosh',
-                'degrees',
-                'erf',
-                'erfc',
-                'exp',
-                'expm1',
-                'fabs',
-                'factorial',
-                'floor',
-                'fmod',
-                'frexp',
-                'fsum',
-                'gamma',
-                'gcd',
-                'hypot',
-                'isclose',
-                'isfinite',
-                'isinf',
-                'isnan',
-                'ldexp',
-                'lgamma',
-                'log',
-                'log1p',
-                'log10',
-                'log2',
-                'modf',
-                'pow',
-                'radians',
-                'sin',
-                'sinh',
-                'sqrt',
-                'tan',
-                'tanh',
-                'trunc',
-                'pi',
-                'e',
-                'tau',
-                'inf',
-                'nan',
-            },
-            operator: {
-                'lt',
-                'le',
-                'eq',
-                'ne',
-                'ge',
-                'gt',
-                'not_',
-                'truth',
-                'is_',
-                'is_not',
-                'add',
-                'and_',
-                'floordiv',
-                'index',
-                'inv',
-                'invert',
-                'lshift',
-                'mod',
-                'mul',
-                'matmul',
-                'neg',
-                'or_',
-                'pos',
-                'pow',
-                'rshift',
-                'sub',
-                'truediv',
-                'xor',
-                'concat',
-                'contains',
-                'countOf',
-                'delitem',
-                'getitem',
-                'indexOf',
-                'setitem',
-                'length_hint',
-                'itemgetter',
-            },
-            random: {
-                'randrange',
-                'randint',
-                'choice',
-                'choices',
-                'shuffle',
-                'sample',
-                'random',
-                'uniform',
-                'triangular',
-                'betavariate',
-                'expovariate',
-                'gammavariate',
-                'gauss',
-                'lognormvariate',
-                'normalvariate',
-                'vonmisesvariate',
-                'paretovariate',
-                'weibullvariate',
-            },
-            statistics: {
-                'mean',
-                'harmonic_mean',
-                'median',
-                'median_low',
-                'median_high',
-                'median_grouped',
-                'mode',
-                'pstdev',
-                'pvariance',
-                'stdev',
-                'variance',
-            },
-            ujson: {
-                'dumps',
-                'loads',
-            },
-        }
-        self.allowed_class_properties = {
-            bytes: {
-                'fromhex',
-                'maketrans',
-            },
-            datetime.date: {
-                'today',
-                'fromtimestamp',
-                'fromordinal',
-                'fromisoformat',
-                'min',
-                'max',
-                'resolution',
-            },
-            datetime.datetime: {
-                'today',
-                'now',
-                'utcnow'
-                'fromtimestamp',
-                'utcfromtimestamp',
-                'fromordinal',
-                'combine',
-                'fromisoformat',
-                'strptime',
-                'min',
-                'max',
-                'resolution',
-            },
-            datetime.time: {
-                'min',
-                'max',
-                'resolution',
-                'fromisoformat',
-            },
-            datetime.timedelta: {
-                'min',
-                'max',
-                'resolution',
-            },
-            datetime.timezone: {
-                'utc',
-            },
-            dict: {
-                'fromkeys',
-            },
-            float: {
-                'fromhex',
-            },
-            int: {
-                'from_bytes',
-            },
-            str: {
-                'maketrans',
-            },
-        }
-        self.allowed_instance_properties = {
-            bytes: {
-                'hex',
-                'count',
-                'decode',
-                'endswith',
-                'find',
-                'index',
-                'join',
-                'partition',
-                'replace',
-                'rfind',
-                'rindex',
-                'rpartition',
-                'startswith',
-                'translate',
-                'center',
-                'ljust',
-                'lstrip',
-                'rjust',
-                'rsplit',
-                'rstrip',
-                'split',
-                'strip',
-                'capitalize',
-                'expandtabs',
-                'isalnum',
-                'isalpha',
-                'isdigit',
-                'islower',
-                'isspace',
-                'istitle',
-                'isupper',
-                'lower',
-                'splitlines',
-                'swapcase',
-                'title',
-                'upper',
-                'zfill',
-            },
-            datetime.date: {
-                'year',
-                'month',
-                'day',
-                'replace',
-                'timetuple',
-                'toordinal',
-                'weekday',
-                'isoweekday',
-                'isocalendar',
-                'isoformat',
-                'ctime',
-                'strftime',
-            },
-            datetime.datetime: {
-                'year',
-                'month',
-                'day'
-                'hour',
-                'minute',
-                'second',
-                'microsecond',
-                'tzinfo',
-                'fold',
-                'date',
-                'time',
-                'timetz',
-                'replace',
-                'astimezone',
-                'dst',
-                'tzname',
-                'timetuple',
-                'utctimetuple',
-                'toordinal',
-                'timestamp',
-                'weekday',
-                'isoweekday',
-                'isocalendar',
-                'isoformat',
-                'ctime',
-                'strftime',
-            },
-            datetime.time: {
-                'hour',
-                'minute',
-                'second',
-                'microsecond',
-                'tzinfo',
-                'fold',
-                'replace',
-                'isoformat',
-                'strftime',
-                'utcoffset',
-                'dst',
-                'tzname',
-            },
-            datetime.timedelta: {
-                'total_seconds',
-            },
-            datetime.timezone: {
-                'utcoffset',
-                'tzname',
-                'dst',
-                'fromutc',
-            },
-            datetime.tzinfo: {
-                'utcoffset',
-                'dst',
-                'tzname',
-                'fromutc',
-            },
-            dict: {
-                'copy',
-                'get',
-                'items',
-                'keys',
-                'pop',
-                'popitem',
-                'setdefault',
-                'update',
-                'values',
-            },
-            float: {
-                'as_integer_ratio',
-                'is_integer',
-                'hex',
-            },
-            int: {
-                'bit_length',
-                'to_bytes',
-            },
-            list: {
-                'index',
-                'count',
-                'append',
-                'clear',
-                'copy',
-                'extend',
-                'insert',
-                'pop',
-                'remove',
-                'reverse',
-                'sort',
-            },
-            range: {
-                'start',
-                'stop',
-                'step',
-            },
-            str: {
-                'capitalize',
-                'casefold',
-                'center',
-                'count',
-                'encode',
-                'endswith',
-                'expandtabs',
-                'find',
-                'format',
-                'format_map',
-                'index',
-                'isalnum',
-                'isalpha',
-                'isdecimal',
-                'isdigit',
-                'isidentifier',
-                'islower',
-                'isnumeric',
-                'isprintable',
-                'isspace',
-                'istitle',
-                'isupper',
-                'join',
-                'ljust',
-                'lower',
-                'lstrip',
-                'partition',
-                'replace',
-                'rfind',
-                'rindex',
-                'rjust',
-                'rpartition',
-                'rsplit',
-                'rstrip',
-                'split',
-                'splitlines',
-                'swapcase',
-                'startswith',
-                'strip',
-                'title',
-                'translate',
-                'upper',
-                'zfill',
-            },
-            set: {
-                'isdisjoint',
-                'issubset',
-                'issuperset',
-                'union',
-                'intersection',
-                'difference',
-                'symmetric_difference',
-                'copy',
-                'update',
-                'intersection_update',
-                'difference_update',
-                'symmetric_difference_update',
-                'add',
-                'remove',
-                'discard',
-                'pop',
-                'clear',
-            },
-            tuple: {
-                'index',
-                'count',
-                'append',
-                'clear',
-                'copy',
-                'extend',
-                'insert',
-                'pop',
-                'remove',
-                'reverse',
-            },
-        }
-        self.global_symbol_table: Dict[str, Any] = {
-            # builtin func
-            'abs': abs,
-            'all': all,
-            'any': any,
-            'ascii': ascii,
-            'bin': bin,
-            'bool': bool,
-            'bytes': bytes,
-            'chr': chr,
-            'complex': complex,
-            'dict': dict,
-            'divmod': divmod,
-            'enumerate': enumerate,
-            'filter': filter,
-            'float': float,
-            'format': format,
-            'frozenset': frozenset,
-            'hex': hex,
-            'int': int,
-            'isinstance': isinstance,
-            'issubclass': issubclass,
-            'len': len,
-            'list': list,
-            'map': map,
-            'max': max,
-            'min': min,
-            'oct': oct,
-            'ord': ord,
-            'pow': pow,
-            'range': range,
-            'repr': repr,
-            'reversed': reversed,
-            'round': round,
-            'set': set,
-            'slice': slice,
-            'sorted': sorted,
-            'str': str,
-            'sum': sum,
-            'tuple': tuple,
-            'zip': zip,
-            # additional type
-            'Decimal': Decimal,
-            # math shortcut
-            'acos': math.acos,
-            'acosh': math.acosh,
-            'asin': math.asin,
-            'asinh': math.asinh,
-            'atan': math.atan,
-            'atan2': math.atan2,
-            'atanh': math.atanh,
-            'ceil': math.ceil,
-            'copysign': math.copysign,
-            'cos': math.cos,
-            'cosh': math.cosh,
-            'degrees': math.degrees,
-            'erf': math.erf,
-            'erfc': math.erfc,
-            'exp': math.exp,
-            'expm1': math.expm1,
-            'fabs': math.fabs,
-            'factorial': math.factorial,
-            'floor': math.floor,
-            'fmod': math.fmod,
-            'frexp': math.frexp,
-            'fsum': math.fsum,
-            'gamma': math.gamma,
-            'gcd': math.gcd,
-            'hypot': math.hypot,
-            'isclose': math.isclose,
-            'isfinite': math.isfinite,
-            'isinf': math.isinf,
-            'isnan': math.isnan,
-            'ldexp': math.ldexp,
-            'lgamma': math.lgamma,
-            'log': math.log,
-            'log1p': math.log1p,
-            'log10': math.log10,
-            'log2': math.log2,
-            'modf': math.modf,
-            'radians': math.radians,
-            'sin': math.sin,
-            'sinh': math.sinh,
-            'sqrt': math.sqrt,
-            'tan': math.tan,
-            'tanh': math.tanh,
-            'trunc': math.trunc,
-            'pi': math.pi,
-            'e': math.e,
-            'tau': math.tau,
-            'inf': math.inf,
-            'nan': math.nan,
-            # module level injection
-            'datetime': datetime,
-            'functools': functools,
-            'html': html,
-            'itertools': itertools,
-            'json': ujson,
-            'math': math,
-            'operator': operator,
-            'random': random,
-            'statistics': statistics,
-        }
+        #: run closures compiled from AST instead of visiting AST nodes
+        self.compiled = compiled
+        if budget is None:
+            budget = DECIMAL_BUDGET if decimal_mode else NUM_BUDGET
+        self.budget = budget
+        self.ops = 0
+        self.allowed_modules = ALLOWED_MODULES
+        self.allowed_class_properties = ALLOWED_CLASS_PROPERTIES
+        self.allowed_instance_properties = ALLOWED_INSTANCE_PROPERTIES
+        self.global_symbol_table = GLOBAL_SYMBOL_TABLE
         self.symbol_table: Dict[str, Any] = {}
         self.current_interrupt: Optional[
             Union[_ast.Break, _ast.Continue]
         ] = None
 
     def run(self, expr: str):
-        h = ast.parse(expr, mode='exec')
-        self.last_dump = ast.dump(h)
+        h = parse(expr)
+        self.ops = 0
+        if self.compiled:
+            return self.compile(h)()
         return self._run(h)
 
     def _run(self, node):
@@ -928,6 +1137,57 @@ class Evaluator:
             for elt in node.elts:
                 self.delete(elt)
 
+    def spend(self):
+        """Count one operation and stop when budget runs out."""
+
+        self.ops += 1
+        if self.ops > self.budget.ops:
+            raise LimitExceeded('Too many operations')
+
+    def get_binop(self, op_cls) -> Optional[Callable[[Any, Any], Any]]:
+        op = BINOP_TABLE.get(op_cls)
+        guard = BINOP_GUARDS.get(op_cls)
+        if op is None or guard is None:
+            return op
+
+        budget = self.budget
+
+        def guarded(a, b):
+            guard(budget, a, b)  # type: ignore
+            return op(a, b)  # type: ignore
+
+        return guarded
+
+    def call(self, func, args: List[Any], keywords: Dict[Any, Any]):
+        self.spend()
+        if len(args) == 2 and not keywords:
+            try:
+                guard = CALL_GUARDS.get(func)
+            except TypeError:
+                guard = None
+            if guard is not None:
+                guard(self.budget, *args)
+        return func(*args, **keywords)
+
+    def get_attribute(self, value, attr: str):
+        t = type(value)
+        try:
+            if value in self.allowed_modules:
+                if attr in self.allowed_modules[value]:
+                    return getattr(value, attr)
+                raise BadSyntax(f'You can not access `{attr}` attribute')
+            if value in self.allowed_class_properties:
+                if attr in self.allowed_class_properties[value]:
+                    return getattr(value, attr)
+                raise BadSyntax(f'You can not access `{attr}` attribute')
+        except TypeError:
+            pass
+        if t in self.allowed_instance_properties:
+            if attr in self.allowed_instance_properties[t]:
+                return getattr(value, attr)
+            raise BadSyntax(f'You can not access `{attr}` attribute')
+        raise BadSyntax(f'You can not access attributes of {t}')
+
     def no_impl(self, node):
         raise NotImplementedError
 
@@ -953,34 +1213,17 @@ class Evaluator:
         raise BadSyntax('You can not use `async with` syntax')
 
     def visit_attribute(self, node: _ast.Attribute):  # value, attr, ctx
-        value = self._run(node.value)
-        t = type(value)
-        try:
-            if value in self.allowed_modules:
-                if node.attr in self.allowed_modules[value]:
-                    return getattr(value, node.attr)
-                raise BadSyntax(f'You can not access `{node.attr}` attribute')
-            if value in self.allowed_class_properties:
-                if node.attr in self.allowed_class_properties[value]:
-                    return getattr(value, node.attr)
-                raise BadSyntax(f'You can not access `{node.attr}` attribute')
-        except TypeError:
-            pass
-        if t in self.allowed_instance_properties:
-            if node.attr in self.allowed_instance_properties[t]:
-                return getattr(value, node.attr)
-            raise BadSyntax(f'You can not access `{node.attr}` attribute')
-        raise BadSyntax(f'You can not access attributes of {t}')
+        return self.get_attribute(self._run(node.value), node.attr)
 
     def visit_augassign(self, node: _ast.AugAssign):  # target, op, value
         value = self._run(node.value)
         target = node.target
         target_cls = target.__class__
-        op_cls = node.op.__class__
+        op = self.get_binop(node.op.__class__)
 
         if target_cls == _ast.Name:
             target_id = target.id  # type: ignore
-            self.symbol_table[target_id] = BINOP_TABLE[op_cls](
+            self.symbol_table[target_id] = op(  # type: ignore
                 self.symbol_table[target_id],
                 value,
             )
@@ -988,7 +1231,7 @@ class Evaluator:
             sym = self._run(target.value)  # type: ignore
             xslice = self._run(target.slice)  # type: ignore
             if isinstance(target.slice, _ast.Index):  # type: ignore
-                sym[xslice] = BINOP_TABLE[op_cls](
+                sym[xslice] = op(  # type: ignore
                     sym[xslice],
                     value,
                 )
@@ -1002,7 +1245,7 @@ class Evaluator:
         raise BadSyntax('You can not await anything')
 
     def visit_binop(self, node: _ast.BinOp):  # left, op, right
-        op = BINOP_TABLE.get(node.op.__class__)
+        op = self.get_binop(node.op.__class__)
 
         if op:
             return op(self._run(node.left), self._run(node.right))
@@ -1025,7 +1268,7 @@ class Evaluator:
         func = self._run(node.func)
         args = [self._run(x) for x in node.args]
         keywords = {x.arg: self._run(x.value) for x in node.keywords}
-        return func(*args, **keywords)
+        return self.call(func, args, keywords)
 
     def visit_compare(self, node: _ast.Compare):  # left, ops, comparators
         lval = self._run(node.left)
@@ -1072,6 +1315,7 @@ class Evaluator:
         current_gen = node.generators[0]
         if current_gen.__class__ == _ast.comprehension:
             for val in self._run(current_gen.iter):
+                self.spend()
                 self.assign(current_gen.target, val)
                 add = True
                 for cond in current_gen.ifs:
@@ -1107,6 +1351,7 @@ class Evaluator:
 
     def visit_for(self, node: _ast.For):  # target, iter, body, orelse
         for val in self._run(node.iter):
+            self.spend()
             self.assign(node.target, val)
             self.current_interrupt = None
             for tnode in node.body:
@@ -1168,6 +1413,7 @@ class Evaluator:
         current_gen = node.generators[0]
         if current_gen.__class__ == _ast.comprehension:
             for val in self._run(current_gen.iter):
+                self.spend()
                 self.assign(current_gen.target, val)
                 add = True
                 for cond in current_gen.ifs:
@@ -1232,6 +1478,7 @@ class Evaluator:
         current_gen = node.generators[0]
         if current_gen.__class__ == _ast.comprehension:
             for val in self._run(current_gen.iter):
+                self.spend()
                 self.assign(current_gen.target, val)
                 add = True
                 for cond in current_gen.ifs:
@@ -1278,6 +1525,7 @@ class Evaluator:
 
     def visit_while(self, node: _ast.While):  # test, body, orelse
         while self._run(node.test):
+            self.spend()
             self.current_interrupt = None
             for tnode in node.body:
                 self._run(tnode)
@@ -1300,6 +1548,536 @@ class Evaluator:
     def visit_yieldfrom(self, node: _ast.YieldFrom):
         raise BadSyntax('You can not use `yield from` syntax')
 
+    def compile(self, node) -> Callable[[], Any]:
+        """Compile AST node into closure which does same as its visitor.
+
+        Node which has no compiler, including every forbidden syntax, falls
+        back to visitor, so it raises same error at same time.
+
+        """
+
+        if node is None:
+            return none
+
+        compiler = getattr(
+            self,
+            f'compile_{node.__class__.__name__.lower()}',
+            None,
+        )
+        if compiler is None:
+            return functools.partial(self._run, node)
+        return compiler(node)
+
+    def compile_body(self, nodes) -> Callable[[], None]:
+        steps = [self.compile(x) for x in nodes]
+
+        def body():
+            for step in steps:
+                step()
+
+        return body
+
+    def compile_assign_target(self, node) -> Callable[[Any], None]:
+        cls = node.__class__
+
+        if cls == _ast.Name:
+            symbol_table = self.symbol_table
+            name = node.id
+
+            def assign_name(val):
+                symbol_table[name] = val
+
+            return assign_name
+        elif cls in (_ast.Tuple, _ast.List):
+            elts = [self.compile_assign_target(x) for x in node.elts]
+            length = len(elts)
+
+            def assign_unpack(val):
+                if len(val) == length:
+                    for assign, tval in zip(elts, val):
+                        assign(tval)
+                else:
+                    raise ValueError('too many values to unpack')
+
+            return assign_unpack
+        elif cls == _ast.Subscript:
+            value = self.compile(node.value)
+            xslice = self.compile(node.slice)
+            slice_cls = node.slice.__class__
+
+            def assign_subscript(val):
+                sym = value()
+                x = xslice()
+                if slice_cls == _ast.Slice:
+                    sym[slice(x.start, x.stop)] = val
+                elif slice_cls in (_ast.Index, _ast.ExtSlice):
+                    sym[x] = val
+
+            return assign_subscript
+
+        def assign_not_allowed(val):
+            raise BadSyntax('This assign method is not allowed')
+
+        return assign_not_allowed
+
+    def compile_delete_target(self, node) -> Callable[[], None]:
+        cls = node.__class__
+
+        if cls == _ast.Name:
+            symbol_table = self.symbol_table
+            name = node.id
+
+            def delete_name():
+                del symbol_table[name]
+
+            return delete_name
+        elif cls == _ast.Tuple:
+            elts = [self.compile_delete_target(x) for x in node.elts]
+
+            def delete_unpack():
+                for delete in elts:
+                    delete()
+
+            return delete_unpack
+        return none
+
+    def compile_comprehension(
+        self,
+        generators,
+        emit: Callable[[Any], None],
+    ) -> Callable[[Any], None]:
+        """Compile nested loops of comprehension into one closure.
+
+        ``emit`` puts element into result, so nested loops share one result
+        instead of merging result of each inner loop into outer one.
+
+        """
+
+        for gen in reversed(generators):
+            emit = self.compile_generator(gen, emit)
+        return emit
+
+    def compile_generator(
+        self,
+        gen: _ast.comprehension,
+        emit: Callable[[Any], None],
+    ) -> Callable[[Any], None]:
+        iter_ = self.compile(gen.iter)
+        assign = self.compile_assign_target(gen.target)
+        delete = self.compile_delete_target(gen.target)
+        ifs = [self.compile(x) for x in gen.ifs]
+
+        spend = self.spend
+
+        def loop(result):
+            for val in iter_():
+                spend()
+                assign(val)
+                add = True
+                for cond in ifs:
+                    add = cond()
+                    if not add:
+                        break
+                if add:
+                    emit(result)
+                delete()
+
+        return loop
+
+    def compile_loop(
+        self,
+        node: Union[_ast.For, _ast.While],
+    ) -> Tuple[Callable[[], bool], Callable[[], None]]:
+        """Compile body of loop into closure which returns break or not."""
+
+        steps = [self.compile(x) for x in node.body]
+        orelse = self.compile_body(node.orelse)
+
+        def body() -> bool:
+            self.current_interrupt = None
+            for step in steps:
+                step()
+                if self.current_interrupt is not None:
+                    break
+            return isinstance(self.current_interrupt, _ast.Break)
+
+        return body, orelse
+
+    def compile_assign(self, node: _ast.Assign):
+        value = self.compile(node.value)
+        targets = [self.compile_assign_target(x) for x in node.targets]
+
+        def assign():
+            val = value()
+            for target in targets:
+                target(val)
+
+        return assign
+
+    def compile_attribute(self, node: _ast.Attribute):
+        value = self.compile(node.value)
+        attr = node.attr
+
+        return lambda: self.get_attribute(value(), attr)
+
+    def compile_augassign(self, node: _ast.AugAssign):
+        value = self.compile(node.value)
+        target = node.target
+        target_cls = target.__class__
+        op = self.get_binop(node.op.__class__)
+
+        if target_cls == _ast.Name:
+            symbol_table = self.symbol_table
+            name = target.id  # type: ignore
+
+            def augassign_name():
+                val = value()
+                symbol_table[name] = op(symbol_table[name], val)
+
+            return augassign_name
+        elif target_cls == _ast.Subscript:
+            sym = self.compile(target.value)  # type: ignore
+            xslice = self.compile(target.slice)  # type: ignore
+            is_index = isinstance(target.slice, _ast.Index)  # type: ignore
+
+            def augassign_subscript():
+                val = value()
+                s = sym()
+                x = xslice()
+                if is_index:
+                    s[x] = op(s[x], val)
+                else:
+                    raise BadSyntax('This assign method is not allowed')
+
+            return augassign_subscript
+
+        def augassign_not_allowed():
+            value()
+            raise BadSyntax('This assign method is not allowed')
+
+        return augassign_not_allowed
+
+    def compile_binop(self, node: _ast.BinOp):
+        op = self.get_binop(node.op.__class__)
+        if not op:
+            return functools.partial(self.no_impl, node)
+
+        left = self.compile(node.left)
+        right = self.compile(node.right)
+
+        return lambda: op(left(), right())  # type: ignore
+
+    def compile_boolop(self, node: _ast.BoolOp):
+        op = BOOLOP_TABLE.get(node.op.__class__)
+        if not op:
+            return functools.partial(self.no_impl, node)
+
+        values = [self.compile(x) for x in node.values]
+
+        return lambda: functools.reduce(
+            op,  # type: ignore
+            [value() for value in values],
+            True,
+        )
+
+    def compile_break(self, node: _ast.Break):
+        return functools.partial(self.visit_break, node)
+
+    def compile_call(self, node: _ast.Call):
+        func = self.compile(node.func)
+        args = [self.compile(x) for x in node.args]
+        keywords = [(x.arg, self.compile(x.value)) for x in node.keywords]
+
+        def call():
+            f = func()
+            a = [arg() for arg in args]
+            kw = {key: value() for key, value in keywords}
+            return self.call(f, a, kw)
+
+        return call
+
+    def compile_compare(self, node: _ast.Compare):
+        left = self.compile(node.left)
+        comparators = [
+            (COMPARE_TABLE.get(op.__class__), self.compile(x))
+            for op, x in zip(node.ops, node.comparators)
+        ]
+
+        def compare():
+            lval = left()
+            out = True
+            for cmpop, right in comparators:
+                rval = right()
+                if cmpop:
+                    out = cmpop(lval, rval)
+                    lval = rval
+                else:
+                    raise NotImplementedError
+            return out
+
+        return compare
+
+    def compile_continue(self, node: _ast.Continue):
+        return functools.partial(self.visit_continue, node)
+
+    def compile_delete(self, node: _ast.Delete):
+        if len(node.targets) != 1:
+            return self.compile_body(
+                _ast.Delete(targets=[x]) for x in node.targets
+            )
+
+        target = node.targets[0]
+        target_cls = target.__class__
+        if target_cls == _ast.Name:
+            return self.compile_delete_target(target)
+        elif target_cls == _ast.Subscript:
+            sym = self.compile(target.value)  # type: ignore
+            xslice = self.compile(target.slice)  # type: ignore
+            is_index = isinstance(target.slice, _ast.Index)  # type: ignore
+
+            def delete_subscript():
+                s = sym()
+                x = xslice()
+                if is_index:
+                    del s[x]
+                else:
+                    raise BadSyntax('This delete method is not allowed')
+
+            return delete_subscript
+
+        def delete_not_allowed():
+            raise BadSyntax('This delete method is not allowed')
+
+        return delete_not_allowed
+
+    def compile_dict(self, node: _ast.Dict):
+        items = [
+            (self.compile(k), self.compile(v))
+            for k, v in zip(node.keys, node.values)
+        ]
+
+        return lambda: {key(): value() for key, value in items}
+
+    def compile_dictcomp(self, node: _ast.DictComp):
+        key = self.compile(node.key)
+        value = self.compile(node.value)
+
+        def emit(result):
+            k = key()
+            result[k] = value()
+
+        loop = self.compile_comprehension(node.generators, emit)
+
+        def dictcomp():
+            result: Dict[Any, Any] = {}
+            loop(result)
+            return result
+
+        return dictcomp
+
+    def compile_ellipsis(self, node: _ast.Ellipsis):
+        return lambda: Ellipsis
+
+    def compile_expr(self, node: _ast.Expr):
+        return self.compile(node.value)
+
+    def compile_extslice(self, node: _ast.ExtSlice):
+        dims = [self.compile(x) for x in node.dims]
+
+        return lambda: tuple(dim() for dim in dims)
+
+    def compile_for(self, node: _ast.For):
+        iter_ = self.compile(node.iter)
+        assign = self.compile_assign_target(node.target)
+        body, orelse = self.compile_loop(node)
+        spend = self.spend
+
+        def for_():
+            for val in iter_():
+                spend()
+                assign(val)
+                if body():
+                    break
+            else:
+                orelse()
+
+            self.current_interrupt = None
+
+        return for_
+
+    def compile_formattedvalue(self, node: _ast.FormattedValue):
+        value = self.compile(node.value)
+        format_spec = self.compile(node.format_spec)
+
+        def formattedvalue():
+            val = value()
+            spec = format_spec()
+            if spec is None:
+                spec = ''
+            return format(val, spec)
+
+        return formattedvalue
+
+    def compile_if(self, node: _ast.If):
+        test = self.compile(node.test)
+        body = self.compile_body(node.body)
+        orelse = self.compile_body(node.orelse)
+
+        def if_():
+            if test():
+                body()
+            else:
+                orelse()
+
+        return if_
+
+    def compile_ifexp(self, node: _ast.IfExp):
+        test = self.compile(node.test)
+        body = self.compile(node.body)
+        orelse = self.compile(node.orelse)
+
+        return lambda: body() if test() else orelse()
+
+    def compile_index(self, node: _ast.Index):
+        return self.compile(node.value)
+
+    def compile_joinedstr(self, node: _ast.JoinedStr):
+        values = [self.compile(x) for x in node.values]
+
+        return lambda: ''.join(value() for value in values)
+
+    def compile_list(self, node: _ast.List):
+        elts = [self.compile(x) for x in node.elts]
+
+        return lambda: [elt() for elt in elts]
+
+    def compile_listcomp(self, node: _ast.ListComp):
+        elt = self.compile(node.elt)
+
+        def emit(result):
+            result.append(elt())
+
+        loop = self.compile_comprehension(node.generators, emit)
+
+        def listcomp():
+            result: List[Any] = []
+            loop(result)
+            return result
+
+        return listcomp
+
+    def compile_module(self, node: _ast.Module):
+        steps = [self.compile(x) for x in node.body]
+
+        def module():
+            last = None
+            for step in steps:
+                last = step()
+            return last
+
+        return module
+
+    def compile_name(self, node: _ast.Name):
+        name = node.id
+        if node.ctx.__class__ in (_ast.Param, _ast.Del):
+            return lambda: name
+
+        symbol_table = self.symbol_table
+        global_symbol_table = self.global_symbol_table
+
+        def load():
+            if name in symbol_table:
+                return symbol_table[name]
+            if name in global_symbol_table:
+                return global_symbol_table[name]
+            raise NameError()
+
+        return load
+
+    def compile_nameconstant(self, node: _ast.NameConstant):
+        value = node.value
+
+        return lambda: value
+
+    def compile_num(self, node: _ast.Num):
+        value = self.visit_num(node)
+
+        return lambda: value
+
+    def compile_pass(self, node: _ast.Pass):
+        return none
+
+    def compile_set(self, node: _ast.Set):
+        elts = [self.compile(x) for x in node.elts]
+
+        return lambda: {elt() for elt in elts}
+
+    def compile_setcomp(self, node: _ast.SetComp):
+        elt = self.compile(node.elt)
+
+        def emit(result):
+            result.add(elt())
+
+        loop = self.compile_comprehension(node.generators, emit)
+
+        def setcomp():
+            result: Set[Any] = set()
+            loop(result)
+            return result
+
+        return setcomp
+
+    def compile_slice(self, node: _ast.Slice):
+        lower = self.compile(node.lower)
+        upper = self.compile(node.upper)
+        step = self.compile(node.step)
+
+        return lambda: slice(lower(), upper(), step())
+
+    def compile_str(self, node: _ast.Str):
+        value = node.s
+
+        return lambda: value
+
+    compile_bytes = compile_str
+
+    def compile_subscript(self, node: _ast.Subscript):
+        value = self.compile(node.value)
+        xslice = self.compile(node.slice)
+
+        return lambda: value()[xslice()]
+
+    def compile_tuple(self, node: _ast.Tuple):
+        elts = [self.compile(x) for x in node.elts]
+
+        return lambda: tuple(elt() for elt in elts)
+
+    def compile_unaryop(self, node: _ast.UnaryOp):
+        op = UNARYOP_TABLE.get(node.op.__class__)
+        if not op:
+            return functools.partial(self.no_impl, node)
+
+        operand = self.compile(node.operand)
+
+        return lambda: op(operand())  # type: ignore
+
+    def compile_while(self, node: _ast.While):
+        test = self.compile(node.test)
+        body, orelse = self.compile_loop(node)
+        spend = self.spend
+
+        def while_():
+            while test():
+                spend()
+                if body():
+                    break
+            else:
+                orelse()
+
+            self.current_interrupt = None
+
+        return while_
+
 
 def calculate(
     expr: str,
@@ -1310,3 +2088,31 @@ def calculate(
     result = e.run(expr)
 
     return result, e.symbol_table
+
+
+def calculate_text(
+    expr: str,
+    *,
+    decimal_mode: bool = True
+) -> Tuple[Optional[str], Dict[str, str]]:
+    """Calculate and make text of result and local state.
+
+    It runs in sandbox, so converting huge value into text is also under
+    time limit, and only text is sent back to bot process.
+
+    """
+
+    result, local = calculate(expr, decimal_mode=decimal_mode)
+    return (
+        None if result is None else str(result),
+        {key: repr(value) for key, value in local.items()},
+    )
+
+
+result_cache = ResultCache(CACHE_SIZE, CACHE_MAX_LENGTH)
+sandbox = SandboxPool(
+    calculate_text,
+    size=SANDBOX_SIZE,
+    timeout=TIMEOUT,
+    memory_limit=MEMORY_LIMIT,
+)
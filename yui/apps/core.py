@@ -1,13 +1,27 @@
 import asyncio
+import functools
 import logging
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+import attr
 
+from ..api.hydration import Hydration
 from ..bot import APICallError, BotReconnect
 from ..box import box
 from ..event import (
     ChannelArchive,
     ChannelCreated,
     ChannelDeleted,
-    ChannelHistoryChanged,
     ChannelJoined,
     ChannelLeft,
     ChannelMarked,
@@ -16,7 +30,6 @@ from ..event import (
     ChatterboxSystemStart,
     GroupArchive,
     GroupClose,
-    GroupHistoryChanged,
     GroupJoined,
     GroupLeft,
     GroupMarked,
@@ -25,7 +38,6 @@ from ..event import (
     GroupUnarchive,
     IMClose,
     IMCreated,
-    IMHistoryChanged,
     IMMarked,
     IMOpen,
     TeamJoin,
@@ -33,6 +45,7 @@ from ..event import (
     UserChange,
 )
 from ..types.channel import (
+    Channel,
     DirectMessageChannel,
     PrivateChannel,
     PublicChannel,
@@ -52,52 +65,153 @@ async def retry(callback, *args, **kwargs):
             raise
 
 
+@functools.lru_cache()
+def get_required_fields(cls) -> FrozenSet[str]:
+    return frozenset(
+        a.name for a in attr.fields(cls)
+        if a.init and a.default is attr.NOTHING
+    )
+
+
+async def load_objects(
+    hydration: Hydration,
+    kind: str,
+    objs: List[Dict[str, Any]],
+    cls,
+    info,
+    key: str,
+):
+    """Make objects from rtm.start payload.
+
+    Only objects which miss required field are fetched again with info API.
+
+    """
+
+    required = get_required_fields(cls)
+    missing = [d['id'] for d in objs if not required.issubset(d)]
+    fetched = {
+        data['id']: data for data in await hydration.fetch(
+            kind,
+            functools.partial(retry, info),
+            key,
+            missing,
+        )
+    }
+    result = []
+    for data in objs:
+        if not required.issubset(data):
+            if data['id'] not in fetched:
+                continue
+            data = fetched[data['id']]
+        result.append(cls(**data))
+    return result
+
+
+#: Kind of channels in bot and their class by prefix of channel ID.
+CHANNEL_KINDS: Dict[str, Tuple[str, Type[Channel]]] = {
+    'C': ('channels', PublicChannel),
+    'G': ('groups', PrivateChannel),
+    'D': ('ims', DirectMessageChannel),
+}
+
+#: Types of conversations.list which have each kind of channels.
+#: Private channels made recently have C prefix, so ask them for channels.
+CONVERSATION_TYPES: Dict[str, Tuple[str, ...]] = {
+    'channels': ('public_channel', 'private_channel'),
+    'groups': ('private_channel',),
+    'ims': ('im',),
+}
+
+
+def get_channel_kind(channel_id: str) -> Optional[str]:
+    try:
+        return CHANNEL_KINDS[channel_id[:1]][0]
+    except KeyError:
+        return None
+
+
+def make_hydration(bot) -> Hydration:
+    return Hydration(bot.config.HYDRATION_CONCURRENCY)
+
+
+async def sync_conversations(
+    bot,
+    kinds: Iterable[str] = CONVERSATION_TYPES.keys(),
+    hydration: Optional[Hydration] = None,
+):
+    kinds = sorted(kinds)
+    logger.info(f'sync_conversations start ({", ".join(kinds)})')
+    hydration = hydration or make_hydration(bot)
+    conversations = await hydration.list(
+        'conversations',
+        functools.partial(retry, bot.api.conversations.list),
+        'channels',
+        types=sorted({t for kind in kinds for t in CONVERSATION_TYPES[kind]}),
+    )
+    new_channels: Dict[str, List] = {kind: [] for kind in kinds}
+    for c in conversations:
+        try:
+            kind, cls = CHANNEL_KINDS[c['id'][:1]]
+        except KeyError:
+            continue
+        if kind in new_channels:
+            new_channels[kind].append(cls(**c))  # type: ignore
+
+    for kind, channels in new_channels.items():
+        getattr(bot, kind)[:] = channels
+    logger.info('sync_conversations end')
+
+
+async def sync_users(bot, hydration: Optional[Hydration] = None):
+    logger.info('sync_users start')
+    hydration = hydration or make_hydration(bot)
+    users = await hydration.list(
+        'users',
+        functools.partial(retry, bot.api.users.list),
+        'members',
+        presence=False,
+    )
+    bot.users[:] = [User(**u) for u in users]  # type: ignore
+    logger.info('sync_users end')
+
+
 @box.on(ChatterboxSystemStart)
-async def on_start(bot):
-    async def channel():
-        cursor = None
-        bot.channels.clear()
-        while True:
-            result = await retry(bot.api.channels.list, cursor)
-            cursor = None
-            if 'response_metadata' in result.body:
-                cursor = result.body['response_metadata'].get('next_cursor')
-            for c in result.body['channels']:
-                res = await retry(bot.api.channels.info, c['id'])
-                bot.channels.append(PublicChannel(**res.body['channel']))
-            if not cursor:
-                break
-
-    async def im():
-        bot.ims.clear()
-        result = await retry(bot.api.im.list)
-        for d in result.body['ims']:
-            bot.ims.append(DirectMessageChannel(**d))
-
-    async def groups():
-        bot.groups.clear()
-        result = await retry(bot.api.groups.list)
-        for g in result.body['groups']:
-            res = await retry(bot.api.groups.info, g['id'])
-            bot.groups.append(PrivateChannel(**res.body['group']))
-
-    async def users():
-        bot.users.clear()
-        result = await retry(bot.api.users.list, presence=False)
-        for u in result.body['members']:
-            bot.users.append(User(**u))
+async def on_start(bot, event: ChatterboxSystemStart):
+    rtm = event.rtm or {}
+    hydration = make_hydration(bot)
+
+    async def load(kind: str, cls, info, key: str):
+        getattr(bot, kind)[:] = await load_objects(
+            hydration,
+            kind,
+            rtm[kind],
+            cls,
+            info,
+            key,
+        )
 
     bot.is_ready = False
 
-    await asyncio.wait(
-        (
-            channel(),
-            im(),
-            groups(),
-            users(),
-        ),
-        return_when=asyncio.FIRST_EXCEPTION,
-    )
+    coros = []
+    if 'users' in rtm:
+        # channels refer users, so load users at first when it is cheap
+        await load('users', User, bot.api.users.info, 'user')
+    else:
+        coros.append(sync_users(bot, hydration))
+
+    missing = []
+    for kind, cls in CHANNEL_KINDS.values():
+        if kind in rtm:
+            coros.append(
+                load(kind, cls, bot.api.conversations.info, 'channel'),
+            )
+        else:
+            missing.append(kind)
+    if missing:
+        coros.append(sync_conversations(bot, missing, hydration))
+
+    await asyncio.wait(coros, return_when=asyncio.FIRST_EXCEPTION)
+    logger.info(hydration.report())
 
     bot.is_ready = True
 
@@ -122,77 +236,145 @@ async def on_user_change(bot, event: UserChange):
     logger.info('on user change start')
     res = await retry(bot.api.users.info, event.user)
 
-    bot.users[:] = [
-        u for u in bot.users if u.id != event.user.id
-    ] + [User(**res.body['user'])]  # type: ignore
+    bot.users.upsert(User(**res.body['user']))  # type: ignore
     logger.info('on user change end')
 
     return True
 
 
+async def fetch_channel(bot, channel_id: str):
+    try:
+        kind, cls = CHANNEL_KINDS[channel_id[:1]]
+    except KeyError:
+        return
+
+    channels = getattr(bot, kind)
+    res = await retry(bot.api.conversations.info, channel_id)
+    if res.body['ok']:
+        channels.upsert(cls(**res.body['channel']))  # type: ignore
+    else:
+        channels.discard(channel_id)
+
+
+class ChannelRefresher:
+    """Debounce and coalesce refreshing channels after mutation events.
+
+    Channel IDs and full syncs requested in :attr:`delay` seconds are merged,
+    and each of them is fetched only once.
+
+    """
+
+    delay: float = 1.0
+
+    def __init__(self) -> None:
+        self.channel_ids: Set[str] = set()
+        self.syncs: Set[str] = set()
+        self.task: Optional[asyncio.Task] = None
+
+    def refresh(self, bot, channel_id: str):
+        """Fetch only given channel later."""
+
+        self.channel_ids.add(channel_id)
+        self.schedule(bot)
+
+    def invalidate(self, bot, *kinds: str):
+        """Sync every channel of given kinds later."""
+
+        self.syncs.update(kinds or CONVERSATION_TYPES.keys())
+        self.schedule(bot)
+
+    def schedule(self, bot):
+        if self.task is None or self.task.done():
+            self.task = bot.loop.create_task(self.flush(bot))
+
+    async def flush(self, bot):
+        await asyncio.sleep(self.delay)
+
+        syncs, self.syncs = self.syncs, set()
+        channel_ids, self.channel_ids = self.channel_ids, set()
+        self.task = None
+
+        coros = []
+        if syncs:
+            coros.append(sync_conversations(bot, syncs))
+        coros.extend(
+            fetch_channel(bot, channel_id)
+            for channel_id in sorted(channel_ids)
+            if get_channel_kind(channel_id) not in syncs
+        )
+        for coro in coros:
+            try:
+                await coro
+            except Exception:
+                logger.exception('Fail to refresh channel')
+
+
+refresher = ChannelRefresher()
+
+
+@box.cron('0 * * * *')
+async def sync_all_channels(bot):
+    refresher.invalidate(bot)
+
+
+@box.on(ChannelMarked)
+@box.on(GroupMarked)
+@box.on(IMMarked)
+async def channel_marked(bot, event):
+    if event.channel.is_unknown:
+        refresher.refresh(bot, event.channel.id)
+    else:
+        event.channel.last_read = event.ts
+    return True
+
+
 @box.on(ChannelArchive)
 @box.on(ChannelCreated)
-@box.on(ChannelDeleted)
-@box.on(ChannelHistoryChanged)
 @box.on(ChannelJoined)
 @box.on(ChannelLeft)
-@box.on(ChannelMarked)
 @box.on(ChannelUnarchive)
 @box.on(ChannelRename)
-async def public_channel_mutation_detected(bot):
-    logger.info('public_channel_mutation_detected start')
-    cursor = None
-    new_channels = []
-    while True:
-        result = await retry(bot.api.channels.list, cursor)
-        cursor = result.body.get('response_metadata', {}).get('next_cursor')
-        for c in result.body['channels']:
-            res = await retry(bot.api.channels.info, c['id'])
-            new_channels.append(PublicChannel(**res.body['channel']))
-        if not cursor:
-            break
-
-    bot.channels[:] = new_channels
-    logger.info('public_channel_mutation_detected end')
-    return True
-
-
 @box.on(GroupArchive)
 @box.on(GroupClose)
-@box.on(GroupHistoryChanged)
 @box.on(GroupJoined)
-@box.on(GroupLeft)
-@box.on(GroupMarked)
 @box.on(GroupOpen)
 @box.on(GroupRename)
 @box.on(GroupUnarchive)
-async def private_channel_mutation_detected(bot):
-    logger.info('private_channel_mutation_detected start')
-    new_groups = []
-    result = await retry(bot.api.groups.list)
-    for g in result.body['groups']:
-        res = await retry(bot.api.groups.info, g['id'])
-        new_groups.append(PrivateChannel(**res.body['group']))
-
-    bot.groups[:] = new_groups
-    logger.info('private_channel_mutation_detected start')
+async def channel_mutation_detected(bot, event):
+    refresher.refresh(bot, event.channel.id)
+    return True
+
+
+@box.on(ChannelDeleted)
+async def channel_deleted(bot, event: ChannelDeleted):
+    bot.channels.discard(event.channel.id)
+    return True
+
+
+@box.on(GroupLeft)
+async def group_left(bot, event: GroupLeft):
+    bot.groups.discard(event.channel.id)
     return True
 
 
-@box.on(IMClose)
 @box.on(IMCreated)
-@box.on(IMHistoryChanged)
-@box.on(IMMarked)
+async def im_created(bot, event: IMCreated):
+    if event.channel.is_unknown:
+        bot.ims.append(DirectMessageChannel(  # type: ignore
+            id=event.channel.id,
+            user=event.user.id,
+            is_open=True,
+        ))
+    return True
+
+
+@box.on(IMClose)
 @box.on(IMOpen)
-async def direct_message_channel_mutation_detected(bot):
-    logger.info('direct_message_channel_mutation_detected start')
-    new_ims = []
-    result = await retry(bot.api.im.list)
-    for d in result.body['ims']:
-        new_ims.append(DirectMessageChannel(**d))
-
-    bot.ims[:] = new_ims
-    logger.info('direct_message_channel_mutation_detected end')
+async def im_open_or_close(bot, event):
+    if event.channel.is_unknown:
+        refresher.refresh(bot, event.channel.id)
+    else:
+        event.channel.is_open = isinstance(event, IMOpen)
     return True
 
 
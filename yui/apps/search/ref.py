@@ -1,6 +1,8 @@
 import asyncio
+import hashlib
 import logging
-from typing import Dict, List, Tuple
+from datetime import timedelta
+from typing import Callable, Dict, List, Tuple
 
 from fuzzywuzzy import fuzz
 
@@ -12,7 +14,7 @@ from ..shared.cache import JSONCache
 from ...bot import Bot
 from ...box import box
 from ...command import argument
-from ...event import ChatterboxSystemStart, Message
+from ...event import Message
 from ...session import client_session
 from ...utils.datetime import now
 
@@ -35,6 +37,14 @@ def fetch_or_create_cache(name: str, sess) -> JSONCache:
     return ref
 
 
+def touch_cache(ref: JSONCache, sess):
+    """Mark revalidated cache as fresh. Only changed time is written."""
+
+    ref.created_at = now()
+    with sess.begin():
+        sess.add(ref)
+
+
 def parse(html: str, selector: str, url_prefix: str) -> List[Tuple[str, str]]:
     h = fromstring(html)
     a_tags = h.cssselect(selector)
@@ -50,55 +60,93 @@ def parse(html: str, selector: str, url_prefix: str) -> List[Tuple[str, str]]:
     return result
 
 
-async def fetch_css_ref(bot: Bot, sess):
-    logger.info(f'fetch css ref start')
+async def fetch_ref(
+    bot: Bot,
+    sess,
+    name: str,
+    parse_func: Callable[..., List],
+    *args,
+    force: bool = False,
+):
+    """Fetch reference page and store parsed result in cache.
 
-    ref = fetch_or_create_cache('css', sess)
+    Cache younger than ``REF_MAX_AGE`` seconds is used as is unless
+    ``force`` is true. Otherwise, page is requested with stored validators,
+    and parse is skipped when content was not changed. Then only time of
+    cache is updated, so it is fresh again.
+
+    """
+
+    ref = fetch_or_create_cache(name, sess)
+
+    headers: Dict[str, str] = {}
+    if ref.body is not None:
+        max_age = timedelta(seconds=bot.config.REF_MAX_AGE)
+        if not force and now() - ref.created_at < max_age:
+            logger.info(f'{name} ref is fresh')
+            return
+        if ref.etag:
+            headers['If-None-Match'] = ref.etag
+        if ref.last_modified:
+            headers['If-Modified-Since'] = ref.last_modified
 
-    url = 'https://developer.mozilla.org/en-US/docs/Web/CSS/Reference'
     async with client_session() as session:
-        async with session.get(url) as res:
+        async with session.get(REF_URLS[name], headers=headers) as res:
+            if res.status == 304:
+                logger.info(f'{name} ref was not modified')
+                touch_cache(ref, sess)
+                return
             html = await res.text()
+            etag = res.headers.get('ETag')
+            last_modified = res.headers.get('Last-Modified')
 
-    body = await bot.run_in_other_process(
-        parse,
-        html,
-        'a[href^=\\/en-US\\/docs\\/Web\\/CSS\\/]',
-        'https://developer.mozilla.org',
-    )
+    content_hash = hashlib.sha256(html.encode()).hexdigest()
+    if ref.body is not None and content_hash == ref.content_hash:
+        logger.info(f'{name} ref has same content')
+        touch_cache(ref, sess)
+        return
 
-    ref.body = body
+    ref.body = await bot.run_in_other_process(parse_func, html, *args)
+    ref.etag = etag
+    ref.last_modified = last_modified
+    ref.content_hash = content_hash
     ref.created_at = now()
 
     with sess.begin():
         sess.add(ref)
 
-    logger.info(f'fetch css ref end')
 
+@box.warmup('css')
+async def fetch_css_ref(bot: Bot, sess, force: bool = False):
+    logger.info(f'fetch css ref start')
 
-async def fetch_html_ref(bot: Bot, sess):
-    logger.info(f'fetch html ref start')
+    await fetch_ref(
+        bot,
+        sess,
+        'css',
+        parse,
+        'a[href^=\\/en-US\\/docs\\/Web\\/CSS\\/]',
+        'https://developer.mozilla.org',
+        force=force,
+    )
 
-    ref = fetch_or_create_cache('html', sess)
+    logger.info(f'fetch css ref end')
 
-    url = 'https://developer.mozilla.org/en-US/docs/Web/HTML/Element'
-    async with client_session() as session:
-        async with session.get(url) as res:
-            html = await res.text()
 
-    body = await bot.run_in_other_process(
+@box.warmup('html')
+async def fetch_html_ref(bot: Bot, sess, force: bool = False):
+    logger.info(f'fetch html ref start')
+
+    await fetch_ref(
+        bot,
+        sess,
+        'html',
         parse,
-        html,
         'a[href^=\\/en-US\\/docs\\/Web\\/HTML\\/Element\\/]',
         'https://developer.mozilla.org',
+        force=force,
     )
 
-    ref.body = body
-    ref.created_at = now()
-
-    with sess.begin():
-        sess.add(ref)
-
     logger.info(f'fetch html ref end')
 
 
@@ -127,53 +175,34 @@ def parse_python(html: str) -> List[Tuple[str, str, str]]:
     return result
 
 
-async def fetch_python_ref(bot: Bot, sess):
+@box.warmup('python')
+async def fetch_python_ref(bot: Bot, sess, force: bool = False):
     logger.info(f'fetch python ref start')
 
-    ref = fetch_or_create_cache('python', sess)
-
-    url = 'https://docs.python.org/3/library/'
-    async with client_session() as session:
-        async with session.get(url) as res:
-            html = await res.text()
-
-    body = await bot.run_in_other_process(
-        parse_python,
-        html,
-    )
-
-    ref.body = body
-    ref.created_at = now()
-
-    with sess.begin():
-        sess.add(ref)
+    await fetch_ref(bot, sess, 'python', parse_python, force=force)
 
     logger.info(f'fetch python ref end')
 
 
-@box.on(ChatterboxSystemStart)
-async def on_start(bot, sess):
-    logger.info('on_start ref')
-    tasks = [
-        fetch_css_ref(bot, sess),
-        fetch_html_ref(bot, sess),
-        fetch_python_ref(bot, sess),
-    ]
-    await asyncio.wait(tasks)
-    return True
-
-
 @box.cron('0 3 * * *')
 async def refresh(bot, sess):
     logger.info('refresh ref')
     tasks = [
-        fetch_css_ref(bot, sess),
-        fetch_html_ref(bot, sess),
-        fetch_python_ref(bot, sess),
+        fetch_css_ref(bot, sess, force=True),
+        fetch_html_ref(bot, sess, force=True),
+        fetch_python_ref(bot, sess, force=True),
     ]
     await asyncio.wait(tasks)
 
 
+async def say_not_ready(bot: Bot, event: Message, name: str):
+    if bot.is_warmed_up(name):
+        text = '레퍼런스 데이터를 찾지 못했어요. 잠시 후에 다시 시도해주세요!'
+    else:
+        text = '아직 레퍼런스 관련 명령어의 실행준비가 덜 되었어요. 잠시만 기다려주세요!'
+    await bot.say(event.channel, text)
+
+
 @box.command('html', ['htm'])
 @argument('keyword', nargs=-1, concat=True, count_error='키워드를 입력해주세요')
 async def html(bot, event: Message, sess, keyword: str):
@@ -187,10 +216,7 @@ async def html(bot, event: Message, sess, keyword: str):
     try:
         ref = sess.query(JSONCache).filter_by(name='html').one()
     except NoResultFound:
-        await bot.say(
-            event.channel,
-            '아직 레퍼런스 관련 명령어의 실행준비가 덜 되었어요. 잠시만 기다려주세요!'
-        )
+        await say_not_ready(bot, event, 'html')
         return
 
     name = None
@@ -228,10 +254,7 @@ async def css(bot, event: Message, sess, keyword: str):
     try:
         ref = sess.query(JSONCache).filter_by(name='css').one()
     except NoResultFound:
-        await bot.say(
-            event.channel,
-            '아직 레퍼런스 관련 명령어의 실행준비가 덜 되었어요. 잠시만 기다려주세요!'
-        )
+        await say_not_ready(bot, event, 'css')
         return
 
     name = None
@@ -325,10 +348,7 @@ async def python(bot, event: Message, sess, keyword: str):
     try:
         ref = sess.query(JSONCache).filter_by(name='python').one()
     except NoResultFound:
-        await bot.say(
-            event.channel,
-            '아직 레퍼런스 관련 명령어의 실행준비가 덜 되었어요. 잠시만 기다려주세요!'
-        )
+        await say_not_ready(bot, event, 'python')
         return
 
     name = None
@@ -15,7 +15,7 @@ import ujson
 from ..shared.cache import JSONCache
 from ...box import box
 from ...command import argument, option
-from ...event import ChatterboxSystemStart, Message
+from ...event import Message
 from ...session import client_session
 from ...transform import choice
 from ...utils.datetime import now
@@ -69,14 +69,14 @@ async def fetch_station_db(sess, service_region: str, api_version: str):
     logger.info(f'fetch {name} end')
 
 
-@box.on(ChatterboxSystemStart)
-async def on_start(sess):
-    logger.info('on_start subway')
-    tasks = []
-    for service_region, api_version in REGION_TABLE.values():
-        tasks.append(fetch_station_db(sess, service_region, api_version))
-    await asyncio.wait(tasks)
-    return True
+def register_warmup(service_region: str, api_version: str):
+    @box.warmup(f'subway-{service_region}-{api_version}')
+    async def warmup(sess):
+        await fetch_station_db(sess, service_region, api_version)
+
+
+for _service_region, _api_version in REGION_TABLE.values():
+    register_warmup(_service_region, _api_version)
 
 
 @box.cron('0 3 * * *')
@@ -90,16 +90,16 @@ async def refresh_db(sess):
 
 async def body(bot, event: Message, sess, region: str, start: str, end: str):
     service_region, api_version = REGION_TABLE[region]
+    name = f'subway-{service_region}-{api_version}'
 
     try:
-        db = sess.query(JSONCache).filter_by(
-            name=f'subway-{service_region}-{api_version}'
-        ).one()
+        db = sess.query(JSONCache).filter_by(name=name).one()
     except NoResultFound:
-        await bot.say(
-            event.channel,
-            '아직 지하철 관련 명령어의 실행준비가 덜 되었어요. 잠시만 기다려주세요!'
-        )
+        if bot.is_warmed_up(name):
+            text = '지하철 노선 데이터를 찾지 못했어요. 잠시 후에 다시 시도해주세요!'
+        else:
+            text = '아직 지하철 관련 명령어의 실행준비가 덜 되었어요. 잠시만 기다려주세요!'
+        await bot.say(event.channel, text)
         return
 
     data = db.body
@@ -16,4 +16,10 @@ class JSONCache(Base):
 
     body = Column(JSONType)
 
+    etag = Column(String, nullable=True)
+
+    last_modified = Column(String, nullable=True)
+
+    content_hash = Column(String, nullable=True)
+
     insert_datetime_field('created', locals(), False)
@@ -1,12 +1,29 @@
 import asyncio
+import collections
+import contextlib
 import functools
 import importlib
+import itertools
 import logging
 import logging.config
+import re
 import traceback
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import timedelta
-from typing import Any, Callable, Dict, List, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Counter,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import aiocron
 
@@ -20,19 +37,25 @@ from dateutil.tz import tzoffset
 import ujson
 
 from .api import SlackAPI
-from .box import Box, box
-from .box.tasks import CronTask
+from .api.scheduler import RateLimitScheduler
+from .box import BaseApp, Box, box
+from .box.injection import InjectionContext, get_injection_plan
+from .box.tasks import CronTask, WarmupTask
+from .box.utils import split_call
 from .config import Config
-from .event import create_event
-from .orm import Base, EngineConfig, get_database_engine, make_session
+from .event import BaseEvent, Message, create_event
+from .orm import Base, get_database_engine
 from .session import client_session
-from .types.base import ChannelID
+from .types.base import ChannelID, Ts
 from .types.channel import (
     Channel,
     DirectMessageChannel,
     PrivateChannel,
     PublicChannel,
+    get_dm_user_id,
 )
+from .types.directory import Directory
+from .types.handler import Handler
 from .types.namespace import Namespace
 from .types.slack.response import APIResponse
 from .types.user import User
@@ -41,6 +64,15 @@ from .utils.api import retry
 
 R = TypeVar('R')
 UTC9 = tzoffset('UTC9', timedelta(hours=9))
+RTM_MESSAGE_KWARGS = {'thread_ts'}
+RTM_MESSAGE_MAX_LENGTH = 4000
+RTM_REPLY_TIMEOUT = 5
+#: IDs of public channel, DM and private channel which RTM can send to.
+RTM_CHANNEL_ID_RE = re.compile(r'[CDG][A-Z0-9]+')
+#: Match type of event only when it is the first key of frame.
+EVENT_TYPE_PREFIX = '{"type":"'
+EVENT_TYPE_START = len(EVENT_TYPE_PREFIX)
+EVENT_TYPE_RE = re.compile(r'\s*\{\s*"type"\s*:\s*"([^"\\]*)"')
 
 
 class BotReconnect(Exception):
@@ -65,10 +97,59 @@ class APICallError(Exception):
         self.headers = headers
 
 
+def get_event_channel_id(event: BaseEvent) -> Optional[ChannelID]:
+    """Get ID of channel which given event was occurred."""
+
+    channel = getattr(event, 'channel', None)
+    if channel is None or isinstance(channel, str):
+        return channel
+    return getattr(channel, 'id', None)
+
+
+def peek_event_type(text: str) -> Optional[str]:
+    """Get type of event from raw frame without decoding whole frame.
+
+    Return :obj:`None` when type is not the first key of frame.
+
+    """
+
+    # Slack sends compact JSON, so check it without regex at first
+    if text.startswith(EVENT_TYPE_PREFIX):
+        end = text.find('"', EVENT_TYPE_START)
+        if end != -1 and '\\' not in text[EVENT_TYPE_START:end]:
+            return text[EVENT_TYPE_START:end]
+    match = EVENT_TYPE_RE.match(text)
+    if match is None:
+        return None
+    return match.group(1)
+
+
+def can_send_by_rtm(
+    channel: Union[Channel, ChannelID],
+    text: str,
+    kwargs: Dict[str, Any],
+) -> bool:
+    """Check given message is plain enough to send via RTM websocket."""
+
+    if set(kwargs) - RTM_MESSAGE_KWARGS:
+        return False
+    if isinstance(channel, Channel):
+        channel = channel.id
+    if not isinstance(channel, str) or not RTM_CHANNEL_ID_RE.fullmatch(
+        channel,
+    ):
+        return False
+    # RTM does not support link_names
+    return bool(text) and len(text) <= RTM_MESSAGE_MAX_LENGTH and not any(
+        c in text for c in '@#'
+    )
+
+
 class Bot:
     """Yui."""
 
     api: SlackAPI
+    api_url: str = 'https://slack.com/api/{}'
     loop: asyncio.AbstractEventLoop
 
     def __init__(
@@ -105,12 +186,22 @@ class Bot:
         self.box = using_box or box
         self.queue: asyncio.Queue = asyncio.Queue()
         self.api = SlackAPI(self)
-        self.channels: List[PublicChannel] = []
-        self.ims: List[DirectMessageChannel] = []
-        self.groups: List[PrivateChannel] = []
-        self.users: List[User] = []
+        self.channels: Directory[PublicChannel] = Directory()
+        self.ims: Directory[DirectMessageChannel] = Directory(
+            key=get_dm_user_id,
+        )
+        self.groups: Directory[PrivateChannel] = Directory()
+        self.users: Directory[User] = Directory()
         self.restart = False
         self.is_ready = False
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.scheduler = RateLimitScheduler()
+        self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self.rtm_message_ids = itertools.count(1)
+        self.rtm_replies: Dict[int, asyncio.Future] = {}
+        self.dropped_events: Counter[str] = collections.Counter()
+        self.warmup_tasks: Dict[str, asyncio.Task] = {}
+        self.warmed_up: Set[str] = set()
 
         self.config.check(
             self.box.config_required,
@@ -134,42 +225,24 @@ class Bot:
         def register(c: CronTask):
             logger.info(f'register {c}')
             lock = asyncio.Lock()
-            func_params = c.handler.params
-            kw: Dict[str, Any] = {}
-            if 'bot' in func_params:
-                kw['bot'] = self
 
             @aiocron.crontab(c.spec, tz=UTC9, *c.args, **c.kwargs)
             async def task():
                 if lock.locked() or not self.is_ready:
                     return
                 async with lock:
-                    if 'loop' in func_params:
-                        kw['loop'] = self.loop
-
-                    sess = make_session(bind=self.config.DATABASE_ENGINE)
-                    if 'sess' in func_params:
-                        kw['sess'] = sess
-
-                    if 'engine_config' in func_params:
-                        kw['engine_config'] = EngineConfig(
-                            url=self.config.DATABASE_URL,
-                            echo=self.config.DATABASE_ECHO,
-                        )
-
-                    logger.debug(f'hit and start to run {c}')
-                    try:
-                        await c.handler(**kw)
-                    except:  # noqa: E722
-                        logger.error(f'Error: {traceback.format_exc()}')
-                        await self.say(
-                            self.config.USERS['owner'],
-                            '*Traceback*\n```\n{}\n```\n'.format(
-                                traceback.format_exc(),
+                    with self.prepare_task_kwargs(c.handler) as kw:
+                        logger.debug(f'hit and start to run {c}')
+                        try:
+                            await c.handler(**kw)
+                        except:  # noqa: E722
+                            logger.error(f'Error: {traceback.format_exc()}')
+                            await self.say(
+                                self.config.USERS['owner'],
+                                '*Traceback*\n```\n{}\n```\n'.format(
+                                    traceback.format_exc(),
+                                )
                             )
-                        )
-                    finally:
-                        sess.close()
                     logger.debug(f'end {c}')
 
             c.start = task.start
@@ -178,6 +251,53 @@ class Bot:
         for c in self.box.tasks:
             register(c)
 
+    @contextlib.contextmanager
+    def prepare_task_kwargs(
+        self,
+        handler: Handler,
+    ) -> Iterator[Dict[str, Any]]:
+        """Make kwargs of cron and warmup task, and clean up after run."""
+
+        plan = get_injection_plan(self.box, handler)
+        ctx = InjectionContext(bot=self)
+        try:
+            yield plan.resolve(ctx, {})
+        finally:
+            ctx.close()
+
+    def start_warmups(self):
+        """Start warmup tasks of box in background.
+
+        Tasks which are still running from previous connection are not
+        started again.
+
+        """
+
+        for w in self.box.warmups:
+            task = self.warmup_tasks.get(w.name)
+            if task is None or task.done():
+                self.warmup_tasks[w.name] = self.loop.create_task(
+                    self.run_warmup(w),
+                )
+
+    async def run_warmup(self, w: WarmupTask):
+        logger = logging.getLogger(f'{__name__}.Bot.run_warmup')
+
+        logger.info(f'start {w}')
+        with self.prepare_task_kwargs(w.handler) as kw:
+            try:
+                await w.handler(**kw)
+            except:  # noqa: E722
+                logger.exception(f'Fail to warm up {w.name}')
+            else:
+                self.warmed_up.add(w.name)
+                logger.info(f'end {w}')
+
+    def is_warmed_up(self, name: str) -> bool:
+        """Check warmup task of given dataset succeeded at least once."""
+
+        return name in self.warmed_up
+
     def run(self):
         """Run"""
 
@@ -185,15 +305,18 @@ class Bot:
             loop = asyncio.get_event_loop()
             loop.set_debug(self.config.DEBUG)
             self.loop = loop
-            loop.run_until_complete(
-                asyncio.wait(
-                    (
-                        self.receive(),
-                        self.process(),
-                    ),
-                    return_when=asyncio.FIRST_EXCEPTION,
+            try:
+                loop.run_until_complete(
+                    asyncio.wait(
+                        (
+                            self.receive(),
+                            self.process(),
+                        ),
+                        return_when=asyncio.FIRST_EXCEPTION,
+                    )
                 )
-            )
+            finally:
+                loop.run_until_complete(self.close_session())
             loop.close()
 
     async def run_in_other_process(
@@ -225,29 +348,70 @@ class Bot:
         *,
         token: str = None,
     ) -> APIResponse:
-        """Call API methods."""
+        """Call API methods.
 
-        async with client_session() as session:
-            form = aiohttp.FormData(data or {})
-            form.add_field('token', token or self.config.TOKEN)
-            try:
-                async with session.post(
-                    'https://slack.com/api/{}'.format(method),
-                    data=form
-                ) as response:
-                    try:
-                        result = await response.json(loads=ujson.loads)
-                    except ContentTypeError:
-                        result = await response.text()
-                    return APIResponse(
-                        body=result,
-                        status=response.status,
-                        headers=response.headers,
-                    )
-            except ClientConnectorError:
-                raise APICallError('fail to call {} with {}'.format(
-                    method, data
-                ))
+        Calls are queued by :class:`RateLimitScheduler` to respect rate limit
+        of each method.
+
+        """
+
+        return await self.scheduler.run(
+            method,
+            data,
+            functools.partial(self._call, method, data, token=token),
+        )
+
+    async def _call(
+        self,
+        method: str,
+        data: Dict[str, str] = None,
+        *,
+        token: str = None,
+    ) -> APIResponse:
+        session = self.get_session()
+        form = aiohttp.FormData(data or {})
+        form.add_field('token', token or self.config.TOKEN)
+        try:
+            async with session.post(
+                self.api_url.format(method),
+                data=form
+            ) as response:
+                try:
+                    result = await response.json(loads=ujson.loads)
+                except ContentTypeError:
+                    result = await response.text()
+                return APIResponse(
+                    body=result,
+                    status=response.status,
+                    headers=response.headers,
+                )
+        except ClientConnectorError:
+            raise APICallError('fail to call {} with {}'.format(
+                method, data
+            ))
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get pooled session for calling API methods.
+
+        Session is created at first call and reused until it was closed.
+
+        """
+
+        if self.session is None or self.session.closed:
+            self.session = client_session(
+                connector=aiohttp.TCPConnector(
+                    limit=self.config.API_CONNECTION_LIMIT,
+                    ttl_dns_cache=self.config.API_DNS_CACHE_TTL,
+                ),
+            )
+        return self.session
+
+    async def close_session(self):
+        """Close pooled session and its connections."""
+
+        if self.session is not None:
+            session, self.session = self.session, None
+            await session.close()
 
     async def say(
         self,
@@ -259,6 +423,15 @@ class Bot:
     ) -> APIResponse:
         """Shortcut for bot saying."""
 
+        if self.config.RTM_FAST_REPLY and can_send_by_rtm(
+            channel,
+            text,
+            kwargs,
+        ) and self.ws is not None:
+            resp = await self.send_by_rtm(channel, text, **kwargs)
+            if resp is not None:
+                return resp
+
         coro = self.api.chat.postMessage(
             channel,
             text,
@@ -270,6 +443,97 @@ class Bot:
             return await retry(coro)
         return await coro
 
+    async def send_by_rtm(
+        self,
+        channel: Union[Channel, ChannelID],
+        text: str,
+        *,
+        thread_ts: Ts = None,
+    ) -> Optional[APIResponse]:
+        """Send plain text message via RTM websocket.
+
+        Return :const:`None` if message was not sent, so caller can fallback
+        to Web API.
+
+        """
+
+        logger = logging.getLogger(f'{__name__}.Bot.send_by_rtm')
+
+        if self.ws is None:
+            return None
+
+        if isinstance(channel, Channel):
+            channel_id = channel.id
+        else:
+            channel_id = channel
+
+        message_id = next(self.rtm_message_ids)
+        payload: Dict[str, Any] = {
+            'id': message_id,
+            'type': 'message',
+            'channel': channel_id,
+            'text': text,
+        }
+        if thread_ts is not None:
+            payload['thread_ts'] = thread_ts
+
+        reply = self.rtm_replies[message_id] = self.loop.create_future()
+        try:
+            try:
+                await self.ws.send_str(ujson.dumps(payload))
+            except Exception as e:
+                logger.warning(f'fail to send message via RTM: {e}')
+                return None
+
+            try:
+                async with async_timeout.timeout(RTM_REPLY_TIMEOUT):
+                    data = await reply
+            except (asyncio.TimeoutError, ConnectionError):
+                # message may be sent already, so do not fallback
+                return APIResponse(
+                    body={'ok': False, 'error': 'rtm_reply_timeout'},
+                    status=200,
+                    headers={},
+                )
+        finally:
+            self.rtm_replies.pop(message_id, None)
+
+        if not data.get('ok'):
+            logger.warning(f'RTM rejected message: {data.get("error")}')
+            return None
+
+        return APIResponse(
+            body={
+                'ok': True,
+                'channel': channel_id,
+                'ts': data.get('ts'),
+                'message': {
+                    'type': 'message',
+                    'text': data.get('text', text),
+                    'ts': data.get('ts'),
+                },
+            },
+            status=200,
+            headers={},
+        )
+
+    def resolve_rtm_reply(self, data: Dict[str, Any]):
+        """Pass reply of RTM message to its sender."""
+
+        reply = self.rtm_replies.get(data['reply_to'])
+        if reply is not None and not reply.done():
+            reply.set_result(data)
+
+    def abort_rtm_replies(self):
+        """Abort every RTM message which is waiting for its reply."""
+
+        for reply in self.rtm_replies.values():
+            if not reply.done():
+                reply.set_exception(
+                    ConnectionError('RTM websocket was closed'),
+                )
+        self.rtm_replies.clear()
+
     async def process(self):
         """Process messages."""
 
@@ -300,16 +564,89 @@ class Bot:
                 )
                 return False
 
-        while True:
-            event = await self.queue.get()
-
-            logger.info(event)
+        async def dispatch(event, apps):
+            # repr of event converts every lazy field of it
+            logger.debug(event)
 
-            for handler in self.box.apps:
+            for handler in apps:
                 result = await handle(handler, event)
                 if not result:
                     break
 
+        async def consume(key):
+            events = lanes[key]
+            try:
+                while events:
+                    event, apps = events.popleft()
+                    async with semaphore:
+                        try:
+                            await dispatch(event, apps)
+                        except asyncio.CancelledError:
+                            raise
+                        except Exception:
+                            # keep lane alive for events queued after it
+                            logger.exception(
+                                f'Fail to dispatch {type(event).__name__}'
+                            )
+            finally:
+                del lanes[key]
+
+        semaphore = asyncio.Semaphore(self.config.DISPATCH_CONCURRENCY)
+        lanes: Dict[
+            Optional[str],
+            Deque[Tuple[BaseEvent, List[BaseApp]]],
+        ] = {}
+
+        while True:
+            event = await self.queue.get()
+
+            try:
+                apps = self.box.get_apps(event, self.config.PREFIX)
+                if not apps:
+                    continue
+                key = get_event_channel_id(event)
+            except Exception:
+                logger.exception(f'Can not route {type(event).__name__}')
+                continue
+
+            if key in lanes:
+                lanes[key].append((event, apps))
+            else:
+                lanes[key] = collections.deque([(event, apps)])
+                self.loop.create_task(consume(key))
+
+    def decode_frame(self, text: str) -> Optional[BaseEvent]:
+        """Make event from text frame of RTM websocket.
+
+        Frames of event types which no app handles are dropped before full
+        decoding and counted in :attr:`dropped_events`. Replies of messages
+        sent via RTM resolve their waiters and make no event.
+
+        """
+
+        type_ = peek_event_type(text)
+        if type_ is not None and not self.box.subscribes(type_):
+            self.dropped_events[type_] += 1
+            return None
+
+        data = ujson.loads(text)
+        if 'reply_to' in data:
+            self.resolve_rtm_reply(data)
+            return None
+
+        type_ = data.get('type')
+        if not self.box.subscribes(type_):
+            self.dropped_events[str(type_)] += 1
+            return None
+
+        event = create_event(data)
+        # convert fields which routing reads here, so receive logs and skips
+        # frame which has bad value of them
+        get_event_channel_id(event)
+        if isinstance(event, Message):
+            split_call(event)
+        return event
+
     async def receive(self):
         """Receive stream from slack."""
 
@@ -335,12 +672,15 @@ class Bot:
 
             await self.queue.put(create_event({
                 'type': 'chatterbox_system_start',
+                'rtm': rtm.body,
             }))
+            self.start_warmups()
             while not self.is_ready:
                 await asyncio.sleep(0.01)
             try:
                 async with client_session() as session:
                     async with session.ws_connect(rtm.body['url']) as ws:
+                        self.ws = ws
                         while True:
                             if self.restart:
                                 self.restart = False
@@ -360,13 +700,12 @@ class Bot:
 
                             if msg.type == aiohttp.WSMsgType.TEXT:
                                 try:
-                                    event = create_event(
-                                        msg.json(loads=ujson.loads)
-                                    )
+                                    event = self.decode_frame(msg.data)
                                 except:  # noqa: F722
                                     logger.exception(msg.data)
                                 else:
-                                    await self.queue.put(event)
+                                    if event is not None:
+                                        await self.queue.put(event)
                             elif msg.type in (aiohttp.WSMsgType.CLOSE,
                                               aiohttp.WSMsgType.CLOSED,
                                               aiohttp.WSMsgType.CLOSING):
@@ -389,3 +728,6 @@ class Bot:
             except:  # noqa
                 logger.exception('Unexpected Exception raised')
                 continue
+            finally:
+                self.ws = None
+                self.abort_rtm_replies()
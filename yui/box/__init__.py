@@ -1,11 +1,14 @@
 from ._box import Box
 from .apps import App, BaseApp, route
+from .injection import InjectionContext, get_injection_plan
 from .parsers import KWARGS_DICT, parse_option_and_arguments
-from .tasks import CronTask
+from .tasks import CronTask, WarmupTask
 from .utils import (
     CONTAINER,
     SPACE_RE,
     is_container,
+    split_call,
+    tokenize,
 )
 
 # (:class:`Box`) Default Box instance
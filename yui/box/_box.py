@@ -1,14 +1,40 @@
-from typing import Any, Dict, List, Optional, Set, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+import attr
 
 from .apps.base import BaseApp
 from .apps.basic import App
-from .tasks import CronTask
+from .injection import DEFAULT_PROVIDERS, PROVIDER_TYPE
+from .tasks import CronTask, WarmupTask
+from .utils import split_call
 from ..command.validators import VALIDATOR_TYPE
-from ..event import Event
+from ..event import BaseEvent, Event, Message
 from ..types.handler import DECORATOR_ARGS_TYPE, DECORATOR_TYPE, Handler
 from ..utils.handler import get_handler
 
 
+EVENT_KEY = Tuple[Optional[str], Optional[str]]
+
+
+@attr.dataclass(slots=True)
+class EventRoute:
+    """Apps which accept one type and subtype of event."""
+
+    apps: List[BaseApp]
+    plain_apps: List[BaseApp]
+    commands: Dict[str, List[BaseApp]]
+
+
 class Box:
     """Box, collection of apps and tasks"""
 
@@ -22,11 +48,72 @@ class Box:
         self.users_required: Set[str] = set()
         self.apps: List[BaseApp] = []
         self.tasks: List[CronTask] = []
+        self.warmups: List[WarmupTask] = []
+        self.providers: Dict[str, PROVIDER_TYPE] = dict(DEFAULT_PROVIDERS)
+        self.providers_version = 0
+        self._routes: Dict[EVENT_KEY, EventRoute] = {}
+        self._subscribed: Dict[Optional[str], bool] = {}
 
     def register(self, app: BaseApp):
         """Register App manually."""
 
         self.apps.append(app)
+        self._routes.clear()
+        self._subscribed.clear()
+
+    def subscribes(self, type_: Optional[str]) -> bool:
+        """Check any app want to receive given type of event."""
+
+        try:
+            return self._subscribed[type_]
+        except KeyError:
+            result = self._subscribed[type_] = any(
+                app.accepts_type(type_) for app in self.apps
+            )
+            return result
+
+    def build_route(self, type_: str, subtype: Optional[str]) -> EventRoute:
+        """Build route of apps which accept given type and subtype of event.
+
+        Each command entry contains apps which want to handle that command,
+        and apps which handle every message, in registration order.
+
+        """
+
+        apps = [app for app in self.apps if app.accepts(type_, subtype)]
+        named: Dict[str, Set[int]] = {}
+        for app in apps:
+            if app.is_command:
+                for name in app.names:  # type: ignore
+                    named.setdefault(name, set()).add(id(app))
+
+        return EventRoute(
+            apps=apps,
+            plain_apps=[app for app in apps if not app.is_command],
+            commands={
+                name: [
+                    app for app in apps
+                    if not app.is_command or id(app) in ids
+                ] for name, ids in named.items()
+            },
+        )
+
+    def get_apps(self, event: BaseEvent, prefix: str) -> List[BaseApp]:
+        """Get apps which want to handle given event, in registration order."""
+
+        key = getattr(event, 'type', None), getattr(event, 'subtype', None)
+        try:
+            route = self._routes[key]
+        except KeyError:
+            route = self._routes[key] = self.build_route(*key)
+
+        if not route.commands or not isinstance(event, Message):
+            return route.apps
+
+        call, _ = split_call(event)
+        if call.startswith(prefix):
+            return route.commands.get(call[len(prefix):], route.plain_apps)
+        return route.plain_apps
 
     def assert_config_required(self, key: str, type_):
         """Mark required configuration key and type."""
@@ -69,7 +156,7 @@ class Box:
         def decorator(target: DECORATOR_ARGS_TYPE) -> Handler:
             handler = get_handler(target)
 
-            self.apps.append(App(
+            self.register(App(
                 'message',
                 subtype,
                 handler,
@@ -103,7 +190,7 @@ class Box:
         def decorator(target: DECORATOR_ARGS_TYPE) -> Handler:
             handler = get_handler(target)
 
-            self.apps.append(App(
+            self.register(App(
                 event_type,
                 subtype,
                 handler,
@@ -120,3 +207,32 @@ class Box:
         c = CronTask(self, spec, args, kwargs)
         self.tasks.append(c)
         return c
+
+    def warmup(self, name: str) -> WarmupTask:
+        """Decorator for task which prepares dataset in background.
+
+        Bot starts warmup tasks whenever it connects to Slack, without
+        blocking events. Use :meth:`yui.bot.Bot.is_warmed_up` to check
+        given dataset is ready.
+
+        """
+
+        w = WarmupTask(self, name)
+        self.warmups.append(w)
+        return w
+
+    def provide(self, name: str) -> Callable[[PROVIDER_TYPE], PROVIDER_TYPE]:
+        """Decorator for provider of handler parameter with given name.
+
+        Provider takes :class:`yui.box.injection.InjectionContext` and
+        returns value. It is called whenever handler which has that
+        parameter runs, such as to share HTTP session or cache handle.
+
+        """
+
+        def decorator(func: PROVIDER_TYPE) -> PROVIDER_TYPE:
+            self.providers[name] = func
+            self.providers_version += 1
+            return func
+
+        return decorator
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 import contextlib
-import inspect
-from typing import Mapping, TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
+from ..injection import InjectionContext, get_injection_plan
 from ...event import Event
-from ...orm import EngineConfig, make_session
+from ...types.handler import Handler
 
 if TYPE_CHECKING:
     from ...bot import Bot
@@ -14,6 +14,9 @@ if TYPE_CHECKING:
 class BaseApp:
     """Base class of App"""
 
+    #: Command apps only handle messages which call one of its names.
+    is_command: bool = False
+
     def get_short_help(self, prefix: str) -> str:
         raise NotImplementedError
 
@@ -36,6 +39,16 @@ class BaseApp:
             return False
         return True
 
+    def accepts(self, type_: Optional[str], subtype: Optional[str]) -> bool:
+        """Check this app want to receive given type and subtype of event."""
+
+        return True
+
+    def accepts_type(self, type_: Optional[str]) -> bool:
+        """Check this app want to receive given type of event at all."""
+
+        return True
+
     async def run(self, bot: Bot, event: Event):
         raise NotImplementedError
 
@@ -45,27 +58,12 @@ class BaseApp:
         *,
         bot: Bot,
         event: Event,
-        func_params: Mapping[str, inspect.Parameter],
+        handler: Handler,
         **kwargs,
     ):
-        sess = make_session(bind=bot.config.DATABASE_ENGINE)
-        if 'self' in func_params:
-            kwargs['_self'] = self
-        if 'bot' in func_params:
-            kwargs['bot'] = bot
-        if 'loop' in func_params:
-            kwargs['loop'] = bot.loop
-        if 'event' in func_params:
-            kwargs['event'] = event
-        if 'sess' in func_params:
-            kwargs['sess'] = sess
-        if 'engine_config' in func_params:
-            kwargs['engine_config'] = EngineConfig(
-                url=bot.config.DATABASE_URL,
-                echo=bot.config.DATABASE_ECHO,
-            )
-
+        plan = get_injection_plan(bot.box, handler)
+        ctx = InjectionContext(bot=bot, app=self, event=event)
         try:
-            yield kwargs
+            yield plan.resolve(ctx, kwargs)
         finally:
-            sess.close()
+            ctx.close()
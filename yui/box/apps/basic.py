@@ -2,12 +2,11 @@ from __future__ import annotations
 
 import html
 import inspect
-import shlex
 from typing import List, Optional, TYPE_CHECKING
 
 from .base import BaseApp
 from ..parsers import parse_option_and_arguments
-from ..utils import SPACE_RE
+from ..utils import split_call, tokenize
 from ...command.validators import VALIDATOR_TYPE
 from ...event import Event, Message
 from ...types.handler import Handler
@@ -86,6 +85,12 @@ class App(BaseApp):
             help += '\n\n' + self.help.format(PREFIX=prefix)
         return help
 
+    def accepts(self, type_: Optional[str], subtype: Optional[str]) -> bool:
+        return type_ == self.type and subtype == self.subtype
+
+    def accepts_type(self, type_: Optional[str]) -> bool:
+        return type_ == self.type
+
     async def run(self, bot: Bot, event: Event):
         if event.type == self.type and event.subtype == self.subtype:
             if isinstance(event, Message):
@@ -103,7 +108,7 @@ class App(BaseApp):
             with self.prepare_kwargs(
                 bot=bot,
                 event=event,
-                func_params=self.handler.params,
+                handler=self.handler,
             ) as kwargs:
                 res = await self.handler(**kwargs)
 
@@ -111,18 +116,7 @@ class App(BaseApp):
 
     async def _run_message_event(self, bot: Bot, event: Message):
         res: Optional[bool] = True
-        call = ''
-        args = ''
-        if event.text:
-            try:
-                call, args = SPACE_RE.split(event.text, 1)
-            except ValueError:
-                call = event.text
-        elif event.message and event.message.text:
-            try:
-                call, args = SPACE_RE.split(event.message.text, 1)
-            except ValueError:
-                call = event.message.text
+        call, args = split_call(event)
 
         raw = html.unescape(args)
 
@@ -136,7 +130,7 @@ class App(BaseApp):
             func_params = self.handler.params
             if self.use_shlex:
                 try:
-                    chunks = shlex.split(raw)
+                    chunks = tokenize(raw)
                 except ValueError:
                     await bot.say(
                         event.channel,
@@ -174,7 +168,7 @@ class App(BaseApp):
                 with self.prepare_kwargs(
                     bot=bot,
                     event=event,
-                    func_params=func_params,
+                    handler=self.handler,
                     **kw,
                 ) as kwargs:
                     res = await self.handler(**kwargs)
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
 import html
-import shlex
-from typing import List, Optional, TYPE_CHECKING, Union
+from typing import Dict, List, Optional, TYPE_CHECKING, Union
 
 from .base import BaseApp
 from ..parsers import parse_option_and_arguments
-from ..utils import SPACE_RE
+from ..utils import SPACE_RE, split_call, tokenize
 from ...event import Event, Message
 from ...types.handler import HANDLER_CALL_TYPE, Handler
 from ...utils.handler import get_handler
@@ -35,8 +34,10 @@ class Route:
 class RouteApp(BaseApp):
 
     use_shlex: bool = True
+    is_command: bool = True
     name: str
     route_list: List[Route] = []
+    _route_index: Optional[Dict[Optional[str], Dict[str, Handler]]] = None
 
     def get_short_help(self, prefix: str) -> str:
         raise NotImplementedError
@@ -51,50 +52,48 @@ class RouteApp(BaseApp):
     async def fallback(self, bot: Bot, event: Message):
         pass
 
+    def get_route_index(self) -> Dict[Optional[str], Dict[str, Handler]]:
+        """Get handlers of routes grouped by subtype and route name."""
+
+        if self._route_index is None:
+            index: Dict[Optional[str], Dict[str, Handler]] = {}
+            for c in self.route_list:
+                routes = index.setdefault(c.subtype, {})
+                if c.name is not None and c.name not in routes:
+                    routes[c.name] = c.handler
+            self._route_index = index
+        return self._route_index
+
+    def accepts(self, type_: Optional[str], subtype: Optional[str]) -> bool:
+        return type_ == Message.type
+
+    def accepts_type(self, type_: Optional[str]) -> bool:
+        return type_ == Message.type
+
     async def run(self, bot: Bot, event: Event):
         if not isinstance(event, Message):
             return True
 
-        root_args = ''
-        root_call = ''
         args = ''
         handler = None
-        if event.text:
-            try:
-                root_call, root_args = SPACE_RE.split(event.text, 1)
-            except ValueError:
-                root_call = event.text
-        elif event.message and event.message.text:
-            try:
-                root_call, root_args = SPACE_RE.split(event.message.text, 1)
-            except ValueError:
-                root_call = event.message.text
+        root_call, root_args = split_call(event)
 
         if root_call == bot.config.PREFIX + self.name:
-            for c in self.route_list:
-                if c.subtype == event.subtype:
-                    if root_args is None:
-                        if c.name is None:
-                            handler = c.handler
-                            break
-                    else:
-                        try:
-                            call, args = SPACE_RE.split(root_args, 1)
-                        except ValueError:
-                            call = root_args
-
-                        if c.name == call:
-                            handler = c.handler
-                            break
-            else:
+            routes = self.get_route_index().get(event.subtype)
+            if routes is not None:
+                try:
+                    call, args = SPACE_RE.split(root_args, 1)
+                except ValueError:
+                    call = root_args
+                handler = routes.get(call)
+            if handler is None:
                 handler = Handler(self.fallback)
 
         if handler:
             raw = html.unescape(args)
-            func_params = handler.params
             if self.use_shlex:
                 try:
-                    chunks = shlex.split(raw)
+                    chunks = tokenize(raw)
                 except ValueError:
                     await bot.say(
                         event.channel,
@@ -115,7 +114,7 @@ class RouteApp(BaseApp):
             with self.prepare_kwargs(
                 bot=bot,
                 event=event,
-                func_params=func_params,
+                handler=handler,
                 **kw,
             ) as kwargs:
                 return await handler(**kwargs)
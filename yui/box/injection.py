@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import functools
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+)
+
+import attr
+
+from sqlalchemy.orm import Session
+
+from ..orm import EngineConfig, make_session
+from ..types.handler import Handler
+
+if TYPE_CHECKING:
+    from ._box import Box
+    from .apps.base import BaseApp
+    from ..bot import Bot
+    from ..event import Event
+
+PROVIDER_TYPE = Callable[['InjectionContext'], Any]
+
+
+@attr.dataclass(slots=True)
+class InjectionContext:
+    """Values which providers use to make arguments of handler."""
+
+    bot: Bot
+    app: Optional[BaseApp] = None
+    event: Optional[Event] = None
+    _sess: Optional[Session] = attr.ib(init=False, default=None)
+
+    @property
+    def sess(self) -> Session:
+        """Database session. It is made at first access."""
+
+        if self._sess is None:
+            self._sess = make_session(bind=self.bot.config.DATABASE_ENGINE)
+        return self._sess
+
+    def close(self):
+        if self._sess is not None:
+            self._sess.close()
+            self._sess = None
+
+
+@functools.lru_cache()
+def make_engine_config(url: str, echo: bool) -> EngineConfig:
+    return EngineConfig(url=url, echo=echo)
+
+
+def provide_self(ctx: InjectionContext):
+    return ctx.app
+
+
+def provide_bot(ctx: InjectionContext):
+    return ctx.bot
+
+
+def provide_loop(ctx: InjectionContext):
+    return ctx.bot.loop
+
+
+def provide_event(ctx: InjectionContext):
+    return ctx.event
+
+
+def provide_sess(ctx: InjectionContext):
+    return ctx.sess
+
+
+def provide_engine_config(ctx: InjectionContext):
+    return make_engine_config(
+        ctx.bot.config.DATABASE_URL,
+        ctx.bot.config.DATABASE_ECHO,
+    )
+
+
+#: Providers which every box has. Keys are names of handler parameters.
+DEFAULT_PROVIDERS: Dict[str, PROVIDER_TYPE] = {
+    'self': provide_self,
+    'bot': provide_bot,
+    'loop': provide_loop,
+    'event': provide_event,
+    'sess': provide_sess,
+    'engine_config': provide_engine_config,
+}
+
+#: :class:`Handler` takes app as ``_self`` to avoid collision.
+KWARG_NAMES = {'self': '_self'}
+
+
+@attr.dataclass(slots=True)
+class InjectionPlan:
+    """Providers of parameters which handler really has."""
+
+    steps: List[Tuple[str, PROVIDER_TYPE]]
+    providers: Mapping[str, PROVIDER_TYPE]
+    version: int
+
+    def resolve(
+        self,
+        ctx: InjectionContext,
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        for key, provider in self.steps:
+            kwargs[key] = provider(ctx)
+        return kwargs
+
+
+def compile_injection_plan(
+    handler: Handler,
+    providers: Mapping[str, PROVIDER_TYPE],
+    version: int = 0,
+) -> InjectionPlan:
+    """Pick providers of parameters which handler has."""
+
+    return InjectionPlan(
+        steps=[
+            (KWARG_NAMES.get(name, name), providers[name])
+            for name in handler.params
+            if name in providers
+        ],
+        providers=providers,
+        version=version,
+    )
+
+
+def get_injection_plan(box: Box, handler: Handler) -> InjectionPlan:
+    """Get plan of handler with providers of box.
+
+    Plan is kept in handler, and compiled again when box gets new provider.
+
+    """
+
+    plan: Optional[InjectionPlan] = handler.injection_plan
+    if (
+        plan is None or
+        plan.providers is not box.providers or
+        plan.version != box.providers_version
+    ):
+        plan = handler.injection_plan = compile_injection_plan(
+            handler,
+            box.providers,
+            box.providers_version,
+        )
+    return plan
@@ -1,136 +1,222 @@
+import functools
 import inspect
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import attr
 
 from .utils import is_container
-from ..types.handler import Handler
-from ..utils.cast import cast
+from ..types.handler import Argument, Handler, Option
+from ..utils.cast import KNOWN_TYPES, cast
 
 KWARGS_DICT = Dict[str, Any]
 
 
-def parse_option_and_arguments(
-    handler: Handler,
-    chunks: List[str],
-) -> Tuple[KWARGS_DICT, List[str]]:
-    end = False
+@attr.dataclass(slots=True)
+class OptionSlot:
+    """Option with its resolved caster."""
 
-    result: KWARGS_DICT = {}
-    options = handler.options
-    arguments = handler.arguments
+    option: Option
+    caster: Callable[[Any], Any]
 
-    for o in options:
-        if o.type_ is None:
-            type_ = handler.params[o.dest].annotation
 
-            if type_ == inspect._empty:  # type: ignore
-                type_ = str
-            else:
-                if o.transform_func:
-                    type_ = str
+@attr.dataclass(slots=True)
+class ArgumentSlot:
+    """Argument with its resolved caster."""
+
+    argument: Argument
+    caster: Callable[[Any], Any]
+    #: sum of nargs of this and following arguments
+    rest_nargs: int
+
+
+@attr.dataclass(slots=True)
+class ParserPlan:
+    """Options and arguments of handler compiled once for parsing."""
+
+    options: Dict[str, OptionSlot]
+    arguments: List[ArgumentSlot]
+    defaults: KWARGS_DICT
+    multiple: List[str]
+    factories: List[Tuple[str, Callable[[], Any]]]
+    required: Dict[str, Option]
+
+
+def get_caster(type_) -> Callable[[Any], Any]:
+    """Resolve caster of given type.
+
+    Known types cast string by themselves as :func:`yui.utils.cast.cast`
+    does, so they skip scanning casters.
+
+    """
+
+    if type_ is bool or type_ in KNOWN_TYPES:
+        return type_
+    return functools.partial(cast, type_)
 
-            o.type_ = type_
 
-    for a in arguments:
-        if a.type_ is None:
-            type_ = handler.params[a.dest].annotation
+def resolve_type(handler: Handler, slot) -> bool:
+    """Fill type of option or argument from annotation if it is not given."""
 
-            if type_ == inspect._empty:  # type: ignore
+    if slot.type_ is None:
+        type_ = handler.params[slot.dest].annotation
+
+        if type_ == inspect._empty:  # type: ignore
+            type_ = str
+        else:
+            if slot.transform_func:
                 type_ = str
-            else:
-                if a.transform_func:
-                    type_ = str
 
-            a.type_ = type_
-            if is_container(a.type_):
-                a.container_cls = None
-                a.typing_has_container = True
+        slot.type_ = type_
+        return True
+    return False
 
-    required = {o.dest for o in options if o.required}
 
-    for option in options:
-        if option.multiple:
-            result[option.dest] = []
+def compile_parser_plan(handler: Handler) -> ParserPlan:
+    """Compile options and arguments of handler into :class:`ParserPlan`."""
+
+    options: Dict[str, OptionSlot] = {}
+    defaults: KWARGS_DICT = {}
+    multiple: Dict[str, bool] = {}
+    factories: Dict[str, Callable[[], Any]] = {}
+    required: Dict[str, Option] = {}
+
+    for o in handler.options:
+        resolve_type(handler, o)
+        options.setdefault(o.name, OptionSlot(o, get_caster(o.type_)))
+        if o.required:
+            required.setdefault(o.dest, o)
+
+        # later option wins for same dest, as assigning one by one does
+        defaults.pop(o.dest, None)
+        multiple.pop(o.dest, None)
+        factories.pop(o.dest, None)
+        if o.multiple:
+            multiple[o.dest] = True
+        elif callable(o.default):
+            factories[o.dest] = o.default
         else:
-            if callable(option.default):
-                result[option.dest] = option.default()
-            else:
-                result[option.dest] = option.default
+            defaults[o.dest] = o.default
 
-    while not end and chunks:
-        for option in options:
-            name = chunks.pop(0)
-            if name.startswith(option.name + '='):
-                name, new_chunk = name.split('=', 1)
-                chunks.insert(0, new_chunk)
+    arguments: List[ArgumentSlot] = []
+    rest_nargs = sum(a.nargs for a in handler.arguments)
+    for a in handler.arguments:
+        if resolve_type(handler, a) and is_container(a.type_):
+            a.container_cls = None
+            a.typing_has_container = True
+        arguments.append(ArgumentSlot(a, get_caster(a.type_), rest_nargs))
+        rest_nargs -= a.nargs
 
-            if name == option.name:
-                if option.dest in required:
-                    required.remove(option.dest)
+    return ParserPlan(
+        options=options,
+        arguments=arguments,
+        defaults=defaults,
+        multiple=list(multiple),
+        factories=list(factories.items()),
+        required=required,
+    )
 
-                if option.nargs == 0:
-                    result[option.dest] = option.value
-                    break
 
-                length = len(chunks)
+def get_parser_plan(handler: Handler) -> ParserPlan:
+    """Get plan of handler. It is compiled at first call."""
+
+    plan: Optional[ParserPlan] = handler.parser_plan
+    if plan is None:
+        plan = handler.parser_plan = compile_parser_plan(handler)
+    return plan
+
+
+def parse_option_and_arguments(
+    handler: Handler,
+    chunks: List[str],
+) -> Tuple[KWARGS_DICT, List[str]]:
+    plan = get_parser_plan(handler)
+    chunks = list(chunks)
+    pos = 0
+    end = len(chunks)
+
+    result: KWARGS_DICT = dict(plan.defaults)
+    for dest in plan.multiple:
+        result[dest] = []
+    for dest, factory in plan.factories:
+        result[dest] = factory()
+
+    required = set(plan.required)
+    options = plan.options
+
+    while pos < end:
+        head = chunks[pos]
+        slot = options.get(head)
+        if slot is not None:
+            pos += 1
+        elif '=' in head:
+            name, new_chunk = head.split('=', 1)
+            slot = options.get(name)
+            if slot is None:
+                break
+            chunks[pos] = new_chunk
+        else:
+            break
+
+        option = slot.option
+        required.discard(option.dest)
+
+        if option.nargs == 0:
+            result[option.dest] = option.value
+            continue
+
+        length = end - pos
+        if length < option.nargs:
+            raise SyntaxError(
+                option.count_error.format(
+                    name=option.name,
+                    expected=option.nargs,
+                    given=length,
+                )
+            )
+        args = chunks[pos:pos + option.nargs]
+        pos += option.nargs
+        try:
+            if option.container_cls:
+                if option.multiple:
+                    r = slot.caster(args)
+                else:
+                    r = option.container_cls(slot.caster(x) for x in args)
+            else:
+                r = slot.caster(args[0])
+        except ValueError as e:
+            raise SyntaxError(
+                option.type_error.format(name=option.name, e=e)
+            )
+
+        if option.transform_func:
+            if option.container_cls:
                 try:
-                    args = [chunks.pop(0) for _ in range(option.nargs)]
-                except IndexError:
+                    r = option.container_cls(
+                        option.transform_func(x)
+                        for x in r
+                    )
+                except ValueError as e:
                     raise SyntaxError(
-                        option.count_error.format(
+                        option.transform_error.format(
                             name=option.name,
-                            expected=option.nargs,
-                            given=length,
+                            e=e,
                         )
                     )
+            else:
                 try:
-                    if option.container_cls:
-                        if option.multiple:
-                            r = cast(option.type_, args)
-                        else:
-                            r = option.container_cls(
-                                cast(option.type_, x) for x in args
-                            )
-                    else:
-                        r = cast(option.type_, args[0])
+                    r = option.transform_func(r)
                 except ValueError as e:
                     raise SyntaxError(
-                        option.type_error.format(name=option.name, e=e)
+                        option.transform_error.format(
+                            name=option.name,
+                            e=e,
+                        )
                     )
 
-                if option.transform_func:
-                    if option.container_cls:
-                        try:
-                            r = option.container_cls(
-                                option.transform_func(x)
-                                for x in r
-                            )
-                        except ValueError as e:
-                            raise SyntaxError(
-                                option.transform_error.format(
-                                    name=option.name,
-                                    e=e,
-                                )
-                            )
-                    else:
-                        try:
-                            r = option.transform_func(r)
-                        except ValueError as e:
-                            raise SyntaxError(
-                                option.transform_error.format(
-                                    name=option.name,
-                                    e=e,
-                                )
-                            )
-
-                if option.multiple:
-                    result[option.dest].append(r[0])
-                else:
-                    result[option.dest] = r
-
-                break
-            chunks.insert(0, name)
+        if option.multiple:
+            result[option.dest].append(r[0])
         else:
-            end = True
+            result[option.dest] = r
 
     if required:
         raise SyntaxError(
@@ -138,16 +224,14 @@ def parse_option_and_arguments(
                 name=o.name,
                 expected=o.nargs,
                 given=0,
-            ) for o in (
-                list(filter(lambda x: x.dest == o, options))[0]
-                for o in required
-            ))
+            ) for dest, o in plan.required.items() if dest in required)
         )
 
-    for i, argument in enumerate(arguments):
+    for arg_slot in plan.arguments:
+        argument = arg_slot.argument
         length = argument.nargs
         if argument.nargs < 0:
-            length = len(chunks) - sum(a.nargs for a in arguments[i:]) - 1
+            length = end - pos - arg_slot.rest_nargs - 1
 
         if length < 1:
             raise SyntaxError(argument.count_error.format(
@@ -155,25 +239,26 @@ def parse_option_and_arguments(
                 expected='>0',
                 given=0,
             ))
-        if length <= len(chunks):
-            args = [chunks.pop(0) for _ in range(length)]
+        if length <= end - pos:
+            args = chunks[pos:pos + length]
+            pos += length
         else:
             raise SyntaxError(argument.count_error.format(
                 name=argument.name,
                 expected=argument.nargs,
-                given=len(chunks),
+                given=end - pos,
             ))
         try:
             if argument.concat:
                 r = ' '.join(args)
             elif argument.container_cls:
                 r = argument.container_cls(
-                    cast(argument.type_, x) for x in args
+                    arg_slot.caster(x) for x in args
                 )
             elif argument.typing_has_container:
-                r = cast(argument.type_, args)
+                r = arg_slot.caster(args)
             else:
-                r = cast(argument.type_, args[0])
+                r = arg_slot.caster(args[0])
         except ValueError as e:
             raise SyntaxError(
                 argument.type_error.format(
@@ -206,4 +291,4 @@ def parse_option_and_arguments(
         if r is not None:
             result[argument.dest] = r
 
-    return result, chunks
+    return result, chunks[pos:]
@@ -44,3 +44,32 @@ class CronTask:
             f'func={self.handler.f.__module__}.{self.handler.f.__name__}'
             ')'
         )
+
+
+class WarmupTask:
+    """Background task which prepares one dataset after connecting."""
+
+    handler: Handler
+
+    def __init__(self, box: Box, name: str) -> None:
+        """Initialize."""
+
+        self.box = box
+        self.name = name
+
+    def __call__(self, target: DECORATOR_ARGS_TYPE) -> Handler:
+        """Use as decorator"""
+
+        handler = get_handler(target)
+
+        self.handler = handler
+
+        return handler
+
+    def __str__(self) -> str:
+        return (
+            'WarmupTask('
+            f'name={self.name!r}, '
+            f'func={self.handler.f.__module__}.{self.handler.f.__name__}'
+            ')'
+        )
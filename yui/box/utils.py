@@ -1,7 +1,27 @@
 import re
+import shlex
+from typing import List, TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    from ..event import Message
 
 SPACE_RE = re.compile(r'\s+')
 
+#: :mod:`shlex` splits only by space, tab, CR and LF
+SHLEX_WORD_RE = re.compile(r'[^ \t\r\n]+')
+SHLEX_SPECIAL_RE = re.compile(r'[\'"\\]')
+SHLEX_TOKEN_RE = re.compile(
+    r'''
+    (?P<space>[ \t\r\n]+)
+    |(?P<word>[^ \t\r\n'"\\]+)
+    |'(?P<single>[^']*)'
+    |"(?P<double>[^"\\]*(?:\\.[^"\\]*)*)"
+    |\\(?P<escaped>.)
+    ''',
+    re.VERBOSE | re.DOTALL,
+)
+SHLEX_DOUBLE_ESCAPE_RE = re.compile(r'\\([\\"])')
+
 CONTAINER = (set, tuple, list)
 
 
@@ -12,3 +32,78 @@ def is_container(t) -> bool:
         return t.__origin__ in CONTAINER
 
     return t in CONTAINER
+
+
+def split_call(event: 'Message') -> Tuple[str, str]:
+    """Split text of message into command call and its arguments.
+
+    Result is cached in given event, so every app shares one tokenizing.
+
+    """
+
+    try:
+        return event.__dict__['_call']
+    except KeyError:
+        pass
+
+    call = ''
+    args = ''
+    if event.text:
+        text = event.text
+    elif event.message and event.message.text:
+        text = event.message.text
+    else:
+        text = ''
+
+    if text:
+        try:
+            call, args = SPACE_RE.split(text, 1)
+        except ValueError:
+            call = text
+
+    event.__dict__['_call'] = call, args
+    return call, args
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into chunks like :func:`shlex.split` does, but faster.
+
+    Text without quote or backslash is split by regex in one step. Other
+    text is scanned by quoted segments instead of characters. If text is
+    not well-formed, such as unclosed quote, it falls back to
+    :func:`shlex.split` for same result and error.
+
+    """
+
+    if not SHLEX_SPECIAL_RE.search(text):
+        return SHLEX_WORD_RE.findall(text)
+
+    chunks: List[str] = []
+    parts: List[str] = []
+    in_chunk = False
+    pos = 0
+    for m in SHLEX_TOKEN_RE.finditer(text):
+        if m.start() != pos:
+            return shlex.split(text)
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == 'space':
+            if in_chunk:
+                chunks.append(''.join(parts))
+                parts = []
+                in_chunk = False
+            continue
+
+        in_chunk = True
+        part = m.group(kind)
+        if kind == 'double' and '\\' in part:
+            part = SHLEX_DOUBLE_ESCAPE_RE.sub(r'\1', part)
+        parts.append(part)
+
+    if pos != len(text):
+        return shlex.split(text)
+
+    if in_chunk:
+        chunks.append(''.join(parts))
+
+    return chunks
@@ -11,8 +11,11 @@ from .decorators import (
 from .helpers import C, Cs, U, Us
 from .validators import (
     ACCEPTABLE_CHANNEL_TYPES,
+    CHANNEL_IDS_TYPE,
+    ChannelSpec,
     DM,
     VALIDATOR_TYPE,
+    get_channel_ids,
     get_channel_names,
     not_,
     only,
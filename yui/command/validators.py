@@ -1,7 +1,9 @@
+import copy
 from typing import (
     Any,
     Awaitable,
     Callable,
+    FrozenSet,
     Optional,
     Sequence,
     Set,
@@ -14,6 +16,7 @@ from .helpers import C, Cs
 from ..event import Message
 from ..exceptions import AllChannelsError, NoChannelsError
 from ..types.channel import PrivateChannel, PublicChannel
+from ..types.namespace import Namespace
 
 
 class DM:
@@ -31,6 +34,8 @@ ACCEPTABLE_CHANNEL_TYPES = Union[
 
 VALIDATOR_TYPE = Callable[[Any, Message], Awaitable[bool]]
 
+CHANNEL_IDS_TYPE = Tuple[FrozenSet[str], bool, bool]
+
 
 def get_channel_names(channels: Sequence[ACCEPTABLE_CHANNEL_TYPES])\
         -> Tuple[Set[str], bool, bool]:
@@ -59,15 +64,88 @@ def get_channel_names(channels: Sequence[ACCEPTABLE_CHANNEL_TYPES])\
     return channel_names, dm, fetch_error
 
 
+def get_channel_ids(channels: Sequence[ACCEPTABLE_CHANNEL_TYPES])\
+        -> CHANNEL_IDS_TYPE:
+    bot = Namespace._bot
+    dm = False
+    channel_ids = set()
+    fetch_error = False
+    for channel in channels:
+        if isinstance(channel, (PrivateChannel, PublicChannel)):
+            channel_ids.add(channel.id)
+        elif isinstance(channel, C):
+            try:
+                channel_ids.add(channel.get().id)
+            except KeyError:
+                fetch_error = True
+        elif isinstance(channel, Cs):
+            try:
+                channel_ids.update(c.id for c in channel.gets())
+            except KeyError:
+                fetch_error = True
+        elif channel == DM:
+            dm = True
+        elif isinstance(channel, str):
+            for c in (
+                bot.channels.get_by_key(channel),
+                bot.groups.get_by_key(channel),
+            ):
+                if c is not None:
+                    channel_ids.add(c.id)
+    return frozenset(channel_ids), dm, fetch_error
+
+
+class ChannelSpec:
+    """Channels given to validator, resolved into frozen set of IDs.
+
+    Resolved result is kept until directories of bot or ``CHANNELS`` in
+    config change.
+
+    """
+
+    def __init__(self, channels: Sequence[ACCEPTABLE_CHANNEL_TYPES]) -> None:
+        self.channels = channels
+        self.use_config = any(isinstance(c, (C, Cs)) for c in channels)
+        self.stamp: Any = None
+        self.result: CHANNEL_IDS_TYPE = (frozenset(), False, False)
+        self.error: Optional[Type[Exception]] = None
+
+    def make_stamp(self, bot) -> Any:
+        stamp = tuple(
+            (id(d), d.version)
+            for d in (bot.channels, bot.ims, bot.groups, bot.users)
+        )
+        if self.use_config:
+            return stamp, bot.config.CHANNELS
+        return stamp
+
+    def resolve(self) -> CHANNEL_IDS_TYPE:
+        bot = Namespace._bot
+        stamp = self.make_stamp(bot)
+        if self.stamp is None or stamp != self.stamp:
+            try:
+                self.result = get_channel_ids(self.channels)
+                self.error = None
+            except (AllChannelsError, NoChannelsError) as e:
+                self.error = type(e)
+            self.stamp = copy.deepcopy(stamp)
+
+        if self.error:
+            raise self.error()
+        return self.result
+
+
 def only(
     *channels: ACCEPTABLE_CHANNEL_TYPES,
     error: Optional[str] = None,
 ) -> VALIDATOR_TYPE:
     """Mark channel to allow to use handler."""
 
+    spec = ChannelSpec(channels)
+
     async def callback(bot, event: Message) -> bool:
         try:
-            channel_names, allow_dm, fetch_error = get_channel_names(channels)
+            channel_ids, allow_dm, fetch_error = spec.resolve()
         except AllChannelsError:
             return True
         except NoChannelsError:
@@ -82,7 +160,7 @@ def only(
             return False
 
         if isinstance(event.channel, (PrivateChannel, PublicChannel)):
-            if event.channel.name in channel_names:
+            if event.channel.id in channel_ids:
                 return True
             else:
                 if error:
@@ -111,9 +189,11 @@ def not_(
 ) -> VALIDATOR_TYPE:
     """Mark channel to deny to use handler."""
 
+    spec = ChannelSpec(channels)
+
     async def callback(bot, event: Message) -> bool:
         try:
-            channel_names, deny_dm, fetch_error = get_channel_names(channels)
+            channel_ids, deny_dm, fetch_error = spec.resolve()
         except AllChannelsError:
             if error:
                 await bot.say(
@@ -128,7 +208,7 @@ def not_(
             return False
 
         if isinstance(event.channel, (PrivateChannel, PublicChannel)):
-            if event.channel.name in channel_names:
+            if event.channel.id in channel_ids:
                 if error:
                     await bot.say(
                         event.channel,
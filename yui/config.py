@@ -15,6 +15,12 @@ from .types.namespace import namespace
 DEFAULT = {
     'DEBUG': False,
     'RECEIVE_TIMEOUT': 300,  # 60 * 5 seconds
+    'DISPATCH_CONCURRENCY': 16,
+    'API_CONNECTION_LIMIT': 16,
+    'API_DNS_CACHE_TTL': 300,  # 60 * 5 seconds
+    'RTM_FAST_REPLY': False,
+    'HYDRATION_CONCURRENCY': 8,
+    'REF_MAX_AGE': 86400,  # 60 * 60 * 24 seconds
     'REGISTER_CRONTAB': True,
     'PREFIX': '',
     'APPS': (),
@@ -69,6 +75,12 @@ class Config:
 
     TOKEN: str
     RECEIVE_TIMEOUT: int
+    DISPATCH_CONCURRENCY: int
+    API_CONNECTION_LIMIT: int
+    API_DNS_CACHE_TTL: int
+    RTM_FAST_REPLY: bool
+    HYDRATION_CONCURRENCY: int
+    REF_MAX_AGE: int
     DEBUG: bool
     PREFIX: str
     APPS: List[str]
@@ -27,6 +27,7 @@ from .types.namespace import (
     TsField,
     UserField,
     UserListField,
+    lazy_namespace,
     namespace,
 )
 from .types.objects import (
@@ -55,7 +56,7 @@ _events: Dict[str, Type[BaseEvent]] = {}
 
 
 def event(cls):
-    cls = namespace(cls)
+    cls = lazy_namespace(cls)
     _events[cls.type] = cls
     return cls
 
@@ -706,6 +707,7 @@ class ChatterboxSystemStart(Event):
     """System event for start system."""
 
     type: ClassVar[str] = 'chatterbox_system_start'
+    rtm: Dict[str, Any] = Field()
 
 
 def create_event(d: Dict) -> BaseEvent:
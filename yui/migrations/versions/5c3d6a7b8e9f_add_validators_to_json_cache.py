@@ -0,0 +1,38 @@
+"""Add validators to JSONCache
+
+Revision ID: 5c3d6a7b8e9f
+Revises: 9888ff06109d
+Create Date: 2026-10-17 09:12:41.503216
+
+"""
+
+from alembic import op
+
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5c3d6a7b8e9f'
+down_revision = '9888ff06109d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'json_cache',
+        sa.Column('etag', sa.String(), nullable=True),
+    )
+    op.add_column(
+        'json_cache',
+        sa.Column('last_modified', sa.String(), nullable=True),
+    )
+    op.add_column(
+        'json_cache',
+        sa.Column('content_hash', sa.String(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_column('json_cache', 'content_hash')
+    op.drop_column('json_cache', 'last_modified')
+    op.drop_column('json_cache', 'etag')
@@ -103,6 +103,14 @@ class PrivateChannel(Channel):
     purpose: ChannelPurpose = Field(converter=ChannelPurpose)
 
 
+def get_dm_user_id(channel: DirectMessageChannel):
+    """Key of DM channel in :class:`~yui.types.directory.Directory`."""
+
+    if channel.user is None:
+        return None
+    return channel.user.id
+
+
 def create_unknown_channel(**kwargs):
     if 'last_read' not in kwargs:
         kwargs['last_read'] = ''
@@ -0,0 +1,136 @@
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+def _invalidate(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._by_id = None
+        self._by_key = None
+        self.version += 1
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+class Directory(List[T]):
+    """List of Slack objects with hash indexes by ID and by key.
+
+    It acts same as :class:`list`. Indexes are built at first lookup after
+    mutation, and kept up to date by :meth:`append`, :meth:`upsert` and
+    :meth:`discard` without rebuilding.
+
+    If there are duplicated IDs or keys, lookup returns the first one like
+    linear scan does.
+
+    :attr:`version` increases at every mutation, so users can cache values
+    derived from directory.
+
+    """
+
+    def __init__(
+        self,
+        iterable: Iterable[T] = (),
+        *,
+        key: Callable[[T], Any] = attrgetter('name'),
+    ) -> None:
+        super(Directory, self).__init__(iterable)
+        self.key = key
+        self._by_id: Optional[Dict[str, T]] = None
+        self._by_key: Optional[Dict[Any, T]] = None
+        self.version = 0
+
+    def build_index(self):
+        by_id: Dict[str, T] = {}
+        by_key: Dict[Any, T] = {}
+        for obj in self:
+            by_id.setdefault(obj.id, obj)  # type: ignore
+            by_key.setdefault(self.key(obj), obj)
+        self._by_id = by_id
+        self._by_key = by_key
+
+    def ensure_index(self):
+        if self._by_id is None or self._by_key is None:
+            self.build_index()
+
+    def get(self, id: str) -> Optional[T]:
+        """Get object by ID."""
+
+        self.ensure_index()
+        return self._by_id.get(id)  # type: ignore
+
+    def get_by_key(self, key: Any) -> Optional[T]:
+        """Get object by key such as name."""
+
+        self.ensure_index()
+        return self._by_key.get(key)  # type: ignore
+
+    def append(self, obj: T):
+        super(Directory, self).append(obj)
+        self.version += 1
+        if self._by_id is not None and self._by_key is not None:
+            self._by_id.setdefault(obj.id, obj)  # type: ignore
+            self._by_key.setdefault(self.key(obj), obj)
+
+    def upsert(self, obj: T):
+        """Replace object which has same ID with given object, or append it."""
+
+        old = self.get(obj.id)  # type: ignore
+        if old is None:
+            self.append(obj)
+            return
+
+        self.version += 1
+        for i, x in enumerate(self):
+            if x is old:
+                super(Directory, self).__setitem__(i, obj)
+                break
+
+        self._by_id[obj.id] = obj  # type: ignore
+        by_key: Dict[Any, T] = self._by_key  # type: ignore
+        old_key = self.key(old)
+        new_key = self.key(obj)
+        if old_key == new_key:
+            if by_key.get(new_key) is old:
+                by_key[new_key] = obj
+            return
+
+        if by_key.get(old_key) is old:
+            del by_key[old_key]
+            # other object which has old key was hidden behind old one
+            if any(self.key(x) == old_key for x in self):
+                self.build_index()
+                return
+        if new_key in by_key:
+            # first one of duplicated keys wins, so check order again
+            self.build_index()
+        else:
+            by_key[new_key] = obj
+
+    def discard(self, id: str):
+        """Remove every object which has given ID."""
+
+        if self.get(id) is None:
+            return
+        super(Directory, self).__setitem__(
+            slice(None),
+            [x for x in self if x.id != id],  # type: ignore
+        )
+        self.version += 1
+        self._by_id = None
+        self._by_key = None
+
+    __setitem__ = _invalidate('__setitem__')
+    __delitem__ = _invalidate('__delitem__')
+    __iadd__ = _invalidate('__iadd__')
+    __imul__ = _invalidate('__imul__')
+    clear = _invalidate('clear')
+    extend = _invalidate('extend')
+    insert = _invalidate('insert')
+    pop = _invalidate('pop')
+    remove = _invalidate('remove')
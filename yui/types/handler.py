@@ -16,6 +16,8 @@ from typing import (
 import attr
 
 if TYPE_CHECKING:
+    from ..box.injection import InjectionPlan
+    from ..box.parsers import ParserPlan
     from ..box.tasks import CronTask
 
 
@@ -69,6 +71,11 @@ class Handler:
     last_call: Any = attr.ib(init=False)
     doc: Optional[str] = attr.ib(init=False)
     params: Mapping[str, inspect.Parameter] = attr.ib(init=False)
+    parser_plan: Optional[ParserPlan] = attr.ib(init=False, default=None)
+    injection_plan: Optional[InjectionPlan] = attr.ib(
+        init=False,
+        default=None,
+    )
 
     def __attrs_post_init__(self):
         self.doc = inspect.getdoc(self.f)
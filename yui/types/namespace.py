@@ -1,6 +1,6 @@
 import inspect
 from functools import partial
-from typing import Dict, TYPE_CHECKING
+from typing import Any, Dict, TYPE_CHECKING, Tuple
 
 import attr
 
@@ -10,12 +10,55 @@ if TYPE_CHECKING:
     from ..bot import Bot
 
 
+class LazyField:
+    """Descriptor which converts raw value at first access and keeps it."""
+
+    __slots__ = ('name', 'converter')
+
+    def __init__(self, name: str, converter) -> None:
+        self.name = name
+        self.converter = converter
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        d = instance.__dict__
+        try:
+            return d[self.name]
+        except KeyError:
+            pass
+        raws = d['_raw']
+        try:
+            raw = raws[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+        # keep raw value until it is converted, so failed conversion raises
+        # same error again at next access
+        value = d[self.name] = self.converter(raw)
+        del raws[self.name]
+        return value
+
+    def __set__(self, instance, value):
+        d = instance.__dict__
+        d[self.name] = value
+        raw = d.get('_raw')
+        if raw:
+            raw.pop(self.name, None)
+
+
 class Namespace:
-    """Factory of attr.s decorator with supporting unexpected kwargs."""
+    """Factory of attr.s decorator with supporting unexpected kwargs.
+
+    If ``lazy`` is true, fields which have converter keep given raw value and
+    convert it only at first access.
+
+    """
 
     _bot: 'Bot'
 
-    def __init__(self, **kwargs):
+    def __init__(self, *, lazy: bool = False, **kwargs):
+        self.lazy = lazy
+
         # These params was not supported
         kwargs.pop('maybe_cls', None)
         kwargs.pop('these', None)
@@ -57,9 +100,13 @@ class Namespace:
         # make new __init__ by eval
         _global: Dict = {}
         _local: Dict = {}
+        if self.lazy:
+            _global['_defaults'], body = self.make_lazy_init_body(cls)
+        else:
+            body = f'self.__old_init__({init_args})'
         code = f"""\
 def __init__{str(new_signature)}:
-    self.__old_init__({init_args})
+    {body}
     self.__dict__.update(_kwargs)
 """
         eval(compile(code, cls.__qualname__, 'exec'), _global, _local)
@@ -76,6 +123,37 @@ def __init__{str(new_signature)}:
 
         return cls
 
+    @staticmethod
+    def make_lazy_init_body(cls) -> Tuple[Dict[str, Any], str]:
+        """Make body of __init__ which stores raw values of converted fields.
+
+        Fields without converter are assigned directly. Their default values
+        which can not be written as argument are given by ``_defaults``.
+
+        """
+
+        defaults: Dict[str, Any] = {}
+        raw = []
+        lines = []
+        for a in attr.fields(cls):
+            if a.init:
+                value = a.name
+            elif isinstance(a.default, attr.Factory):  # type: ignore
+                if a.default.takes_self:  # type: ignore
+                    raise TypeError('Lazy field can not take self.')
+                value = f'_defaults[{a.name!r}].factory()'
+                defaults[a.name] = a.default
+            else:
+                value = f'_defaults[{a.name!r}]'
+                defaults[a.name] = a.default
+            if a.converter is None:
+                lines.append(f'self.{a.name} = {value}')
+            else:
+                setattr(cls, a.name, LazyField(a.name, a.converter))
+                raw.append(f'{a.name!r}: {value}')
+        lines.insert(0, f"self.__dict__['_raw'] = {{{', '.join(raw)}}}")
+        return defaults, '\n    '.join(lines)
+
 
 def channel_id_convert(value):
     bot = Namespace._bot
@@ -97,9 +175,9 @@ def channel_id_convert(value):
         }[id[0]]
     except KeyError:
         raise KeyError('Given Channel ID prefix was not expected.')
-    for obj in objs:
-        if obj.id == id:
-            return obj
+    obj = objs.get(id)
+    if obj is not None:
+        return obj
 
     from .channel import create_unknown_channel  # circular dependency
     if isinstance(value, str):
@@ -123,9 +201,9 @@ def user_id_convert(value):
     from .user import create_unknown_user  # circular dependency
     if not (id.startswith('U') or id.startswith('W')):
         raise KeyError('Given ID value has unexpected prefix.')
-    for obj in bot.users:
-        if obj.id == id:
-            return obj
+    obj = bot.users.get(id)
+    if obj is not None:
+        return obj
 
     if isinstance(value, str):
         kwargs = {'id': value}
@@ -153,21 +231,23 @@ def name_convert(value, type: str = None):
     bot = Namespace._bot
 
     if type is None or type == 'channel':
-        for c in bot.channels:
-            if c.name == value:
-                return c
+        c = bot.channels.get_by_key(value)
+        if c is not None:
+            return c
     if type is None or type == 'ims':
-        for d in bot.ims:
-            if d.user.name == value:
+        u = bot.users.get_by_key(value)
+        if u is not None:
+            d = bot.ims.get_by_key(u.id)
+            if d is not None:
                 return d
     if type is None or type == 'groups':
-        for g in bot.groups:
-            if g.name == value:
-                return g
+        g = bot.groups.get_by_key(value)
+        if g is not None:
+            return g
     if type is None or type == 'users':
-        for u in bot.users:
-            if u.name == value:
-                return u
+        u = bot.users.get_by_key(value)
+        if u is not None:
+            return u
 
     raise KeyError('Bot did not know given name.')
 
@@ -184,6 +264,7 @@ def list_convert(values, conv):
 
 # shortcut decorator
 namespace = Namespace()
+lazy_namespace = Namespace(lazy=True)
 
 SlackObjectField = partial(attr.ib, converter=id_convert)
 ChannelField = partial(attr.ib, converter=channel_id_convert)
@@ -7,6 +7,7 @@ from .cast import (
     DictCaster,
     KNOWN_TYPES,
     KnownTypesCaster,
+    MISMATCH,
     ListCaster,
     NewTypeCaster,
     NoHandleCaster,
@@ -39,4 +40,5 @@ from .fuzz import (
 )
 from .handler import get_handler
 from .html import strip_tags
+from .sandbox import SandboxPool
 from .url import b64_redirect
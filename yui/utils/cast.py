@@ -1,4 +1,4 @@
-from typing import Any, List, TypeVar, Union
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
 
 
 NoneType = type(None)
@@ -13,6 +13,12 @@ KNOWN_TYPES = {
 }
 
 
+#: Returned by compiled step when its caster does not handle given value.
+MISMATCH = object()
+
+CAST_FUNC_TYPE = Callable[[Any], Any]
+
+
 class CastError(Exception):
     pass
 
@@ -25,6 +31,21 @@ class BaseCaster:
     def cast(self, caster_box, t, value):
         raise NotImplementedError
 
+    def compile(self, caster_box, t) -> Optional[CAST_FUNC_TYPE]:
+        """Make step which casts value to given type.
+
+        Step returns :data:`MISMATCH` if this caster does not handle value.
+        Return ``None`` if this caster never handles given type.
+
+        """
+
+        def step(value):
+            if self.check(t, value):
+                return self.cast(caster_box, t, value)
+            return MISMATCH
+
+        return step
+
 
 class BoolCaster(BaseCaster):
 
@@ -34,6 +55,11 @@ class BoolCaster(BaseCaster):
     def cast(self, caster_box, t, value):
         return t(value)
 
+    def compile(self, caster_box, t):
+        if t == bool:
+            return t
+        return None
+
 
 class KnownTypesCaster(BaseCaster):
 
@@ -49,6 +75,23 @@ class KnownTypesCaster(BaseCaster):
     def cast(self, caster_box, t, value):
         return t(value)
 
+    def compile(self, caster_box, t):
+        try:
+            if t not in KNOWN_TYPES:
+                return None
+        except TypeError:
+            return None
+
+        def step(value):
+            if value is None:
+                return MISMATCH
+            try:
+                return t(value)
+            except ValueError:
+                return MISMATCH
+
+        return step
+
 
 class TypeVarCaster(BaseCaster):
 
@@ -67,6 +110,24 @@ class TypeVarCaster(BaseCaster):
         else:
             return value
 
+    def compile(self, caster_box, t):
+        if not isinstance(t, TypeVar):
+            return None
+        if not t.__constraints__:
+            return identity
+
+        funcs = [caster_box.get_plan(ty) for ty in t.__constraints__]
+
+        def step(value):
+            for func in funcs:
+                try:
+                    return func(value)
+                except CastError:
+                    continue
+            raise CastError
+
+        return step
+
 
 class NewTypeCaster(BaseCaster):
 
@@ -76,6 +137,11 @@ class NewTypeCaster(BaseCaster):
     def cast(self, caster_box, t, value):
         return caster_box.cast(t.__supertype__, value)
 
+    def compile(self, caster_box, t):
+        if hasattr(t, '__supertype__'):
+            return caster_box.get_plan(t.__supertype__)
+        return None
+
 
 class AnyCaster(BaseCaster):
 
@@ -85,6 +151,11 @@ class AnyCaster(BaseCaster):
     def cast(self, caster_box, t, value):
         return value
 
+    def compile(self, caster_box, t):
+        if t == Any:
+            return identity
+        return None
+
 
 class UnionCaster(BaseCaster):
 
@@ -100,6 +171,22 @@ class UnionCaster(BaseCaster):
                 continue
         raise ValueError
 
+    def compile(self, caster_box, t):
+        if getattr(t, '__origin__', None) != Union:
+            return None
+
+        funcs = [caster_box.get_plan(ty) for ty in t.__args__]
+
+        def step(value):
+            for func in funcs:
+                try:
+                    return func(value)
+                except CastError:
+                    continue
+            raise ValueError
+
+        return step
+
 
 class TupleCaster(BaseCaster):
 
@@ -114,6 +201,19 @@ class TupleCaster(BaseCaster):
         else:
             return tuple(value)
 
+    def compile(self, caster_box, t):
+        if getattr(t, '__origin__', None) != tuple:
+            return None
+        if not t.__args__:
+            return tuple
+
+        funcs = [caster_box.get_plan(ty) for ty in t.__args__]
+
+        def step(value):
+            return tuple(func(x) for func, x in zip(funcs, value))
+
+        return step
+
 
 class SetCaster(BaseCaster):
 
@@ -126,6 +226,19 @@ class SetCaster(BaseCaster):
         else:
             return set(value)
 
+    def compile(self, caster_box, t):
+        if getattr(t, '__origin__', None) != set:
+            return None
+        if not t.__args__:
+            return set
+
+        func = caster_box.get_plan(t.__args__[0])
+
+        def step(value):
+            return {func(x) for x in value}
+
+        return step
+
 
 class ListCaster(BaseCaster):
 
@@ -138,6 +251,19 @@ class ListCaster(BaseCaster):
         else:
             return list(value)
 
+    def compile(self, caster_box, t):
+        if getattr(t, '__origin__', None) != list:
+            return None
+        if not t.__args__:
+            return list
+
+        func = caster_box.get_plan(t.__args__[0])
+
+        def step(value):
+            return [func(x) for x in value]
+
+        return step
+
 
 class DictCaster(BaseCaster):
 
@@ -156,6 +282,20 @@ class DictCaster(BaseCaster):
         else:
             return dict(value)
 
+    def compile(self, caster_box, t):
+        if getattr(t, '__origin__', None) != dict:
+            return None
+        if not t.__args__:
+            return dict
+
+        key_func = caster_box.get_plan(t.__args__[0])
+        value_func = caster_box.get_plan(t.__args__[1])
+
+        def step(value):
+            return {key_func(k): value_func(v) for k, v in value.items()}
+
+        return step
+
 
 class NoHandleCaster(BaseCaster):
 
@@ -168,6 +308,19 @@ class NoHandleCaster(BaseCaster):
     def cast(self, caster_box, t, value):
         return value
 
+    def compile(self, caster_box, t):
+        try:
+            isinstance(None, t)
+        except TypeError:
+            return None
+
+        def step(value):
+            if isinstance(value, t):
+                return value
+            return MISMATCH
+
+        return step
+
 
 class NoneTypeCaster(BaseCaster):
 
@@ -177,6 +330,11 @@ class NoneTypeCaster(BaseCaster):
     def cast(self, caster_box, t, value):
         return None
 
+    def compile(self, caster_box, t):
+        if t == NoneType:  # type: ignore
+            return none
+        return None
+
 
 class AttrCaster(BaseCaster):
 
@@ -186,15 +344,33 @@ class AttrCaster(BaseCaster):
     def cast(self, caster_box, t, value):
         return t(**value)
 
+    def compile(self, caster_box, t):
+        if not hasattr(t, '__attrs_attrs__'):
+            return None
+
+        def step(value):
+            return t(**value)
+
+        return step
+
+
+def identity(value):
+    return value
+
+
+def none(value):
+    return None
+
 
 class CasterBox:
 
     def __init__(self, caster_box: List[BaseCaster]) -> None:
         self.caster_box = caster_box
+        self.plans: Dict[Any, CAST_FUNC_TYPE] = {}
 
     def __call__(self, t, value):
         try:
-            return self.cast(t, value)
+            return self.get_plan(t)(value)
         except CastError:
             return t(value)
 
@@ -205,10 +381,43 @@ class CasterBox:
         ]
 
     def cast(self, t, value):
-        for caster_box in self.caster_box:
-            if caster_box.check(t, value):
-                return caster_box.cast(self, t, value)
-        raise CastError
+        return self.get_plan(t)(value)
+
+    def compile(self, t) -> CAST_FUNC_TYPE:
+        """Make cast function of given type from steps of casters.
+
+        Casters which never handle the type are dropped here, so cast
+        function only runs checks which depend on value.
+
+        """
+
+        steps: List[CAST_FUNC_TYPE] = []
+        for caster in self.caster_box:
+            step = caster.compile(self, t)
+            if step is not None:
+                steps.append(step)
+
+        def func(value):
+            for step in steps:
+                result = step(value)
+                if result is not MISMATCH:
+                    return result
+            raise CastError
+
+        return func
+
+    def get_plan(self, t) -> CAST_FUNC_TYPE:
+        """Get cast function of given type. It is compiled at first call."""
+
+        try:
+            return self.plans[t]
+        except KeyError:
+            pass
+        except TypeError:
+            return self.compile(t)
+
+        plan = self.plans[t] = self.compile(t)
+        return plan
 
 
 cast = CasterBox([
@@ -0,0 +1,162 @@
+import asyncio
+import multiprocessing
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+
+def limit_memory(limit: int):
+    """Limit address space of current process to current size + limit."""
+
+    if resource is None:
+        return
+    try:
+        with open('/proc/self/statm') as f:
+            used = int(f.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return
+
+    soft = used + limit
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+def worker_main(func: Callable, conn: Connection, memory_limit: int):
+    limit_memory(memory_limit)
+    while True:
+        try:
+            args, kwargs = conn.recv()
+        except (EOFError, OSError):
+            break
+
+        result: Tuple[bool, Any]
+        try:
+            result = True, func(*args, **kwargs)
+        except Exception as e:
+            result = False, e
+
+        try:
+            conn.send(result)
+        except Exception as e:
+            conn.send((False, RuntimeError(f'{e.__class__.__name__}: {e}')))
+
+
+class SandboxWorker:
+    """One pre-forked process of :class:`SandboxPool`."""
+
+    def __init__(self, func: Callable, memory_limit: int) -> None:
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=worker_main,
+            args=(func, child_conn, memory_limit),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    async def receive(self) -> Tuple[bool, Any]:
+        loop = asyncio.get_event_loop()
+        ready = loop.create_future()
+        fd = self.conn.fileno()
+
+        def on_readable():
+            if not ready.done():
+                ready.set_result(None)
+
+        loop.add_reader(fd, on_readable)
+        try:
+            await ready
+        finally:
+            loop.remove_reader(fd)
+        return self.conn.recv()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(1)
+        self.conn.close()
+
+
+class SandboxPool:
+    """Pool of pre-forked processes which run function with hard limits.
+
+    Function runs in one of worker processes. Worker which runs longer
+    than timeout is killed and respawned, so infinite loop can not occupy
+    it forever. Memory of each worker is limited by ``RLIMIT_AS``.
+
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        *,
+        size: int = 2,
+        timeout: float = 1.0,
+        memory_limit: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.func = func
+        self.size = size
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.idle: Optional[asyncio.Queue] = None
+        self.killed = 0
+
+    def spawn(self) -> SandboxWorker:
+        return SandboxWorker(self.func, self.memory_limit)
+
+    def start(self):
+        """Fork workers. It is called at first run."""
+
+        self.idle = asyncio.Queue()
+        for _ in range(self.size):
+            self.idle.put_nowait(self.spawn())
+
+    async def run(self, *args, **kwargs):
+        """Run function in worker and return result or raise its error.
+
+        :raises asyncio.TimeoutError: if worker runs longer than timeout
+
+        """
+
+        if self.idle is None:
+            self.start()
+
+        worker: SandboxWorker = await self.idle.get()  # type: ignore
+        healthy = False
+        try:
+            worker.conn.send((args, kwargs))
+            ok, value = await asyncio.wait_for(worker.receive(), self.timeout)
+            healthy = not isinstance(value, MemoryError)
+        except asyncio.TimeoutError:
+            # it is subclass of OSError since Python 3.11
+            raise
+        except (EOFError, OSError):
+            raise RuntimeError('sandbox worker died')
+        finally:
+            # worker which is stopped by timeout or cancel is still busy
+            if not healthy:
+                worker = self.respawn(worker)
+            self.idle.put_nowait(worker)  # type: ignore
+
+        if ok:
+            return value
+        raise value
+
+    def respawn(self, worker: SandboxWorker) -> SandboxWorker:
+        worker.kill()
+        self.killed += 1
+        return self.spawn()
+
+    def close(self):
+        """Kill every idle worker."""
+
+        if self.idle is None:
+            return
+        while not self.idle.empty():
+            self.idle.get_nowait().kill()
+        self.idle = None